@@ -13,7 +13,15 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
-config.set_main_option("sqlalchemy.url", str(settings.DATABASE_URL_SYNC))
+# O ConfigParser interpreta "%": URLs com caracteres codificados (ex.: host de
+# socket em `?host=%2F...`) precisam ter o sinal escapado.
+config.set_main_option("sqlalchemy.url", str(settings.DATABASE_URL_SYNC).replace("%", "%%"))
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Ignora no autogenerate os índices trigram, que são criados por DDL próprio."""
+    if type_ == "index" and reflected and compare_to is None and name.endswith("_trgm"):
+        return False
+    return True
 
 def run_migrations_offline() -> None:
     """Executa as migrations no modo offline (gera scripts SQL)."""
@@ -23,13 +31,33 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
         context.run_migrations()
 
 def run_migrations_online() -> None:
-    """Executa as migrations no modo online (aplica no banco)."""
+    """Executa as migrations no modo online (aplica no banco).
+
+    Quem chama pelo `alembic.command` pode passar uma conexão pronta em
+    `config.attributes["connection"]` (usado pelos testes das migrations).
+    """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -37,13 +65,7 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+        do_run_migrations(connection)
 
 if context.is_offline_mode():
     run_migrations_offline()
@@ -1,38 +0,0 @@
-"""add client_id to orders
-
-Revision ID: 0486ccc63586
-Revises: 84d468d135ce
-Create Date: 2025-05-26 07:27:48.670884
-
-"""
-from typing import Sequence, Union
-
-from alembic import op
-import sqlalchemy as sa
-
-
-# revision identifiers, used by Alembic.
-revision: str = '0486ccc63586'
-down_revision: Union[str, None] = '84d468d135ce'
-branch_labels: Union[str, Sequence[str], None] = None
-depends_on: Union[str, Sequence[str], None] = None
-
-
-def upgrade() -> None:
-    """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.add_column('orders', sa.Column('client_id', sa.Integer(), nullable=True))
-    op.drop_constraint(op.f('orders_user_id_fkey'), 'orders', type_='foreignkey')
-    op.create_foreign_key(None, 'orders', 'clients', ['client_id'], ['id'])
-    op.drop_column('orders', 'user_id')
-    # ### end Alembic commands ###
-
-
-def downgrade() -> None:
-    """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.add_column('orders', sa.Column('user_id', sa.INTEGER(), autoincrement=False, nullable=False))
-    op.drop_constraint(None, 'orders', type_='foreignkey')
-    op.create_foreign_key(op.f('orders_user_id_fkey'), 'orders', 'users', ['user_id'], ['id'])
-    op.drop_column('orders', 'client_id')
-    # ### end Alembic commands ###
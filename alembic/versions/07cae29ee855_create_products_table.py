@@ -1,39 +0,0 @@
-"""create products table
-
-Revision ID: 07cae29ee855
-Revises: 2dea61502725
-Create Date: 2025-05-25 00:37:23.316750
-
-"""
-from typing import Sequence, Union
-
-from alembic import op
-import sqlalchemy as sa
-
-
-# revision identifiers, used by Alembic.
-revision: str = '07cae29ee855'
-down_revision: Union[str, None] = '2dea61502725'
-branch_labels: Union[str, Sequence[str], None] = None
-depends_on: Union[str, Sequence[str], None] = None
-
-
-def upgrade() -> None:
-    """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_table('clients')
-    # ### end Alembic commands ###
-
-
-def downgrade() -> None:
-    """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.create_table('clients',
-    sa.Column('id', sa.INTEGER(), autoincrement=True, nullable=False),
-    sa.Column('name', sa.VARCHAR(length=100), autoincrement=False, nullable=False),
-    sa.Column('email', sa.VARCHAR(length=100), autoincrement=False, nullable=False),
-    sa.Column('cpf', sa.VARCHAR(length=14), autoincrement=False, nullable=True),
-    sa.PrimaryKeyConstraint('id', name=op.f('clients_pkey')),
-    sa.UniqueConstraint('email', name=op.f('clients_email_key'), postgresql_include=[], postgresql_nulls_not_distinct=False)
-    )
-    # ### end Alembic commands ###
@@ -0,0 +1,60 @@
+"""add product expiry sweep
+
+Revision ID: 37eed3a2e2d3
+Revises: 44c4739cba10
+Create Date: 2026-10-19 16:17:52.285083
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '37eed3a2e2d3'
+down_revision: Union[str, None] = '44c4739cba10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('product_expirations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('expiration_date', sa.Date(), nullable=False),
+    sa.Column('expired_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_product_expirations_expired_at'), 'product_expirations', ['expired_at'], unique=False)
+    op.create_index(op.f('ix_product_expirations_id'), 'product_expirations', ['id'], unique=False)
+    op.create_index(op.f('ix_product_expirations_product_id'), 'product_expirations', ['product_id'], unique=False)
+
+    # Índice parcial (só disponíveis) criado sem bloquear escritas em products.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_products_expiration_date_available',
+            'products',
+            ['expiration_date', 'id'],
+            unique=False,
+            postgresql_where=sa.text('available'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_products_expiration_date_available',
+            table_name='products',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_index(op.f('ix_product_expirations_product_id'), table_name='product_expirations')
+    op.drop_index(op.f('ix_product_expirations_id'), table_name='product_expirations')
+    op.drop_index(op.f('ix_product_expirations_expired_at'), table_name='product_expirations')
+    op.drop_table('product_expirations')
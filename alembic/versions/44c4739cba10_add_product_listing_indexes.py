@@ -0,0 +1,52 @@
+"""add product listing indexes
+
+Revision ID: 44c4739cba10
+Revises: e5121fd4ca17
+Create Date: 2026-10-19 11:26:08.913472
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '44c4739cba10'
+down_revision: Union[str, None] = 'e5121fd4ca17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Um índice (coluna, id) por ordenação da listagem, com e sem seção na frente.
+INDEXES = [
+    ('ix_products_section_id', ['section', 'id']),
+    ('ix_products_section_price_id', ['section', 'price', 'id']),
+    ('ix_products_section_description_id', ['section', 'description', 'id']),
+    ('ix_products_price_id', ['price', 'id']),
+    ('ix_products_description_id', ['description', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                'products',
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name='products',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,54 @@
+"""add product full text search
+
+Revision ID: 58221067bdb4
+Revises: 37eed3a2e2d3
+Create Date: 2026-10-19 16:20:08.653007
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '58221067bdb4'
+down_revision: Union[str, None] = '37eed3a2e2d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Descrição (peso A) e seção (peso B) com a configuração em português.
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('portuguese', coalesce(description, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', coalesce(section, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A coluna gerada reescreve a tabela uma única vez; o índice GIN vem depois,
+    # sem bloquear escritas.
+    op.add_column('products', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_products_search_vector',
+            'products',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_products_search_vector',
+            table_name='products',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('products', 'search_vector')
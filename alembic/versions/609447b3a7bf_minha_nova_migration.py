@@ -1,32 +0,0 @@
-"""minha nova migration
-
-Revision ID: 609447b3a7bf
-Revises: 2ec7eb25b7a8
-Create Date: 2025-05-23 05:02:31.475388
-
-"""
-from typing import Sequence, Union
-
-from alembic import op
-import sqlalchemy as sa
-
-
-# revision identifiers, used by Alembic.
-revision: str = '609447b3a7bf'
-down_revision: Union[str, None] = '2ec7eb25b7a8'
-branch_labels: Union[str, Sequence[str], None] = None
-depends_on: Union[str, Sequence[str], None] = None
-
-
-def upgrade() -> None:
-    """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
-
-
-def downgrade() -> None:
-    """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
@@ -0,0 +1,44 @@
+"""add product stock shards
+
+Revision ID: 6ed2c82efeae
+Revises: 58221067bdb4
+Create Date: 2026-10-19 16:24:27.679940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6ed2c82efeae'
+down_revision: Union[str, None] = '58221067bdb4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('product_stock_shards',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('shard', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.CheckConstraint('quantity >= 0', name='ck_product_stock_shards_quantity'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id', 'shard')
+    )
+    # Com default constante o Postgres não reescreve a tabela.
+    op.add_column('products', sa.Column('stock_shards', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Devolve a `products.stock` o que ainda estiver nas partes.
+    op.execute(
+        'UPDATE products SET stock = shards.total'
+        ' FROM (SELECT product_id, sum(quantity) AS total FROM product_stock_shards GROUP BY product_id) AS shards'
+        ' WHERE products.id = shards.product_id'
+    )
+    op.drop_column('products', 'stock_shards')
+    op.drop_table('product_stock_shards')
@@ -1,88 +0,0 @@
-"""create orders and order_items tables
-
-Revision ID: 8740a89fc0c6
-Revises: fa3f6f1dce6d
-Create Date: 2025-05-25 03:07:54.680026
-
-"""
-from typing import Sequence, Union
-
-from alembic import op
-import sqlalchemy as sa
-
-
-# revision identifiers, used by Alembic.
-revision: str = '8740a89fc0c6'
-down_revision: Union[str, None] = 'fa3f6f1dce6d'
-branch_labels: Union[str, Sequence[str], None] = None
-depends_on: Union[str, Sequence[str], None] = None
-
-
-def upgrade() -> None:
-    """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_constraint(op.f('clients_cpf_key'), 'clients', type_='unique')
-    op.drop_constraint(op.f('clients_email_key'), 'clients', type_='unique')
-    op.drop_constraint(op.f('clients_name_key'), 'clients', type_='unique')
-    op.create_index(op.f('ix_clients_cpf'), 'clients', ['cpf'], unique=True)
-    op.create_index(op.f('ix_clients_email'), 'clients', ['email'], unique=True)
-    op.create_index(op.f('ix_clients_id'), 'clients', ['id'], unique=False)
-    op.create_index(op.f('ix_clients_name'), 'clients', ['name'], unique=True)
-    op.alter_column('products', 'stock',
-               existing_type=sa.INTEGER(),
-               nullable=True,
-               existing_server_default=sa.text('0'))
-    op.alter_column('products', 'available',
-               existing_type=sa.BOOLEAN(),
-               nullable=True,
-               existing_server_default=sa.text('true'))
-    op.create_index(op.f('ix_products_id'), 'products', ['id'], unique=False)
-    op.alter_column('users', 'is_active',
-               existing_type=sa.BOOLEAN(),
-               nullable=True,
-               existing_server_default=sa.text('true'))
-    op.alter_column('users', 'is_admin',
-               existing_type=sa.BOOLEAN(),
-               nullable=True,
-               existing_server_default=sa.text('false'))
-    op.drop_constraint(op.f('users_email_key'), 'users', type_='unique')
-    op.drop_constraint(op.f('users_username_key'), 'users', type_='unique')
-    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
-    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
-    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
-    # ### end Alembic commands ###
-
-
-def downgrade() -> None:
-    """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_index(op.f('ix_users_username'), table_name='users')
-    op.drop_index(op.f('ix_users_id'), table_name='users')
-    op.drop_index(op.f('ix_users_email'), table_name='users')
-    op.create_unique_constraint(op.f('users_username_key'), 'users', ['username'], postgresql_nulls_not_distinct=False)
-    op.create_unique_constraint(op.f('users_email_key'), 'users', ['email'], postgresql_nulls_not_distinct=False)
-    op.alter_column('users', 'is_admin',
-               existing_type=sa.BOOLEAN(),
-               nullable=False,
-               existing_server_default=sa.text('false'))
-    op.alter_column('users', 'is_active',
-               existing_type=sa.BOOLEAN(),
-               nullable=False,
-               existing_server_default=sa.text('true'))
-    op.drop_index(op.f('ix_products_id'), table_name='products')
-    op.alter_column('products', 'available',
-               existing_type=sa.BOOLEAN(),
-               nullable=False,
-               existing_server_default=sa.text('true'))
-    op.alter_column('products', 'stock',
-               existing_type=sa.INTEGER(),
-               nullable=False,
-               existing_server_default=sa.text('0'))
-    op.drop_index(op.f('ix_clients_name'), table_name='clients')
-    op.drop_index(op.f('ix_clients_id'), table_name='clients')
-    op.drop_index(op.f('ix_clients_email'), table_name='clients')
-    op.drop_index(op.f('ix_clients_cpf'), table_name='clients')
-    op.create_unique_constraint(op.f('clients_name_key'), 'clients', ['name'], postgresql_nulls_not_distinct=False)
-    op.create_unique_constraint(op.f('clients_email_key'), 'clients', ['email'], postgresql_nulls_not_distinct=False)
-    op.create_unique_constraint(op.f('clients_cpf_key'), 'clients', ['cpf'], postgresql_nulls_not_distinct=False)
-    # ### end Alembic commands ###
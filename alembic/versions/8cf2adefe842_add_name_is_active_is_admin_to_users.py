@@ -1,34 +0,0 @@
-"""add name, is_active, is_admin to users
-
-Revision ID: 8cf2adefe842
-Revises: a3935715e790
-Create Date: 2025-05-23 19:47:18.458693
-
-"""
-from typing import Sequence, Union
-
-from alembic import op
-import sqlalchemy as sa
-
-
-# revision identifiers, used by Alembic.
-revision: str = '8cf2adefe842'
-down_revision: Union[str, None] = 'a3935715e790'
-branch_labels: Union[str, Sequence[str], None] = None
-depends_on: Union[str, Sequence[str], None] = None
-
-
-def upgrade() -> None:
-    """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.add_column('users', sa.Column('is_active', sa.Boolean(), nullable=True))
-    op.add_column('users', sa.Column('is_admin', sa.Boolean(), nullable=True))
-    # ### end Alembic commands ###
-
-
-def downgrade() -> None:
-    """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_column('users', 'is_admin')
-    op.drop_column('users', 'is_active')
-    # ### end Alembic commands ###
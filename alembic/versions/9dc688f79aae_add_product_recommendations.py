@@ -0,0 +1,52 @@
+"""add product recommendations
+
+Revision ID: 9dc688f79aae
+Revises: 6ed2c82efeae
+Create Date: 2026-10-19 16:31:22.630828
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '9dc688f79aae'
+down_revision: Union[str, None] = '6ed2c82efeae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('recommendation_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('last_order_id', sa.Integer(), nullable=False),
+    sa.CheckConstraint('id = 1', name='ck_recommendation_state_single_row'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('product_pairs',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('related_id', sa.Integer(), nullable=False),
+    sa.Column('orders', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['related_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id', 'related_id')
+    )
+    op.create_index('ix_product_pairs_product_id_orders', 'product_pairs', ['product_id', sa.literal_column('orders DESC'), 'related_id'], unique=False)
+    op.create_table('product_recommendations',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('related_ids', postgresql.ARRAY(sa.Integer()), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('product_recommendations')
+    op.drop_index('ix_product_pairs_product_id_orders', table_name='product_pairs')
+    op.drop_table('product_pairs')
+    op.drop_table('recommendation_state')
@@ -0,0 +1,55 @@
+"""index product description prefix
+
+Revision ID: c0e9ad6ee4bd
+Revises: ed41b4d42298
+Create Date: 2026-10-19 18:02:47.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0e9ad6ee4bd'
+down_revision: Union[str, None] = 'ed41b4d42298'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# A ordenação por descrição passa a usar só os primeiros 200 caracteres: a
+# coluna inteira (text) estoura o limite de tamanho da linha de índice btree.
+DESCRIPTION_PREFIX = sa.text('left(description, 200)')
+
+INDEXES = [
+    ('ix_products_section_description_id', ['section', 'description', 'id'], ['section', DESCRIPTION_PREFIX, 'id']),
+    ('ix_products_description_id', ['description', 'id'], [DESCRIPTION_PREFIX, 'id']),
+]
+
+
+def _replace_indexes(new: bool) -> None:
+    with op.get_context().autocommit_block():
+        for name, old_columns, new_columns in INDEXES:
+            op.drop_index(
+                name,
+                table_name='products',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+            op.create_index(
+                name,
+                'products',
+                new_columns if new else old_columns,
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_indexes(new=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_indexes(new=False)
@@ -1,32 +0,0 @@
-"""remove name field from user
-
-Revision ID: ce6f2ddf338d
-Revises: 8cf2adefe842
-Create Date: 2025-05-23 19:49:15.932829
-
-"""
-from typing import Sequence, Union
-
-from alembic import op
-import sqlalchemy as sa
-
-
-# revision identifiers, used by Alembic.
-revision: str = 'ce6f2ddf338d'
-down_revision: Union[str, None] = '8cf2adefe842'
-branch_labels: Union[str, Sequence[str], None] = None
-depends_on: Union[str, Sequence[str], None] = None
-
-
-def upgrade() -> None:
-    """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
-
-
-def downgrade() -> None:
-    """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
@@ -0,0 +1,56 @@
+"""add indexes for order queries
+
+Revision ID: da0bb4386c81
+Revises: b18e40bd980a
+Create Date: 2026-10-19 09:12:41.284517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'da0bb4386c81'
+down_revision: Union[str, None] = 'b18e40bd980a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nome do índice, tabela, colunas) usados pelos filtros de list_orders
+# e pelo delete em cascata de order_items.
+INDEXES = [
+    ('ix_orders_client_id', 'orders', ['client_id']),
+    ('ix_orders_created_at', 'orders', ['created_at']),
+    ('ix_orders_status', 'orders', ['status']),
+    ('ix_order_items_order_id', 'order_items', ['order_id']),
+    ('ix_order_items_product_id', 'order_items', ['product_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação; o autocommit_block
+    # evita travar as tabelas de pedidos em produção durante a criação.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                op.f(name),
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                op.f(name),
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,59 @@
+"""add trigram indexes to clients
+
+Revision ID: e5121fd4ca17
+Revises: da0bb4386c81
+Create Date: 2026-10-19 10:03:17.552904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5121fd4ca17'
+down_revision: Union[str, None] = 'da0bb4386c81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ['name', 'email', 'cpf', 'phone']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Como no bootstrap, a extensão só é instalada se o servidor a oferecer;
+    # sem ela a busca aproximada de clientes não fica disponível.
+    available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar()
+    if not available:
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # Índices GIN trigram atendem ILIKE '%termo%' e o operador de similaridade (%)
+    # sem varrer a tabela inteira de clientes.
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.create_index(
+                f'ix_clients_{column}_trgm',
+                'clients',
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for column in reversed(COLUMNS):
+            op.drop_index(
+                f'ix_clients_{column}_trgm',
+                table_name='clients',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
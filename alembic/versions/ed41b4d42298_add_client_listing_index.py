@@ -0,0 +1,41 @@
+"""add client listing index
+
+Revision ID: ed41b4d42298
+Revises: 9dc688f79aae
+Create Date: 2026-10-19 16:43:11.606085
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ed41b4d42298'
+down_revision: Union[str, None] = '9dc688f79aae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_clients_name_id',
+            'clients',
+            ['name', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_clients_name_id',
+            table_name='clients',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
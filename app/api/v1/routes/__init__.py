@@ -3,6 +3,7 @@ from .auth import router as auth_router
 from .clients import router as clients_router
 from .products import router as products_router
 from .orders import router as orders_router
+from .media import router as media_router
 
 
 api_router = APIRouter()
@@ -10,3 +11,4 @@ api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
 api_router.include_router(clients_router, prefix="/clients", tags=["clients"])
 api_router.include_router(products_router, prefix="/products", tags=["products"])
 api_router.include_router(orders_router, prefix="/orders", tags=["orders"])
+api_router.include_router(media_router, prefix="/media", tags=["media"])
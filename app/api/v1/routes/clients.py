@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Security, Body
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status, Security, Body
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from typing import List, Optional
 
 from app.core.dependencies import get_db, get_current_active_admin
+from app.core.fieldsets import FIELDS_DESCRIPTION, fields_list_adapter, parse_fields
 from app.db.models.user import User
-from app.schemas.client import ClientCreate, ClientOut, ClientUpdate
+from app.schemas.client import (
+    ClientCreate,
+    ClientImportReport,
+    ClientOut,
+    ClientSort,
+    ClientSummary,
+    ClientUpdate,
+    client_out_list_adapter,
+)
 from app.crud import clients as crud_clients
+from app.services import client_import
 
 router = APIRouter()
 
@@ -19,7 +29,14 @@ router = APIRouter()
     description=(
         "Lista todos os clientes cadastrados no sistema. "
         "Apenas administradores podem acessar esta rota. "
-        "Suporta paginação e filtros por nome e email."
+        "Suporta filtros por nome e email, ordenação por id ou nome (prefixo `-` para decrescente) "
+        "e paginação por cursor: quando houver mais itens, o cabeçalho `X-Next-Cursor` traz o valor "
+        "a enviar em `cursor` para a próxima página. "
+        "O cabeçalho `X-Total-Count` traz o total de clientes do filtro: exato até 1000 "
+        "(`CLIENTS_COUNT_EXACT_LIMIT`) e, acima disso, a estimativa do planejador do banco. "
+        "O parâmetro `q` faz uma busca aproximada (tolerante a erros de digitação) "
+        "em nome, email, CPF e telefone, com resultados ordenados por similaridade e paginados por `skip`. "
+        "`fields` limita as colunas lidas e as chaves de cada cliente (ex.: `fields=id,name`)."
     ),
     responses={
         200: {
@@ -63,8 +80,24 @@ async def list_clients(
     limit: int = 10,
     name: Optional[str] = Query(None, alias="nome"),
     email: Optional[str] = Query(None),
+    q: Optional[str] = Query(None, description="Busca aproximada por nome, email, CPF ou telefone"),
+    sort: ClientSort = Query("id", description="Ordenação: id ou name (prefixo - para decrescente)"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em X-Next-Cursor pela página anterior"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ):
-    return await crud_clients.get_clients(db, skip, limit, name, email)
+    selected = parse_fields(fields, ClientOut)
+    clients = await crud_clients.get_clients(
+        db, skip, limit, name, email, search=q, sort=sort, cursor=cursor, fields=selected
+    )
+    total = await crud_clients.count_clients(db, name, email, search=q)
+    headers = {"X-Total-Count": str(total)}
+    if clients and len(clients) == limit and not q:
+        headers["X-Next-Cursor"] = crud_clients.encode_client_cursor(clients[-1], sort)
+    # Validadas uma única vez aqui; devolver um Response evita a segunda
+    # validação do FastAPI contra o response_model (que segue valendo para a documentação).
+    adapter = client_out_list_adapter if selected is None else fields_list_adapter(ClientOut, selected)
+    body = adapter.dump_json(adapter.validate_python(clients, from_attributes=True))
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post(
@@ -134,14 +167,52 @@ async def create_client(
     db: AsyncSession = Depends(get_db),
     current_user: User = Security(get_current_active_admin, scopes=["admin"])
 ):
-    if await crud_clients.get_client_by_email(db, client_in.email):
-        raise HTTPException(status_code=400, detail="Email já registrado")
-    if await crud_clients.get_client_by_cpf(db, client_in.cpf):
-        raise HTTPException(status_code=400, detail="CPF já registrado")
-
     return await crud_clients.create_client(db, client_in)
 
 
+@router.post(
+    "/import",
+    response_model=ClientImportReport,
+    summary="Importar clientes em massa",
+    description=(
+        "Importa um arquivo CSV (separado por vírgula ou ponto e vírgula, com cabeçalho) ou JSON Lines "
+        "(`.jsonl`, um objeto por linha) com os campos `name`, `email`, `cpf` e `phone`. "
+        "Valida os dígitos verificadores do CPF e o formato do email e do telefone. "
+        "Linhas inválidas, repetidas no arquivo ou com email/CPF já cadastrado não interrompem "
+        "a importação e voltam no relatório. "
+        "Apenas administradores podem importar clientes."
+    ),
+    responses={
+        200: {
+            "description": "Relatório da importação",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "total_rows": 3,
+                        "inserted": 1,
+                        "rejected": 2,
+                        "errors": [
+                            {"line": 3, "email": "joao@email.com", "cpf": "12345678900", "errors": ["cpf: CPF inválido"]},
+                            {"line": 4, "email": "maria@email.com", "cpf": "52998224725", "errors": ["Email já registrado"]}
+                        ]
+                    }
+                }
+            }
+        },
+        400: {"description": "Arquivo ilegível"},
+    }
+)
+async def import_clients(
+    file: UploadFile = File(..., description="Arquivo .csv ou .jsonl"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_admin),
+):
+    try:
+        return await client_import.import_clients(db, file.file, file.filename or "")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @router.get(
     "/{id}",
     response_model=ClientOut,
@@ -195,6 +266,60 @@ async def get_client(
     return client
 
 
+@router.get(
+    "/{id}/summary",
+    response_model=ClientSummary,
+    summary="Resumo do cliente",
+    description=(
+        "Retorna o cliente, a quantidade de pedidos, o total gasto, a data do último pedido "
+        "e os pedidos mais recentes com seus itens, numa única consulta ao banco. "
+        "Apenas administradores podem acessar esta rota."
+    ),
+    responses={
+        200: {
+            "description": "Resumo do cliente",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "client": {
+                            "id": 1,
+                            "name": "Maria Silva",
+                            "email": "maria@email.com",
+                            "cpf": "12345678900",
+                            "phone": "+5511999998888"
+                        },
+                        "order_count": 12,
+                        "total_spent": 1549.7,
+                        "last_order_at": "2025-05-26T10:00:00Z",
+                        "recent_orders": [
+                            {
+                                "id": 31,
+                                "client_id": 1,
+                                "status": "Pendente",
+                                "created_at": "2025-05-26T10:00:00Z",
+                                "items": [{"id": 87, "product_id": 4, "quantity": 2, "price": 49.9}]
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        404: {"description": "Cliente não encontrado"},
+    }
+)
+async def get_client_summary(
+    *,
+    id: int,
+    recent: int = Query(5, ge=0, le=50, description="Quantidade de pedidos recentes com itens"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_admin)
+):
+    summary = await crud_clients.get_client_summary(db, id, recent=recent)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Cliente não encontrado")
+    return summary
+
+
 @router.put(
     "/{id}",
     response_model=ClientOut,
@@ -264,18 +389,10 @@ async def update_client(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_admin)
 ):
-    client = await crud_clients.get_client_by_id(db, id)
+    client = await crud_clients.update_client(db, id, client_in)
     if not client:
         raise HTTPException(status_code=404, detail="Cliente não encontrado")
-
-    if client.email != client_in.email:
-        if await crud_clients.get_client_by_email(db, client_in.email):
-            raise HTTPException(status_code=400, detail="Email já registrado")
-    if client.cpf != client_in.cpf:
-        if await crud_clients.get_client_by_cpf(db, client_in.cpf):
-            raise HTTPException(status_code=400, detail="CPF já registrado")
-
-    return await crud_clients.update_client(db, client, client_in)
+    return client
 
 
 @router.delete(
@@ -0,0 +1,28 @@
+import re
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from app.services.product_images import products_dir
+
+router = APIRouter()
+
+# Nomes gerados pelo upload: hash do conteúdo, tamanho da miniatura opcional.
+PRODUCT_MEDIA = re.compile(r"^[0-9a-f]{32}(_\d+)?\.(jpg|png|webp)$")
+
+
+@router.get(
+    "/products/{filename}",
+    response_class=FileResponse,
+    summary="Imagem de produto",
+    description=(
+        "Serve imagens e miniaturas de produtos. Como o nome do arquivo é o hash do conteúdo, "
+        "a resposta pode ser guardada indefinidamente pelo navegador e por CDNs."
+    ),
+    responses={404: {"description": "Imagem não encontrada"}},
+)
+async def product_media(filename: str):
+    path = products_dir() / filename
+    if not PRODUCT_MEDIA.match(filename) or not path.is_file():
+        raise HTTPException(status_code=404, detail="Imagem não encontrada")
+    return FileResponse(path, headers={"Cache-Control": "public, max-age=31536000, immutable"})
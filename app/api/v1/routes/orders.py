@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from datetime import datetime
 
 from app.core.dependencies import get_db, get_current_active_user, get_current_active_admin
-from app.schemas.orders import OrderCreate, OrderOut, OrderUpdate
+from app.core.fieldsets import FIELDS_DESCRIPTION, fields_list_adapter, parse_fields
+from app.schemas.orders import OrderCreate, OrderOut, OrderUpdate, order_out_list_adapter
 from app.crud import orders as crud_orders
 from app.crud import clients as crud_clients
 from app.services.whatsapp import send_whatsapp_message
@@ -104,7 +105,9 @@ async def create_order(
     description=(
         "Lista todos os pedidos. "
         "Admins podem ver todos os pedidos e filtrar por período, seção, status, id do pedido e cliente. "
-        "Usuários autenticados só veem seus próprios pedidos."
+        "Usuários autenticados só veem seus próprios pedidos. "
+        "`fields` limita as colunas lidas e as chaves de cada pedido (ex.: `fields=id,status`); "
+        "os itens só são carregados quando `items` está entre os campos."
     ),
     responses={
         200: {
@@ -155,9 +158,11 @@ async def list_orders(
     section: Optional[str] = Query(None, description="Filtrar por seção do produto"),
     status: Optional[str] = Query(None, description="Filtrar por status do pedido"),
     order_id: Optional[int] = Query(None, description="Filtrar por ID do pedido"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ):
+    selected = parse_fields(fields, OrderOut)
     client_id = None if current_user.is_admin else current_user.id
-    return await crud_orders.list_orders(
+    orders = await crud_orders.list_orders(
         db,
         client_id=client_id,
         start_date=start_date,
@@ -165,7 +170,12 @@ async def list_orders(
         section=section,
         status=status,
         order_id=order_id,
+        fields=selected,
     )
+    # Validação única pelo adapter; o Response pula a revalidação do response_model.
+    adapter = order_out_list_adapter if selected is None else fields_list_adapter(OrderOut, selected)
+    body = adapter.dump_json(adapter.validate_python(orders, from_attributes=True))
+    return Response(content=body, media_type="application/json")
 
 @router.get(
     "/{order_id}",
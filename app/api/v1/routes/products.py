@@ -1,9 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status, Body
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
-from app.schemas.products import ProductCreate, ProductUpdate, ProductOut
+from app.schemas.products import (
+    ProductBulkUpdate,
+    ProductBulkUpdateResult,
+    ProductCreate,
+    ProductFilters,
+    ProductFlashSale,
+    ProductImageOut,
+    ProductImportReport,
+    ProductSort,
+    ProductStockOut,
+    ProductUpdate,
+    RestockReport,
+    ProductOut,
+    ProductSearchResult,
+    product_out_list_adapter,
+    product_search_adapter,
+    restock_report_adapter,
+)
 from app.crud import products as crud_products
+from app.services import product_images, product_import, restock
+from app.core.cache import barcode_index, catalog_cache, cached_json_response
+from app.core.config import settings
+from app.core.fieldsets import FIELDS_DESCRIPTION, fields_list_adapter, parse_fields
 from app.core.dependencies import get_db, get_current_active_user, get_current_active_admin
 
 router = APIRouter(tags=["products"])
@@ -16,7 +37,16 @@ router = APIRouter(tags=["products"])
     description=(
         "Lista todos os produtos cadastrados. "
         "Usuários autenticados podem visualizar. "
-        "Suporta paginação e pode ser expandido para filtros por categoria, preço e disponibilidade."
+        "Suporta filtros por seção, faixa de preço, disponibilidade e estoque, ordenação por id, "
+        "preço ou descrição (prefixo `-` para decrescente) e paginação por cursor: quando houver "
+        "mais itens, o cabeçalho `X-Next-Cursor` traz o valor a enviar em `cursor` para a próxima "
+        "página. `skip` continua aceito para compatibilidade, mas fica lento em páginas profundas. "
+        "Com `CATALOG_SNAPSHOT` ativo, filtros e ordenações por id ou preço são atendidos por uma "
+        "cópia colunar do catálogo em memória, sem consultar o banco. "
+        "`fields` limita as colunas lidas e as chaves de cada produto (ex.: `fields=id,price`); "
+        "nesse caso a listagem sempre consulta o banco. "
+        "A resposta vem do cache do catálogo e traz `ETag`; reenvie-o em `If-None-Match` "
+        "para receber `304 Not Modified` enquanto o catálogo não mudar."
     ),
     responses={
         200: {
@@ -35,6 +65,7 @@ router = APIRouter(tags=["products"])
                 }
             }
         },
+        304: {"description": "Catálogo não mudou desde o ETag informado"},
         422: {
             "description": "Erro de validação",
             "content": {
@@ -54,12 +85,41 @@ router = APIRouter(tags=["products"])
     }
 )
 async def read_products(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    filters: ProductFilters = Depends(),
+    sort: ProductSort = Query("id", description="Ordenação: id, price ou description (prefixo - para decrescente)"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em X-Next-Cursor pela página anterior"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_active_user),  
 ):
-    return await crud_products.get_products(db, skip=skip, limit=limit)
+    selected = parse_fields(fields, ProductOut)
+    key = ("list", skip, limit, sort, cursor, selected, *filters.model_dump().values())
+    entry = catalog_cache.get(key)
+    if entry is None:
+        generation = catalog_cache.generation
+        page = None
+        if selected is None:
+            # O snapshot guarda o JSON completo de cada produto.
+            page = crud_products.get_products_from_snapshot(
+                skip=skip, limit=limit, filters=filters, sort=sort, cursor=cursor
+            )
+        if page is not None:
+            body, next_cursor = page
+        else:
+            products = await crud_products.get_products(
+                db, skip=skip, limit=limit, filters=filters, sort=sort, cursor=cursor, fields=selected
+            )
+            adapter = product_out_list_adapter if selected is None else fields_list_adapter(ProductOut, selected)
+            body = adapter.dump_json(adapter.validate_python(products, from_attributes=True))
+            next_cursor = None
+            if products and len(products) == limit:
+                next_cursor = crud_products.encode_cursor(products[-1], sort)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        entry = catalog_cache.set(key, body, generation, headers)
+    return cached_json_response(request, entry, settings.catalog_cache_max_age)
 
 
 @router.post(
@@ -126,13 +186,274 @@ async def create_product(
     return await crud_products.create_product(db, product)
 
 
+@router.get(
+    "/search",
+    response_model=ProductSearchResult,
+    summary="Buscar produtos por texto",
+    description=(
+        "Busca textual (português) na descrição e na seção dos produtos, com resultados ordenados "
+        "por relevância. A última palavra vale como prefixo, permitindo sugestões enquanto se digita. "
+        "`facets` traz a quantidade de resultados por seção (sem o filtro `section`), calculada na "
+        "mesma consulta. Usuários autenticados podem buscar; suporta `ETag`/`If-None-Match`."
+    ),
+    responses={
+        200: {
+            "description": "Resultados da busca",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "total": 2,
+                        "facets": [
+                            {"section": "Roupas Masculinas", "count": 2},
+                            {"section": "Roupas Femininas", "count": 1}
+                        ],
+                        "items": [
+                            {
+                                "id": 1,
+                                "description": "Camiseta Polo",
+                                "price": 59.90,
+                                "barcode": "7891234567890",
+                                "section": "Roupas Masculinas",
+                                "stock": 100
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        304: {"description": "Catálogo não mudou desde o ETag informado"},
+    }
+)
+async def search_products(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Texto buscado", example="camiseta pol"),
+    section: Optional[str] = Query(None, description="Restringir os itens a uma seção"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_active_user),
+):
+    key = ("search", q.strip().lower(), section, limit, offset)
+    entry = catalog_cache.get(key)
+    if entry is None:
+        generation = catalog_cache.generation
+        result = await crud_products.search_products(db, q, section=section, limit=limit, offset=offset)
+        entry = catalog_cache.set(key, product_search_adapter.dump_json(result), generation)
+    return cached_json_response(request, entry, settings.catalog_cache_max_age)
+
+
+@router.get(
+    "/restock-report",
+    response_model=RestockReport,
+    summary="Sugestão de reposição de estoque",
+    description=(
+        "Calcula, para o catálogo inteiro, a demanda diária média da janela (`window_days`) e dos "
+        "últimos 7 dias, o estoque de segurança (nível de serviço de 95%), o ponto de pedido para o "
+        "prazo de reposição (`lead_time_days`), os dias de cobertura do estoque atual e a quantidade "
+        "sugerida para cobrir o prazo mais `coverage_days`. Os produtos vêm do mais urgente para o "
+        "menos urgente; com `only_needed`, apenas os que já estão no ponto de pedido. "
+        "O resultado fica em cache até chegar um pedido novo ou o catálogo mudar. "
+        "Apenas administradores podem consultar."
+    ),
+    responses={
+        200: {
+            "description": "Relatório de reposição",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "window_days": 28,
+                        "lead_time_days": 7,
+                        "coverage_days": 14,
+                        "last_order_id": 1520,
+                        "items": [
+                            {
+                                "product_id": 1,
+                                "description": "Camiseta Polo",
+                                "section": "Roupas Masculinas",
+                                "stock": 12,
+                                "avg_daily_demand": 3.2,
+                                "recent_daily_demand": 4.1,
+                                "safety_stock": 6,
+                                "reorder_point": 35,
+                                "days_of_cover": 2.9,
+                                "suggested_order": 104
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        304: {"description": "Relatório não mudou desde o ETag informado"},
+    }
+)
+async def read_restock_report(
+    request: Request,
+    window_days: int = Query(28, ge=7, le=365, description="Dias de histórico considerados"),
+    lead_time_days: int = Query(7, ge=1, le=120, description="Prazo de reposição do fornecedor, em dias"),
+    coverage_days: int = Query(14, ge=0, le=365, description="Dias de venda que a compra deve cobrir além do prazo"),
+    only_needed: bool = Query(False, description="Apenas produtos no ponto de pedido ou abaixo"),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_active_admin),
+):
+    # O maior id de pedido identifica pedidos feitos por outros workers, cuja
+    # invalidação não chega ao cache deste processo.
+    last_order_id = await restock.get_last_order_id(db)
+    key = ("restock", window_days, lead_time_days, coverage_days, only_needed, last_order_id)
+    entry = catalog_cache.get(key)
+    if entry is None:
+        generation = catalog_cache.generation
+        report = await restock.restock_report(
+            db,
+            last_order_id,
+            window_days=window_days,
+            lead_time_days=lead_time_days,
+            coverage_days=coverage_days,
+            only_needed=only_needed,
+        )
+        entry = catalog_cache.set(key, restock_report_adapter.dump_json(report), generation)
+    return cached_json_response(request, entry, settings.catalog_cache_max_age)
+
+
+@router.get(
+    "/by-barcode/{barcode}",
+    response_model=ProductOut,
+    summary="Buscar produto pelo código de barras",
+    description=(
+        "Retorna o produto com o código de barras informado, para leitura no PDV. "
+        "A consulta é atendida por um índice em memória carregado na inicialização e mantido "
+        "pelas escritas de produtos e pedidos; em caso de ausência, consulta o índice único do banco. "
+        "Usuários autenticados podem visualizar."
+    ),
+    responses={
+        200: {
+            "description": "Produto encontrado",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "id": 1,
+                        "description": "Camiseta Polo",
+                        "price": 59.90,
+                        "barcode": "7891234567890",
+                        "section": "Roupas Masculinas",
+                        "stock": 100
+                    }
+                }
+            }
+        },
+        304: {"description": "Produto não mudou desde o ETag informado"},
+        404: {"description": "Produto não encontrado"},
+    }
+)
+async def read_product_by_barcode(
+    request: Request,
+    barcode: str,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_active_user),
+):
+    entry = barcode_index.get(barcode)
+    if entry is None:
+        generation = barcode_index.generation
+        db_product = await crud_products.get_product_by_barcode(db, barcode)
+        if not db_product:
+            raise HTTPException(status_code=404, detail="Produto não encontrado")
+        entry = barcode_index.fill(barcode, crud_products.serialize_product(db_product), generation)
+    return cached_json_response(request, entry, settings.catalog_cache_max_age)
+
+
+@router.post(
+    "/import",
+    response_model=ProductImportReport,
+    summary="Importar produtos em massa",
+    description=(
+        "Importa um arquivo CSV (separado por vírgula ou ponto e vírgula, com cabeçalho) ou JSON Lines "
+        "(`.jsonl`, um objeto por linha) com os campos do produto. "
+        "Produtos com código de barras já cadastrado são atualizados nas colunas presentes no arquivo; "
+        "os demais são criados. Linhas inválidas não interrompem a importação e voltam no relatório. "
+        "Apenas administradores podem importar produtos."
+    ),
+    responses={
+        200: {
+            "description": "Relatório da importação",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "total_rows": 3,
+                        "inserted": 1,
+                        "updated": 1,
+                        "rejected": 1,
+                        "errors": [
+                            {
+                                "line": 4,
+                                "barcode": "7891234567890",
+                                "errors": ["price: Input should be a valid number, unable to parse string as a number"]
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        400: {"description": "Arquivo ilegível"},
+    }
+)
+async def import_products(
+    file: UploadFile = File(..., description="Arquivo .csv ou .jsonl"),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_active_admin),
+):
+    try:
+        return await product_import.import_products(db, file.file, file.filename or "")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.post(
+    "/bulk-update",
+    response_model=ProductBulkUpdateResult,
+    summary="Alterar produtos em massa",
+    description=(
+        "Altera vários produtos num único UPDATE. Informe `filters` (os mesmos da listagem; vazio "
+        "alcança o catálogo todo) com `change` — novo preço, reajuste percentual, novo estoque, soma "
+        "ao estoque ou disponibilidade — ou uma lista `values` com o novo preço, estoque ou "
+        "disponibilidade de cada id. Com `dry_run` a resposta só conta e lista os produtos que "
+        "seriam alterados. O estoque de produtos em venda relâmpago não é alterado em massa. "
+        "Apenas administradores podem alterar produtos."
+    ),
+    responses={
+        200: {
+            "description": "Produtos afetados",
+            "content": {"application/json": {"example": {"dry_run": False, "matched": 2, "ids": [3, 7]}}}
+        },
+        422: {"description": "Alteração inválida"},
+    }
+)
+async def bulk_update_products(
+    payload: ProductBulkUpdate = Body(
+        ...,
+        examples={
+            "desconto": {
+                "summary": "10% de desconto numa seção",
+                "value": {"filters": {"section": "Roupas Femininas"}, "change": {"price_percent": -10}}
+            },
+            "contagem": {
+                "summary": "Contagem de estoque",
+                "value": {"values": [{"id": 1, "stock": 30}, {"id": 2, "stock": 0, "available": False}]}
+            }
+        }
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_active_admin),
+):
+    return await crud_products.bulk_update_products(db, payload)
+
+
 @router.get(
     "/{product_id}",
     response_model=ProductOut,
     summary="Obter detalhes de um produto",
     description=(
         "Retorna os detalhes de um produto específico pelo ID. "
-        "Usuários autenticados podem visualizar."
+        "Usuários autenticados podem visualizar. "
+        "Suporta `ETag`/`If-None-Match` como a listagem."
     ),
     responses={
         200: {
@@ -149,6 +470,7 @@ async def create_product(
                 }
             }
         },
+        304: {"description": "Produto não mudou desde o ETag informado"},
         404: {"description": "Produto não encontrado"},
         422: {
             "description": "Erro de validação",
@@ -169,14 +491,21 @@ async def create_product(
     }
 )
 async def read_product(
+    request: Request,
     product_id: int,
     db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_active_user),  
 ):
-    db_product = await crud_products.get_product(db, product_id)
-    if not db_product:
-        raise HTTPException(status_code=404, detail="Produto não encontrado")
-    return db_product
+    key = ("item", product_id)
+    entry = catalog_cache.get(key)
+    if entry is None:
+        generation = catalog_cache.generation
+        db_product = await crud_products.get_product(db, product_id)
+        if not db_product:
+            raise HTTPException(status_code=404, detail="Produto não encontrado")
+        body = crud_products.serialize_product(db_product)
+        entry = catalog_cache.set(key, body, generation)
+    return cached_json_response(request, entry, settings.catalog_cache_max_age)
 
 
 @router.put(
@@ -283,4 +612,134 @@ async def delete_product(
     db_product = await crud_products.get_product(db, product_id)
     if not db_product:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
-    await crud_products.delete_product(db, db_product)
\ No newline at end of file
+    await crud_products.delete_product(db, db_product)
+
+
+@router.put(
+    "/{product_id}/image",
+    response_model=ProductImageOut,
+    summary="Enviar imagem do produto",
+    description=(
+        "Recebe a imagem no corpo da requisição (não multipart), com `Content-Type` "
+        "`image/jpeg`, `image/png` ou `image/webp`, que precisa corresponder ao formato do conteúdo. "
+        "O arquivo é gravado em disco à medida que chega, "
+        "miniaturas WebP de 160 e 480 px são geradas em segundo plano e `image_url` do produto passa "
+        "a apontar para a imagem enviada. Os arquivos são servidos com cache imutável. "
+        "Apenas administradores podem enviar imagens."
+    ),
+    responses={
+        404: {"description": "Produto não encontrado"},
+        400: {"description": "Arquivo vazio, não é uma imagem válida ou não corresponde ao Content-Type"},
+        413: {"description": "Imagem maior que o limite configurado"},
+        415: {"description": "Tipo de imagem não suportado"},
+    }
+)
+async def upload_product_image(
+    product_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_active_admin),
+):
+    db_product = await crud_products.get_product(db, product_id)
+    if not db_product:
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
+    image = await product_images.save_image(request.stream(), request.headers.get("content-type", ""))
+    await crud_products.set_product_image(db, db_product, image["image_url"])
+    return image
+
+
+@router.put(
+    "/{product_id}/flash-sale",
+    response_model=ProductStockOut,
+    summary="Ativar venda relâmpago",
+    description=(
+        "Divide o estoque do produto em `shards` partes. Cada pedido baixa de uma parte sorteada "
+        "com quantidade suficiente, então pedidos simultâneos do mesmo produto não esperam uns pelos "
+        "outros; o estoque exibido passa a ser a soma das partes. Chamar de novo redistribui o estoque "
+        "atual no novo número de partes. Apenas administradores podem alterar."
+    ),
+    responses={404: {"description": "Produto não encontrado"}},
+)
+async def enable_flash_sale(
+    product_id: int,
+    flash_sale: ProductFlashSale = Body(..., examples={"default": {"summary": "Oito partes", "value": {"shards": 8}}}),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_active_admin),
+):
+    db_product = await crud_products.get_product(db, product_id)
+    if not db_product:
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
+    product = await crud_products.enable_flash_sale(db, db_product, flash_sale.shards)
+    shards = await crud_products.get_stock_shards(db, product.id)
+    return ProductStockOut(product_id=product.id, stock=sum(shards), shards=shards)
+
+
+@router.delete(
+    "/{product_id}/flash-sale",
+    response_model=ProductStockOut,
+    summary="Encerrar venda relâmpago",
+    description=(
+        "Junta as partes de volta no estoque do produto. "
+        "Apenas administradores podem alterar."
+    ),
+    responses={404: {"description": "Produto não encontrado"}},
+)
+async def disable_flash_sale(
+    product_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_active_admin),
+):
+    db_product = await crud_products.get_product(db, product_id)
+    if not db_product:
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
+    product = await crud_products.disable_flash_sale(db, db_product)
+    return ProductStockOut(product_id=product.id, stock=product.stock or 0, shards=[])
+
+
+@router.get(
+    "/{product_id}/recommendations",
+    response_model=List[ProductOut],
+    summary="Produtos comprados juntos",
+    description=(
+        "Lista os produtos que mais aparecem nos mesmos pedidos que o produto informado, do mais "
+        "frequente para o menos frequente. As listas são pré-calculadas a partir do histórico de "
+        "pedidos e atualizadas periodicamente com os pedidos novos. "
+        "Usuários autenticados podem visualizar; suporta `ETag`/`If-None-Match`."
+    ),
+    responses={
+        200: {
+            "description": "Produtos recomendados (lista vazia se ainda não houver histórico)",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "id": 7,
+                            "description": "Meia cano alto",
+                            "price": 19.90,
+                            "barcode": "7891234567807",
+                            "section": "Acessórios",
+                            "stock": 40
+                        }
+                    ]
+                }
+            }
+        },
+        304: {"description": "Recomendações não mudaram desde o ETag informado"},
+    }
+)
+async def read_product_recommendations(
+    request: Request,
+    product_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_active_user),
+):
+    key = ("recommendations", product_id)
+    entry = catalog_cache.get(key)
+    if entry is None:
+        generation = catalog_cache.generation
+        products = await crud_products.get_recommendations(db, product_id)
+        body = product_out_list_adapter.dump_json(
+            product_out_list_adapter.validate_python(products, from_attributes=True)
+        )
+        entry = catalog_cache.set(key, body, generation)
+    return cached_json_response(request, entry, settings.catalog_cache_max_age)
@@ -0,0 +1,170 @@
+import hashlib
+import time
+from dataclasses import dataclass, field
+from typing import Hashable, Optional
+
+from fastapi import Request, Response
+
+from app.core.compression import choose_encoding, compress, encoded_etag
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    created_at: float
+    headers: dict[str, str] = field(default_factory=dict)
+    # Versões comprimidas do corpo por Content-Encoding, geradas na primeira
+    # requisição que pede cada uma e reaproveitadas enquanto a entrada viver.
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    def body_for(self, encoding: str) -> bytes:
+        body = self.encoded.get(encoding)
+        if body is None:
+            body = self.encoded[encoding] = compress(self.body, encoding, cached=True)
+        return body
+
+
+class ResponseCache:
+    """Cache em memória (por processo) de respostas JSON já serializadas.
+
+    As entradas são descartadas em bloco por `invalidate()`, chamado pelas
+    escritas, e expiram após `ttl` segundos como proteção para quando há mais
+    de um worker (a invalidação só alcança o processo que fez a escrita).
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries: dict[Hashable, CachedResponse] = {}
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.created_at > self.ttl:
+            self._entries.pop(key, None)
+            return None
+        return entry
+
+    def set(
+        self,
+        key: Hashable,
+        body: bytes,
+        generation: int,
+        headers: Optional[dict[str, str]] = None,
+    ) -> CachedResponse:
+        """Guarda `body` se nenhuma escrita aconteceu desde `generation`.
+
+        A resposta é sempre devolvida; só não é guardada quando a leitura
+        que a produziu pode ter visto dados anteriores a uma invalidação.
+        """
+        entry = _make_entry(body, headers)
+        if generation == self.generation:
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+
+class BarcodeIndex:
+    """Mapa código de barras → produto já serializado, mantido pelas escritas.
+
+    É carregado inteiro na inicialização e atualizado item a item pelo CRUD de
+    produtos e pelos pedidos; a recarga periódica (`barcode_index_refresh`)
+    corrige o que outros workers tenham alterado.
+    """
+
+    def __init__(self):
+        # Incrementado a cada escrita no índice, como em ResponseCache.
+        self.generation = 0
+        self._entries: dict[str, CachedResponse] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, barcode: str) -> Optional[CachedResponse]:
+        return self._entries.get(barcode)
+
+    def put(self, barcode: str, body: bytes) -> CachedResponse:
+        entry = _make_entry(body)
+        self.generation += 1
+        self._entries[barcode] = entry
+        return entry
+
+    def fill(self, barcode: str, body: bytes, generation: int) -> CachedResponse:
+        """Preenche após uma leitura do banco sem sobrescrever uma escrita mais nova.
+
+        `generation` é o valor lido antes da consulta: se o índice mudou desde
+        então (um `discard` de exclusão ou troca de código, por exemplo), a
+        leitura pode estar desatualizada e o corpo é devolvido sem ser guardado.
+        """
+        current = self._entries.get(barcode)
+        if current is not None:
+            return current
+        if generation != self.generation:
+            return _make_entry(body)
+        return self.put(barcode, body)
+
+    def discard(self, barcode: str) -> None:
+        self.generation += 1
+        self._entries.pop(barcode, None)
+
+    def replace_all(self, bodies: dict[str, bytes]) -> None:
+        self.generation += 1
+        self._entries = {barcode: _make_entry(body) for barcode, body in bodies.items()}
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+
+def _make_entry(body: bytes, headers: Optional[dict[str, str]] = None) -> CachedResponse:
+    return CachedResponse(
+        body=body,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        created_at=time.monotonic(),
+        headers=headers or {},
+    )
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match usa comparação fraca: W/"x" equivale a "x".
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def cached_json_response(request: Request, entry: CachedResponse, max_age: int) -> Response:
+    headers = {
+        **entry.headers,
+        "ETag": entry.etag,
+        "Cache-Control": f"private, max-age={max_age}",
+        "Vary": "Accept-Encoding",
+    }
+    encoding = None
+    if len(entry.body) >= settings.compression_min_size:
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is not None:
+        # Cada representação tem o próprio ETag forte, como nos arquivos estáticos.
+        headers["ETag"] = encoded_etag(entry.etag, encoding)
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if encoding is None:
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = encoding
+    return Response(content=entry.body_for(encoding), media_type="application/json", headers=headers)
+
+
+catalog_cache = ResponseCache(ttl=settings.catalog_cache_ttl)
+barcode_index = BarcodeIndex()
@@ -0,0 +1,163 @@
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.schemas.products import ProductFilters, ProductSort
+
+# Ordenações atendidas pelo snapshot. A ordem por descrição depende da
+# collation do banco, então continua sendo resolvida pelo Postgres.
+SNAPSHOT_SORTS = {"id", "-id", "price", "-price"}
+
+# `available` é nulo em produtos antigos; o filtro do banco não os inclui.
+AVAILABLE_NULL = -1
+
+
+class CatalogSnapshot:
+    """Cópia colunar (arrays numpy) do catálogo, mantida em cada worker.
+
+    Filtros e ordenações da listagem viram operações vetorizadas sobre as
+    colunas, e cada linha guarda o JSON já serializado do produto. É montado
+    na inicialização, atualizado item a item pelas escritas e recriado na
+    recarga periódica; enquanto não está pronto (`ready`), a listagem usa o banco.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._allocate(0)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _allocate(self, capacity: int) -> None:
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._prices = np.zeros(capacity, dtype=np.float64)
+        self._stocks = np.zeros(capacity, dtype=np.int64)
+        self._available = np.zeros(capacity, dtype=np.int8)
+        self._sections = np.zeros(capacity, dtype=np.int32)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._bodies: List[Optional[bytes]] = [None] * capacity
+        self._rows: dict[int, int] = {}
+        self._section_codes: dict[str, int] = {}
+        self._size = 0
+
+    def _grow(self) -> None:
+        capacity = max(1024, len(self._ids) * 2)
+        for name in ("_ids", "_prices", "_stocks", "_available", "_sections", "_alive"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+        self._bodies.extend([None] * (capacity - len(self._bodies)))
+
+    def _write(self, row: int, product, body: bytes) -> None:
+        section = self._section_codes.setdefault(product.section, len(self._section_codes))
+        self._ids[row] = product.id
+        self._prices[row] = product.price
+        self._stocks[row] = product.stock or 0
+        self._available[row] = AVAILABLE_NULL if product.available is None else int(product.available)
+        self._sections[row] = section
+        self._alive[row] = True
+        self._bodies[row] = body
+
+    def replace_all(self, products: Iterable[Tuple[object, bytes]]) -> None:
+        """Recria o snapshot a partir de pares (produto, JSON serializado)."""
+        self._allocate(0)
+        for product, body in products:
+            self.upsert(product, body, force=True)
+        self.ready = True
+
+    def upsert(self, product, body: bytes, force: bool = False) -> None:
+        if not (self.ready or force):
+            return
+        row = self._rows.get(product.id)
+        if row is None:
+            if self._size == len(self._ids):
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._rows[product.id] = row
+        self._write(row, product, body)
+
+    def remove(self, product_id: int) -> None:
+        row = self._rows.pop(product_id, None)
+        if row is not None:
+            self._alive[row] = False
+            self._bodies[row] = None
+
+    def invalidate(self) -> None:
+        """Escritas em massa sem os produtos em mãos: volta ao banco até a próxima recarga."""
+        self.ready = False
+
+    def _mask(self, filters: Optional[ProductFilters]) -> np.ndarray:
+        size = self._size
+        mask = self._alive[:size].copy()
+        if filters is None:
+            return mask
+        if filters.section is not None:
+            code = self._section_codes.get(filters.section)
+            if code is None:
+                return np.zeros(size, dtype=bool)
+            mask &= self._sections[:size] == code
+        if filters.available is not None:
+            mask &= self._available[:size] == int(filters.available)
+        if filters.min_price is not None:
+            mask &= self._prices[:size] >= filters.min_price
+        if filters.max_price is not None:
+            mask &= self._prices[:size] <= filters.max_price
+        if filters.in_stock is not None:
+            mask &= self._stocks[:size] > 0 if filters.in_stock else self._stocks[:size] <= 0
+        return mask
+
+    def page(
+        self,
+        filters: Optional[ProductFilters],
+        sort: ProductSort,
+        skip: int,
+        limit: int,
+        after: Optional[Tuple[object, int]] = None,
+    ) -> Tuple[List[bytes], Optional[Tuple[object, int]]]:
+        """Devolve os JSONs da página e a chave (valor, id) do último item.
+
+        `after` é a posição do cursor, com a mesma semântica de keyset do banco.
+        """
+        descending = sort.startswith("-")
+        by_price = sort.lstrip("-") == "price"
+        size = self._size
+        ids = self._ids[:size]
+        prices = self._prices[:size]
+
+        mask = self._mask(filters)
+        if after is not None:
+            value, last_id = after
+            if by_price:
+                if descending:
+                    mask &= (prices < value) | ((prices == value) & (ids < last_id))
+                else:
+                    mask &= (prices > value) | ((prices == value) & (ids > last_id))
+            else:
+                mask &= ids < last_id if descending else ids > last_id
+            skip = 0
+
+        rows = np.flatnonzero(mask)
+        sign = -1 if descending else 1
+        needed = skip + limit
+        if 0 < needed < len(rows):
+            # Só ordena os candidatos à página: os `needed` menores e os empates.
+            keys = sign * (prices[rows] if by_price else ids[rows])
+            threshold = np.partition(keys, needed - 1)[needed - 1]
+            rows = rows[keys <= threshold]
+        if by_price:
+            order = np.lexsort((sign * ids[rows], sign * prices[rows]))
+        else:
+            order = np.argsort(sign * ids[rows], kind="stable")
+        rows = rows[order][skip : skip + limit]
+
+        bodies = [self._bodies[row] for row in rows]
+        if len(rows) == 0:
+            return bodies, None
+        last = rows[-1]
+        value = float(prices[last]) if by_price else int(ids[last])
+        return bodies, (value, int(ids[last]))
+
+
+catalog_snapshot = CatalogSnapshot()
@@ -0,0 +1,138 @@
+"""Compressão gzip/brotli das respostas, negociada pelo Accept-Encoding.
+
+O middleware comprime respostas dinâmicas de uma só parte acima de um tamanho
+mínimo e com content-type da lista permitida. As respostas em cache
+(`cached_json_response`) guardam as versões comprimidas junto dos bytes
+originais e já saem com Content-Encoding, então o middleware não as toca.
+"""
+import gzip
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele, só gzip
+    brotli = None
+
+# Tipos que valem a pena comprimir; imagens e arquivos já comprimidos ficam de fora.
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+# Níveis moderados para respostas dinâmicas (comprimidas a cada requisição) e
+# mais altos para as em cache, comprimidas uma vez e servidas muitas.
+DYNAMIC_LEVELS = {"br": 4, "gzip": 6}
+CACHED_LEVELS = {"br": 9, "gzip": 9}
+
+
+def available_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Escolhe br ou gzip conforme o Accept-Encoding; None se nenhum for aceito.
+
+    Vence o maior q; em empate, a ordem de preferência do servidor (br, gzip).
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+    wildcard = accepted.get("*", 0.0)
+    encodings = available_encodings()
+    quality, encoding = max(
+        ((accepted.get(encoding, wildcard), -position), encoding) for position, encoding in enumerate(encodings)
+    )
+    return encoding if quality[0] > 0 else None
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    level = (CACHED_LEVELS if cached else DYNAMIC_LEVELS)[encoding]
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def weak_etag(etag: str) -> str:
+    # O corpo comprimido é outra representação: o ETag forte vira fraco, e o
+    # If-None-Match (comparação fraca) continua casando com o valor original.
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    # ETag forte próprio da versão comprimida, para respostas cujas variantes
+    # são geradas uma vez e guardadas (cache de respostas, arquivos estáticos).
+    return f'{etag[:-1]}-{encoding}"'
+
+
+class CompressionMiddleware:
+    """Comprime respostas de uma só parte acima de `minimum_size` bytes.
+
+    Respostas em streaming (arquivos, mídia) passam sem alteração.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.compression_min_size if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            pending, start = start, None
+            body = message.get("body", b"")
+            if not message.get("more_body", False):
+                body = self._encode(pending, body, encoding)
+                message = {**message, "body": body}
+            await send(pending)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def _encode(self, start: Message, body: bytes, encoding: Optional[str]) -> bytes:
+        headers = MutableHeaders(scope=start)
+        if not is_compressible(headers.get("content-type")) or "content-encoding" in headers:
+            return body
+        if "accept-encoding" not in headers.get("vary", "").lower():
+            headers.add_vary_header("Accept-Encoding")
+        if encoding is None or len(body) < self.minimum_size or start["status"] in (204, 304):
+            return body
+
+        compressed = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(compressed))
+        if "etag" in headers:
+            headers["ETag"] = weak_etag(headers["etag"])
+        return compressed
@@ -1,3 +1,5 @@
+import os
+
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 load_dotenv()
@@ -11,6 +13,22 @@ class Settings(BaseSettings):
     WHATSAPP_INSTANCE_ID: str
     WHATSAPP_TOKEN: str
     sentry_dsn: str | None = None
+    catalog_cache_ttl: int = 300
+    catalog_cache_max_age: int = 60
+    compression_min_size: int = 1024
+    static_max_age: int = 86400
+    barcode_index_refresh: int = 300
+    catalog_snapshot: bool = False
+    media_root: str = "media"
+    max_image_bytes: int = 10 * 1024 * 1024
+    image_workers: int = 2
+    import_workers: int = os.cpu_count() or 1
+    clients_count_exact_limit: int = 1000
+    expiry_sweep_interval: int = 3600
+    expiry_sweep_batch_size: int = 500
+    recommendations_top_k: int = 10
+    recommendations_refresh: int = 300
+    recommendations_settle_seconds: int = 60
     class Config:
         env_file = ".env"
 
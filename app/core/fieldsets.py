@@ -0,0 +1,46 @@
+"""Seleção esparsa de campos nas listagens (`?fields=id,price`).
+
+O parâmetro restringe tanto as colunas lidas do banco quanto as chaves do JSON:
+a consulta seleciona só as colunas pedidas (mais as que a paginação precisa) e
+a rota valida e serializa com um modelo reduzido, com apenas esses campos.
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, TypeAdapter, create_model
+
+FIELDS_DESCRIPTION = "Campos a retornar, separados por vírgula (ex.: id,price); todos quando omitido"
+
+
+def parse_fields(raw: Optional[str], model: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """Campos pedidos, na ordem do modelo; None quando o parâmetro não foi enviado."""
+    if raw is None:
+        return None
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = sorted(requested - model.model_fields.keys())
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos inválidos em fields: {', '.join(unknown) or '(vazio)'}. "
+            f"Disponíveis: {', '.join(model.model_fields)}",
+        )
+    return tuple(name for name in model.model_fields if name in requested)
+
+
+@lru_cache(maxsize=256)
+def fields_list_adapter(model: Type[BaseModel], fields: Tuple[str, ...]) -> TypeAdapter:
+    """Adapter de lista para um modelo com só `fields`, criado uma vez por combinação."""
+    partial = create_model(
+        f"{model.__name__}Fields",
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields},
+    )
+    return TypeAdapter(List[partial])
+
+
+def select_columns(columns: Dict[str, object], fields: Optional[Tuple[str, ...]], *required: str) -> list:
+    """Colunas do SELECT: as dos campos pedidos mais as `required` (ordenação, cursor)."""
+    if fields is None:
+        return list(columns.values())
+    wanted = set(fields).union(required)
+    return [column for name, column in columns.items() if name in wanted]
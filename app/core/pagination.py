@@ -0,0 +1,39 @@
+"""Cursores opacos da paginação keyset das listagens.
+
+O cursor guarda a ordenação, o valor da coluna ordenada e o id do último item
+da página, em JSON codificado em base64 para a URL.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Dict, Tuple
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor_value(sort: str, value: Any, last_id: int) -> str:
+    raw = json.dumps([sort, value, last_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, value_types: Dict[str, Any]) -> Tuple[Any, int]:
+    """Valor e id do cursor; 400 se estiver corrompido ou for de outra ordenação.
+
+    `value_types` dá o tipo esperado do valor por campo de ordenação, para um
+    cursor editado à mão (lista, objeto) não chegar à comparação no SQL.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, last_id = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+    if (
+        cursor_sort != sort
+        or not isinstance(last_id, int)
+        or not isinstance(value, value_types[sort.lstrip("-")])
+        # bool é subclasse de int, mas não é um valor válido para nenhuma ordenação.
+        or isinstance(last_id, bool)
+        or isinstance(value, bool)
+    ):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+    return value, last_id
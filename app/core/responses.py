@@ -0,0 +1,51 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from fastapi.utils import is_body_allowed_for_status_code
+from starlette.exceptions import HTTPException
+
+# datetime/date/UUID saem em ISO 8601 pelo próprio orjson; chaves não-str
+# (ex.: miniaturas por tamanho) viram texto, como no json da biblioteca padrão.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        # Mesmo critério do jsonable_encoder: inteiro quando não há casas decimais.
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    raise TypeError(f"Tipo não serializável em JSON: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class OrjsonResponse(JSONResponse):
+    """JSONResponse serializada com orjson.
+
+    Usada para conteúdo que chega como dados Python (dicts, respostas de erro).
+    Rotas com `response_model` ficam com a classe padrão de propósito: nela o
+    FastAPI serializa o modelo direto para bytes pelo pydantic-core, sem o dict
+    intermediário, o que sai mais barato que qualquer classe de resposta
+    customizada (ver benchmarks/serialization.py).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# Mesmas respostas dos handlers padrão do FastAPI, serializadas com orjson.
+async def http_exception_handler(request: Request, exc: HTTPException) -> Response:
+    headers = getattr(exc, "headers", None)
+    if not is_body_allowed_for_status_code(exc.status_code):
+        return Response(status_code=exc.status_code, headers=headers)
+    return OrjsonResponse({"detail": exc.detail}, status_code=exc.status_code, headers=headers)
+
+
+async def request_validation_exception_handler(request: Request, exc: RequestValidationError) -> OrjsonResponse:
+    return OrjsonResponse({"detail": jsonable_encoder(exc.errors())}, status_code=422)
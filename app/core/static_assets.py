@@ -0,0 +1,92 @@
+"""Arquivos de `static/` servidos a partir da memória.
+
+Cada arquivo é lido uma única vez, na montagem do app, junto com as versões
+br/gzip pré-comprimidas e um ETag forte por representação. Só os caminhos
+desses arquivos viram rotas: qualquer outro caminho (erros de digitação na
+API, varreduras de bots) termina no 404 do roteador, sem acessar o disco.
+"""
+import hashlib
+import mimetypes
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from fastapi import APIRouter, Request, Response
+
+from app.core.cache import etag_matches
+from app.core.compression import available_encodings, choose_encoding, compress, encoded_etag, is_compressible
+from app.core.config import settings
+
+STATIC_DIR = Path("static")
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    body: bytes
+    media_type: str
+    etag: str
+    cache_control: str
+    # Corpo já comprimido por Content-Encoding; vazio para tipos não compressíveis.
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    def response(self, request: Request) -> Response:
+        headers = {"Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        body, etag = self.body, self.etag
+        encoding = choose_encoding(request.headers.get("accept-encoding", "")) if self.encoded else None
+        if encoding is not None:
+            # Cada representação tem o próprio ETag forte.
+            body, etag = self.encoded[encoding], encoded_etag(self.etag, encoding)
+            headers["Content-Encoding"] = encoding
+        headers["ETag"] = etag
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+
+def load_asset(path: Path) -> StaticAsset:
+    body = path.read_bytes()
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if media_type.startswith("text/"):
+        media_type += "; charset=utf-8"
+    encoded = {}
+    if is_compressible(media_type) and len(body) >= settings.compression_min_size:
+        encoded = {encoding: compress(body, encoding, cached=True) for encoding in available_encodings()}
+    # Páginas HTML não têm hash no nome: o navegador revalida sempre (304 barato
+    # pelo ETag). Os demais arquivos ficam em cache por `static_max_age`.
+    if media_type.startswith("text/html"):
+        cache_control = "no-cache"
+    else:
+        cache_control = f"public, max-age={settings.static_max_age}"
+    return StaticAsset(
+        body=body,
+        media_type=media_type,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        cache_control=cache_control,
+        encoded=encoded,
+    )
+
+
+def load_assets(directory: Path = STATIC_DIR) -> dict[str, StaticAsset]:
+    """Caminho da URL → arquivo carregado; `index.html` também responde pela pasta."""
+    assets = {}
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file():
+            continue
+        url = "/" + path.relative_to(directory).as_posix()
+        asset = assets[url] = load_asset(path)
+        if path.name == "index.html":
+            assets[url.removesuffix("index.html")] = asset
+    return assets
+
+
+def _serve(asset: StaticAsset):
+    async def serve_static(request: Request) -> Response:
+        return asset.response(request)
+
+    return serve_static
+
+
+def build_router(directory: Path = STATIC_DIR) -> APIRouter:
+    router = APIRouter()
+    for url, asset in load_assets(directory).items():
+        router.add_api_route(url, _serve(asset), methods=["GET", "HEAD"], include_in_schema=False)
+    return router
@@ -1,22 +1,127 @@
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Optional, List
+from sqlalchemy import Row, func, insert, or_, text, tuple_, update
+from typing import Optional, List, Tuple
 
+from app.core.config import settings
+from app.core.fieldsets import select_columns
+from app.core.pagination import decode_cursor, encode_cursor_value
 from app.db.models.client import Client
-from app.schemas.client import ClientCreate, ClientUpdate
+from app.schemas.client import ClientCreate, ClientSort, ClientSummary, ClientUpdate
 
 
-async def get_clients(
-    db: AsyncSession, skip: int = 0, limit: int = 10, name: Optional[str] = None, email: Optional[str] = None
-) -> List[Client]:
-    query = select(Client)
+SEARCH_COLUMNS = (Client.name, Client.email, Client.cpf, Client.phone)
+
+SORT_COLUMNS = {
+    "id": Client.id,
+    "name": Client.name,
+}
+
+CURSOR_VALUE_TYPES = {"id": int, "name": str}
+
+# Colunas por campo do ClientOut: a listagem lê linhas do Core em vez de objetos do ORM.
+CLIENT_OUT_COLUMNS = {column.key: column for column in (Client.id, Client.name, Client.email, Client.cpf, Client.phone)}
+
+# Nomes (padrão do Postgres) das restrições UNIQUE de `clients` e a mensagem de cada uma.
+UNIQUE_VIOLATIONS = {
+    "clients_email_key": "Email já registrado",
+    "clients_cpf_key": "CPF já registrado",
+}
+
+
+def _apply_client_filters(query, name: Optional[str], email: Optional[str], search: Optional[str]):
     if name:
         query = query.filter(Client.name.ilike(f"%{name}%"))
     if email:
         query = query.filter(Client.email.ilike(f"%{email}%"))
+    if search:
+        # Cada coluna tem índice GIN trigram: tanto o ILIKE quanto o operador de
+        # similaridade (%) viram bitmap index scans em vez de varrer a tabela.
+        query = query.filter(
+            or_(*(column.ilike(f"%{search}%") | column.op("%")(search) for column in SEARCH_COLUMNS))
+        )
+    return query
+
 
-    result = await db.execute(query.offset(skip).limit(limit))
-    return result.scalars().all()
+async def get_clients(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    name: Optional[str] = None,
+    email: Optional[str] = None,
+    search: Optional[str] = None,
+    sort: ClientSort = "id",
+    cursor: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> List[Row]:
+    """Página da listagem como linhas somente leitura com os campos do ClientOut.
+
+    Com `fields`, lê só essas colunas (mais id e a da ordenação, usadas no cursor).
+    """
+    columns = select_columns(CLIENT_OUT_COLUMNS, fields, "id", sort.lstrip("-"))
+    query = _apply_client_filters(select(*columns), name, email, search)
+    if search:
+        # A busca aproximada ordena por similaridade, que não serve de chave para cursor.
+        if cursor is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A busca aproximada (q) usa skip; cursor não é aceito",
+            )
+        score = func.greatest(*(func.similarity(column, search) for column in SEARCH_COLUMNS))
+        query = query.order_by(score.desc(), Client.id).offset(skip)
+    else:
+        descending = sort.startswith("-")
+        column = SORT_COLUMNS[sort.lstrip("-")]
+        if cursor is not None:
+            # Keyset sobre (nome, id) ou id: usa ix_clients_name_id / a chave primária.
+            value, last_id = decode_cursor(cursor, sort, CURSOR_VALUE_TYPES)
+            if column is Client.id:
+                key, position = Client.id, last_id
+            else:
+                key, position = tuple_(column, Client.id), tuple_(value, last_id)
+            query = query.where(key < position if descending else key > position)
+        else:
+            query = query.offset(skip)
+        order = (column, Client.id) if column is not Client.id else (Client.id,)
+        query = query.order_by(*(c.desc() if descending else c.asc() for c in order))
+
+    result = await db.execute(query.limit(limit))
+    return result.all()
+
+
+def encode_client_cursor(client, sort: ClientSort) -> str:
+    return encode_cursor_value(sort, getattr(client, sort.lstrip("-")), client.id)
+
+
+async def _planner_estimate(db: AsyncSession, query) -> int:
+    connection = await db.connection()
+    compiled = query.compile(dialect=connection.dialect)
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}",
+        tuple(compiled.params[name] for name in compiled.positiontup),
+    )
+    return int(result.scalar()[0]["Plan"]["Plan Rows"])
+
+
+async def count_clients(
+    db: AsyncSession,
+    name: Optional[str] = None,
+    email: Optional[str] = None,
+    search: Optional[str] = None,
+) -> int:
+    """Total para o X-Total-Count sem COUNT(*) sobre a tabela inteira.
+
+    Conta no máximo `clients_count_exact_limit + 1` linhas: abaixo do limite o
+    total é exato; acima dele vale a estimativa do planejador para a consulta.
+    """
+    query = _apply_client_filters(select(Client.id), name, email, search)
+    limit = settings.clients_count_exact_limit
+    bounded = await db.scalar(select(func.count()).select_from(query.limit(limit + 1).subquery()))
+    if bounded <= limit:
+        return bounded
+    return max(await _planner_estimate(db, query), limit + 1)
 
 
 async def get_client_by_id(db: AsyncSession, id: int) -> Optional[Client]:
@@ -24,6 +129,57 @@ async def get_client_by_id(db: AsyncSession, id: int) -> Optional[Client]:
     return result.scalars().first()
 
 
+# Uma ida ao banco: totais pelos pedidos do cliente (índice em orders.client_id)
+# e os últimos pedidos já com os itens, montados em JSON pelo próprio Postgres.
+CLIENT_SUMMARY = text(
+    "SELECT c.id, c.name, c.email, c.cpf, c.phone,"
+    " totals.order_count, totals.total_spent, totals.last_order_at,"
+    " recent.orders AS recent_orders"
+    " FROM clients AS c"
+    " CROSS JOIN LATERAL ("
+    " SELECT count(*) AS order_count, max(o.created_at) AS last_order_at,"
+    " coalesce(sum(spent.amount), 0) AS total_spent"
+    " FROM orders AS o"
+    " CROSS JOIN LATERAL ("
+    " SELECT sum(quantity * price) AS amount FROM order_items WHERE order_id = o.id"
+    " ) AS spent"
+    " WHERE o.client_id = c.id"
+    " ) AS totals"
+    " CROSS JOIN LATERAL ("
+    " SELECT coalesce(json_agg(json_build_object("
+    " 'id', o.id, 'client_id', o.client_id, 'status', o.status, 'created_at', o.created_at,"
+    " 'items', items.items"
+    " ) ORDER BY o.created_at DESC, o.id DESC), '[]') AS orders"
+    " FROM ("
+    " SELECT id, client_id, status, created_at FROM orders WHERE client_id = c.id"
+    " ORDER BY created_at DESC, id DESC LIMIT :recent"
+    " ) AS o"
+    " CROSS JOIN LATERAL ("
+    " SELECT coalesce(json_agg(json_build_object("
+    " 'id', i.id, 'product_id', i.product_id, 'quantity', i.quantity, 'price', i.price"
+    " ) ORDER BY i.id), '[]') AS items"
+    " FROM order_items AS i WHERE i.order_id = o.id"
+    " ) AS items"
+    " ) AS recent"
+    " WHERE c.id = :client_id"
+)
+
+
+async def get_client_summary(db: AsyncSession, id: int, recent: int = 5) -> Optional[ClientSummary]:
+    """Cliente, totais de pedidos e os `recent` pedidos mais novos com itens; None se não existe."""
+    result = await db.execute(CLIENT_SUMMARY, {"client_id": id, "recent": recent})
+    row = result.mappings().first()
+    if row is None:
+        return None
+    return ClientSummary(
+        client={key: row[key] for key in ("id", "name", "email", "cpf", "phone")},
+        order_count=row["order_count"],
+        total_spent=row["total_spent"],
+        last_order_at=row["last_order_at"],
+        recent_orders=row["recent_orders"],
+    )
+
+
 async def get_client_by_email(db: AsyncSession, email: str) -> Optional[Client]:
     result = await db.execute(select(Client).filter(Client.email == email))
     return result.scalars().first()
@@ -34,20 +190,44 @@ async def get_client_by_cpf(db: AsyncSession, cpf: str) -> Optional[Client]:
     return result.scalars().first()
 
 
+def _duplicated(exc: IntegrityError) -> HTTPException:
+    message = str(exc.orig)
+    for constraint, detail in UNIQUE_VIOLATIONS.items():
+        if constraint in message:
+            return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+    raise exc
+
+
 async def create_client(db: AsyncSession, client_in: ClientCreate) -> Client:
-    client = Client(**client_in.dict())
-    db.add(client)
-    await db.commit()
-    await db.refresh(client)
+    """Insere o cliente direto; email ou CPF repetido vira 400 pela restrição UNIQUE.
+
+    Sem consultas prévias: é um único INSERT ... RETURNING e duas criações
+    simultâneas com o mesmo email não passam as duas.
+    """
+    try:
+        client = await db.scalar(insert(Client).values(**client_in.dict()).returning(Client))
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise _duplicated(exc)
     return client
 
 
-async def update_client(db: AsyncSession, db_client: Client, client_in: ClientUpdate) -> Client:
-    for key, value in client_in.dict(exclude_unset=True).items():
-        setattr(db_client, key, value)
-    await db.commit()
-    await db.refresh(db_client)
-    return db_client
+async def update_client(db: AsyncSession, id: int, client_in: ClientUpdate) -> Optional[Client]:
+    """Atualiza com um único UPDATE ... RETURNING; devolve None se o cliente não existe."""
+    try:
+        client = await db.scalar(
+            update(Client)
+            .where(Client.id == id)
+            .values(**client_in.dict(exclude_unset=True))
+            .returning(Client)
+            .execution_options(populate_existing=True)
+        )
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise _duplicated(exc)
+    return client
 
 
 async def delete_client(db: AsyncSession, db_client: Client):
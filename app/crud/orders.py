@@ -2,17 +2,22 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload
-from sqlalchemy import and_
+from sqlalchemy import and_, func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 
+from app.core.cache import catalog_cache
+from app.core.fieldsets import select_columns
 from app.db.models.orders import Order, OrderItem
 from app.db.models.products import Product
+from app.crud.products import index_product, reserve_sharded_stock
 from app.schemas.orders import OrderCreate, OrderItemCreate, OrderUpdate
 
 async def create_order(db: AsyncSession, order_create: OrderCreate, client_id: int):
     order_items = []
+    products = []
 
     for item in order_create.items:
         result = await db.execute(select(Product).where(Product.id == item.product_id))
@@ -21,19 +26,30 @@ async def create_order(db: AsyncSession, order_create: OrderCreate, client_id: i
         if not product:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Produto {item.product_id} não encontrado")
 
-        if product.stock < item.quantity:
+        if product.stock_shards:
+            # Venda relâmpago: baixa de uma das partes, sem travar a linha do produto.
+            reserved = await reserve_sharded_stock(db, product.id, item.quantity)
+        else:
+            reserved = product.stock >= item.quantity
+            if reserved:
+                product.stock -= item.quantity
+        if not reserved:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Estoque insuficiente para o produto {product.description}"
             )
 
-        product.stock -= item.quantity
+        products.append(product)
         order_items.append(OrderItem(product_id=product.id, quantity=item.quantity, price=product.price))
 
     order = Order(client_id=client_id, status="Pendente", items=order_items)
 
     db.add(order)
     await db.commit()
+    # O pedido baixou estoque, que aparece no catálogo em cache.
+    catalog_cache.invalidate()
+    for product in products:
+        await index_product(db, product)
     await db.refresh(order)
 
     stmt = select(Order).options(joinedload(Order.items)).where(Order.id == order.id)
@@ -50,6 +66,39 @@ async def get_order(db: AsyncSession, order_id: int):
         raise HTTPException(status_code=404, detail="Pedido não encontrado")
     return order
 
+# Itens de cada pedido montados em JSON pelo Postgres, para a listagem ler
+# uma linha do Core por pedido em vez de objetos do ORM com joinedload.
+ORDER_ITEMS_JSON = (
+    select(
+        func.coalesce(
+            func.json_agg(
+                aggregate_order_by(
+                    func.json_build_object(
+                        "id", OrderItem.id,
+                        "product_id", OrderItem.product_id,
+                        "quantity", OrderItem.quantity,
+                        "price", OrderItem.price,
+                    ),
+                    OrderItem.id,
+                )
+            ),
+            literal_column("'[]'::json"),
+        )
+    )
+    .where(OrderItem.order_id == Order.id)
+    .scalar_subquery()
+    .label("items")
+)
+
+ORDER_OUT_COLUMNS = {
+    "id": Order.id,
+    "client_id": Order.client_id,
+    "status": Order.status,
+    "created_at": Order.created_at,
+    "items": ORDER_ITEMS_JSON,
+}
+
+
 async def list_orders(
     db,
     client_id: Optional[int] = None,
@@ -58,8 +107,14 @@ async def list_orders(
     section: Optional[str] = None,
     status: Optional[str] = None,
     order_id: Optional[int] = None,
+    fields: Optional[Tuple[str, ...]] = None,
 ):
-    query = select(Order).options(joinedload(Order.items))
+    """Pedidos como linhas somente leitura com os campos do OrderOut.
+
+    Com `fields`, lê só essas colunas (mais o id, que mantém `orders` no FROM e
+    correlaciona a subconsulta dos itens); os itens só são agregados se `items` for pedido.
+    """
+    query = select(*select_columns(ORDER_OUT_COLUMNS, fields, "id"))
     filters = []
 
     if client_id is not None:
@@ -78,8 +133,8 @@ async def list_orders(
     if filters:
         query = query.where(and_(*filters))
 
-    result = await db.execute(query)
-    return result.unique().scalars().all()
+    result = await db.execute(query.order_by(Order.id))
+    return result.all()
 
 async def update_order(db: AsyncSession, order_id: int, order_update: OrderUpdate):
     stmt = select(Order).options(joinedload(Order.items)).where(Order.id == order_id)
@@ -1,34 +1,540 @@
+import re
+from typing import Iterable, Optional, Sequence, Tuple
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.db.models import Product
-from app.schemas.products import ProductCreate, ProductUpdate
+from sqlalchemy import Boolean, Float, Integer, Numeric, case, cast, delete, func, insert, literal, select, text, true, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core.cache import barcode_index, catalog_cache
+from app.core.catalog_snapshot import SNAPSHOT_SORTS, catalog_snapshot
+from app.core.config import settings
+from app.core.fieldsets import select_columns
+from app.core.pagination import decode_cursor, encode_cursor_value
+from app.db.models import Product, ProductRecommendation, ProductStockShard
+from app.db.models.products import DESCRIPTION_SORT_LENGTH, description_sort_key
+from app.schemas.products import (
+    ProductBulkChange,
+    ProductBulkUpdate,
+    ProductBulkUpdateResult,
+    ProductCreate,
+    ProductFilters,
+    ProductSearchResult,
+    ProductSort,
+    ProductUpdate,
+    product_out_adapter,
+)
+
+# Cada ordenação tem um índice composto (coluna, id), com ou sem seção na frente,
+# então qualquer página custa o mesmo que a primeira.
+SORT_COLUMNS = {
+    "id": Product.id,
+    "price": Product.price,
+    "description": description_sort_key(Product.description),
+}
+
+# Tipo que o valor de cada ordenação precisa ter num cursor válido.
+CURSOR_VALUE_TYPES = {"id": int, "price": (int, float), "description": str}
+
+def serialize_product(product: Product) -> bytes:
+    return product_out_adapter.dump_json(product_out_adapter.validate_python(product, from_attributes=True))
+
+
+async def apply_sharded_stock(db: AsyncSession, products: Iterable[Product]) -> None:
+    """Troca o `stock` dos produtos em venda relâmpago pela soma das partes.
+
+    O valor é só de leitura: não marca o objeto como alterado, então um commit
+    posterior não grava a soma em `products.stock`.
+    """
+    sharded = {product.id: product for product in products if product is not None and product.stock_shards}
+    if not sharded:
+        return
+    result = await db.execute(
+        select(ProductStockShard.product_id, func.sum(ProductStockShard.quantity))
+        .where(ProductStockShard.product_id.in_(sharded))
+        .group_by(ProductStockShard.product_id)
+    )
+    for product_id, total in result:
+        set_committed_value(sharded[product_id], "stock", total)
+
 
 async def get_product(db: AsyncSession, product_id: int):
     result = await db.execute(
         select(Product).filter(Product.id == product_id)
     )
-    return result.scalars().first()
+    product = result.scalars().first()
+    await apply_sharded_stock(db, [product])
+    return product
 
-async def get_products(db: AsyncSession, skip: int = 0, limit: int = 100):
+async def get_product_by_barcode(db: AsyncSession, barcode: str):
     result = await db.execute(
-        select(Product).offset(skip).limit(limit)
+        select(Product).filter(Product.barcode == barcode)
+    )
+    product = result.scalars().first()
+    await apply_sharded_stock(db, [product])
+    return product
+
+async def load_catalog_indexes(db: AsyncSession) -> int:
+    """Recarrega o índice de códigos de barras (e o snapshot, se ativo) com o catálogo inteiro."""
+    result = await db.execute(select(Product))
+    products = result.scalars().all()
+    await apply_sharded_stock(db, products)
+    bodies = [(product, serialize_product(product)) for product in products]
+    barcode_index.replace_all({product.barcode: body for product, body in bodies})
+    if settings.catalog_snapshot:
+        catalog_snapshot.replace_all(bodies)
+    return len(barcode_index)
+
+
+def _put_in_indexes(product: Product) -> None:
+    body = serialize_product(product)
+    barcode_index.put(product.barcode, body)
+    catalog_snapshot.upsert(product, body)
+
+
+async def index_product(db: AsyncSession, product: Product) -> None:
+    """Atualiza os índices em memória com o produto recém-gravado."""
+    await apply_sharded_stock(db, [product])
+    _put_in_indexes(product)
+
+
+async def reindex_products(db: AsyncSession, product_ids: Sequence[int]) -> None:
+    """Relê e reindexa os produtos alterados por uma escrita em massa."""
+    if not product_ids:
+        return
+    result = await db.execute(
+        select(Product).where(Product.id.in_(product_ids)).execution_options(populate_existing=True)
+    )
+    products = result.scalars().all()
+    await apply_sharded_stock(db, products)
+    for product in products:
+        _put_in_indexes(product)
+
+# Estoque exibido pelas listagens: em venda relâmpago, a soma das partes (a
+# coluna `products.stock` fica parada enquanto as partes são vendidas).
+LISTED_STOCK = case(
+    (
+        Product.stock_shards > 0,
+        select(func.sum(ProductStockShard.quantity))
+        .where(ProductStockShard.product_id == Product.id)
+        .scalar_subquery(),
+    ),
+    else_=Product.stock,
+)
+
+
+def apply_product_filters(query, filters: Optional[ProductFilters]):
+    if filters is None:
+        return query
+    if filters.section is not None:
+        query = query.where(Product.section == filters.section)
+    if filters.available is not None:
+        query = query.where(Product.available == filters.available)
+    if filters.min_price is not None:
+        query = query.where(Product.price >= filters.min_price)
+    if filters.max_price is not None:
+        query = query.where(Product.price <= filters.max_price)
+    if filters.in_stock is not None:
+        # O mesmo estoque da listagem e do snapshot, inclusive em venda relâmpago.
+        stock = func.coalesce(LISTED_STOCK, 0)
+        query = query.where(stock > 0 if filters.in_stock else stock <= 0)
+    return query
+
+
+def encode_cursor(product, sort: ProductSort) -> str:
+    """Cursor opaco com a posição do último item da página na ordenação pedida."""
+    value = getattr(product, sort.lstrip("-"))
+    if sort.lstrip("-") == "description":
+        # Mesma chave da ordenação: só o início da descrição.
+        value = value[:DESCRIPTION_SORT_LENGTH]
+    return encode_cursor_value(sort, value, product.id)
+
+
+# Colunas do ProductOut por campo para as listagens, lidas como linhas do Core
+# (sem montar objetos do ORM).
+PRODUCT_OUT_COLUMNS = {
+    column.key: column
+    for column in (
+        Product.id,
+        Product.description,
+        Product.price,
+        Product.barcode,
+        Product.section,
+        LISTED_STOCK.label("stock"),
+        Product.expiration_date,
+        Product.available,
+        Product.image_url,
+    )
+}
+
+
+async def get_products(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[ProductFilters] = None,
+    sort: ProductSort = "id",
+    cursor: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+):
+    """Página da listagem como linhas somente leitura com os campos do ProductOut.
+
+    Com `fields`, lê só essas colunas (mais id e a da ordenação, usadas no cursor).
+    """
+    descending = sort.startswith("-")
+    column = SORT_COLUMNS[sort.lstrip("-")]
+    order = (column, Product.id) if column is not Product.id else (Product.id,)
+
+    columns = select_columns(PRODUCT_OUT_COLUMNS, fields, "id", sort.lstrip("-"))
+    query = apply_product_filters(select(*columns), filters)
+    if cursor is not None:
+        # Keyset: continua a partir da última linha vista em vez de usar OFFSET.
+        value, last_id = decode_cursor(cursor, sort, CURSOR_VALUE_TYPES)
+        if column is Product.id:
+            key, position = Product.id, last_id
+        else:
+            key, position = tuple_(column, Product.id), tuple_(value, last_id)
+        query = query.where(key < position if descending else key > position)
+    else:
+        query = query.offset(skip)
+
+    query = query.order_by(*(c.desc() if descending else c.asc() for c in order))
+    result = await db.execute(query.limit(limit))
+    return result.all()
+
+def get_products_from_snapshot(
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[ProductFilters] = None,
+    sort: ProductSort = "id",
+    cursor: Optional[str] = None,
+) -> Optional[Tuple[bytes, Optional[str]]]:
+    """Atende a listagem pelo snapshot em memória, quando possível.
+
+    Devolve (JSON da página, próximo cursor) ou None para usar o banco.
+    """
+    if not (settings.catalog_snapshot and catalog_snapshot.ready and sort in SNAPSHOT_SORTS):
+        return None
+    after = decode_cursor(cursor, sort, CURSOR_VALUE_TYPES) if cursor is not None else None
+    bodies, last = catalog_snapshot.page(filters, sort, skip, limit, after)
+    next_cursor = None
+    if last is not None and len(bodies) == limit:
+        next_cursor = encode_cursor_value(sort, *last)
+    return b"[" + b",".join(bodies) + b"]", next_cursor
+
+
+async def get_recommendations(db: AsyncSession, product_id: int):
+    """Produtos comprados junto com `product_id`, na ordem do top-K pré-calculado."""
+    related = (
+        func.unnest(ProductRecommendation.related_ids)
+        .table_valued("id", with_ordinality="position")
+        .render_derived(name="related")
+    )
+    result = await db.execute(
+        select(Product)
+        .select_from(ProductRecommendation)
+        .join(related, true())
+        .join(Product, Product.id == related.c.id)
+        .where(ProductRecommendation.product_id == product_id)
+        .order_by(related.c.position)
+    )
+    products = result.scalars().all()
+    await apply_sharded_stock(db, products)
+    return products
+
+
+def build_search_query(q: str) -> Optional[str]:
+    """Converte o texto digitado numa expressão para `to_tsquery`.
+
+    Todas as palavras são obrigatórias e a última vale como prefixo, para a
+    busca responder enquanto o usuário ainda digita ("camiseta pol" → polo).
+    """
+    words = re.findall(r"\w+", q.lower())
+    if not words:
+        return None
+    return " & ".join(words[:-1] + [f"{words[-1]}:*"])
+
+
+# Estoque de `products AS p` em SQL puro, somando as partes em venda relâmpago.
+PRODUCT_STOCK_SQL = (
+    "CASE WHEN p.stock_shards > 0"
+    " THEN (SELECT sum(quantity) FROM product_stock_shards WHERE product_id = p.id)"
+    " ELSE p.stock END"
+)
+
+
+# Uma ida ao banco: `matches` usa o índice GIN, as facetas contam todos os
+# resultados (sem o filtro de seção) e a página vem por LATERAL, então as
+# facetas chegam mesmo quando a página está vazia.
+SEARCH_PRODUCTS = text(
+    "WITH matches AS ("
+    " SELECT id, section, ts_rank(search_vector, query) AS rank"
+    " FROM products, to_tsquery('portuguese', :query) AS query"
+    " WHERE search_vector @@ query"
+    "), facets AS ("
+    " SELECT coalesce(json_agg(json_build_object('section', section, 'count', total)"
+    " ORDER BY total DESC, section), '[]') AS facets"
+    " FROM (SELECT section, count(*) AS total FROM matches GROUP BY section) AS sections"
+    ")"
+    " SELECT facets.facets, hits.*"
+    " FROM facets LEFT JOIN LATERAL ("
+    " SELECT p.id, p.description, p.price, p.barcode, p.section,"
+    f" {PRODUCT_STOCK_SQL} AS stock,"
+    " p.expiration_date, p.available, p.image_url"
+    " FROM matches JOIN products AS p ON p.id = matches.id"
+    " WHERE CAST(:section AS varchar) IS NULL OR matches.section = :section"
+    " ORDER BY matches.rank DESC, matches.id"
+    " LIMIT :limit OFFSET :offset"
+    ") AS hits ON true"
+)
+
+
+async def search_products(
+    db: AsyncSession,
+    q: str,
+    section: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> ProductSearchResult:
+    query = build_search_query(q)
+    if query is None:
+        return ProductSearchResult(total=0, facets=[], items=[])
+
+    result = await db.execute(
+        SEARCH_PRODUCTS, {"query": query, "section": section, "limit": limit, "offset": offset}
+    )
+    rows = result.mappings().all()
+    facets = rows[0]["facets"]
+    if section is None:
+        total = sum(facet["count"] for facet in facets)
+    else:
+        total = next((facet["count"] for facet in facets if facet["section"] == section), 0)
+    return ProductSearchResult(
+        total=total,
+        facets=facets,
+        items=[dict(row) for row in rows if row["id"] is not None],
     )
-    return result.scalars().all()
 
 async def create_product(db: AsyncSession, product: ProductCreate):
     db_product = Product(**product.model_dump())
     db.add(db_product)
     await db.commit()
+    catalog_cache.invalidate()
     await db.refresh(db_product)
+    await index_product(db, db_product)
     return db_product
 
 async def update_product(db: AsyncSession, db_product: Product, updates: ProductUpdate):
-    for key, value in updates.model_dump(exclude_unset=True).items():
+    previous_barcode = db_product.barcode
+    values = updates.model_dump(exclude_unset=True)
+    if db_product.stock_shards and "stock" in values:
+        # Em venda relâmpago o novo estoque é redistribuído entre as partes.
+        await _write_shards(db, db_product.id, values["stock"] or 0, db_product.stock_shards)
+    for key, value in values.items():
         setattr(db_product, key, value)
     await db.commit()
+    catalog_cache.invalidate()
+    await db.refresh(db_product)
+    if db_product.barcode != previous_barcode:
+        barcode_index.discard(previous_barcode)
+    await index_product(db, db_product)
+    return db_product
+
+def _unless_sharded(stock):
+    """O estoque em venda relâmpago fica nas partes e não muda por alteração em massa."""
+    return case((Product.stock_shards > 0, Product.stock), else_=stock)
+
+
+def _bulk_change_values(change: ProductBulkChange) -> dict:
+    values = {}
+    if change.price is not None:
+        values[Product.price] = change.price
+    if change.price_percent is not None:
+        factor = 1 + change.price_percent / 100
+        values[Product.price] = func.round(cast(Product.price * factor, Numeric), 2)
+    if change.stock is not None:
+        values[Product.stock] = change.stock
+    if change.stock_delta is not None:
+        values[Product.stock] = func.greatest(func.coalesce(Product.stock, 0) + change.stock_delta, 0)
+    if Product.stock in values:
+        values[Product.stock] = _unless_sharded(values[Product.stock])
+    if change.available is not None:
+        values[Product.available] = change.available
+    return values
+
+
+def _bulk_values_source(values):
+    """Lista id → valores como uma tabela (unnest de arrays), para um UPDATE ... FROM."""
+    return (
+        func.unnest(
+            literal([value.id for value in values], ARRAY(Integer)),
+            literal([value.price for value in values], ARRAY(Float)),
+            literal([value.stock for value in values], ARRAY(Integer)),
+            literal([value.available for value in values], ARRAY(Boolean)),
+        )
+        .table_valued("id", "price", "stock", "available")
+        .render_derived(name="changes")
+    )
+
+
+async def bulk_update_products(db: AsyncSession, payload: ProductBulkUpdate) -> ProductBulkUpdateResult:
+    """Aplica a alteração em massa com um único UPDATE e devolve os ids afetados.
+
+    Em `dry_run` roda apenas o SELECT equivalente, sem travar nem alterar nada.
+    """
+    if payload.values is not None:
+        changes = _bulk_values_source(payload.values)
+        condition = Product.id == changes.c.id
+        if payload.dry_run:
+            query = select(Product.id).join(changes, condition)
+        else:
+            # Campos nulos na lista mantêm o valor atual.
+            query = (
+                update(Product)
+                .where(condition)
+                .values(
+                    price=func.coalesce(changes.c.price, Product.price),
+                    stock=_unless_sharded(func.coalesce(changes.c.stock, Product.stock)),
+                    available=func.coalesce(changes.c.available, Product.available),
+                )
+            )
+    elif payload.dry_run:
+        query = apply_product_filters(select(Product.id), payload.filters)
+    else:
+        query = apply_product_filters(update(Product), payload.filters).values(_bulk_change_values(payload.change))
+
+    if payload.dry_run:
+        result = await db.execute(query.order_by(Product.id))
+        ids = result.scalars().all()
+        return ProductBulkUpdateResult(dry_run=True, matched=len(ids), ids=ids)
+
+    result = await db.execute(query.returning(Product.id))
+    ids = sorted(result.scalars().all())
+    await db.commit()
+    catalog_cache.invalidate()
+    await reindex_products(db, ids)
+    return ProductBulkUpdateResult(dry_run=False, matched=len(ids), ids=ids)
+
+def split_stock(stock: int, shards: int) -> list:
+    base, extra = divmod(max(stock, 0), shards)
+    return [base + (1 if shard < extra else 0) for shard in range(shards)]
+
+
+async def _write_shards(db: AsyncSession, product_id: int, stock: int, shards: int) -> None:
+    await db.execute(delete(ProductStockShard).where(ProductStockShard.product_id == product_id))
+    await db.execute(
+        insert(ProductStockShard),
+        [
+            {"product_id": product_id, "shard": shard, "quantity": quantity}
+            for shard, quantity in enumerate(split_stock(stock, shards))
+        ],
+    )
+
+
+async def _locked_shard_total(db: AsyncSession, product_id: int) -> int:
+    result = await db.execute(
+        select(ProductStockShard.quantity)
+        .where(ProductStockShard.product_id == product_id)
+        .with_for_update()
+    )
+    return sum(result.scalars().all())
+
+
+async def _lock_product(db: AsyncSession, product_id: int) -> Product:
+    result = await db.execute(
+        select(Product).where(Product.id == product_id).with_for_update().execution_options(populate_existing=True)
+    )
+    return result.scalars().one()
+
+
+async def enable_flash_sale(db: AsyncSession, db_product: Product, shards: int) -> Product:
+    """Divide o estoque atual em `shards` partes (ou redistribui, se já estiver dividido)."""
+    product = await _lock_product(db, db_product.id)
+    total = await _locked_shard_total(db, product.id) if product.stock_shards else (product.stock or 0)
+    await _write_shards(db, product.id, total, shards)
+    product.stock = total
+    product.stock_shards = shards
+    await db.commit()
+    catalog_cache.invalidate()
+    await index_product(db, product)
+    return product
+
+
+async def disable_flash_sale(db: AsyncSession, db_product: Product) -> Product:
+    """Junta as partes de volta em `products.stock`."""
+    product = await _lock_product(db, db_product.id)
+    if product.stock_shards:
+        product.stock = await _locked_shard_total(db, product.id)
+        await db.execute(delete(ProductStockShard).where(ProductStockShard.product_id == product.id))
+        product.stock_shards = 0
+    await db.commit()
+    catalog_cache.invalidate()
+    await index_product(db, product)
+    return product
+
+
+async def get_stock_shards(db: AsyncSession, product_id: int) -> list:
+    result = await db.execute(
+        select(ProductStockShard.quantity)
+        .where(ProductStockShard.product_id == product_id)
+        .order_by(ProductStockShard.shard)
+    )
+    return result.scalars().all()
+
+
+# Sorteia uma parte com quantidade suficiente; partes travadas por outros
+# pedidos são puladas em vez de esperadas.
+RESERVE_FROM_SHARD = text(
+    "UPDATE product_stock_shards SET quantity = quantity - :quantity"
+    " WHERE (product_id, shard) = ("
+    " SELECT product_id, shard FROM product_stock_shards"
+    " WHERE product_id = :product_id AND quantity >= :quantity"
+    " ORDER BY random() LIMIT 1"
+    " FOR UPDATE SKIP LOCKED"
+    ") RETURNING shard"
+)
+
+
+async def reserve_sharded_stock(db: AsyncSession, product_id: int, quantity: int) -> bool:
+    """Baixa `quantity` do estoque dividido; devolve False se não houver o suficiente."""
+    result = await db.execute(RESERVE_FROM_SHARD, {"product_id": product_id, "quantity": quantity})
+    if result.first() is not None:
+        return True
+
+    # Nenhuma parte livre tem o bastante sozinha: trava todas e baixa de várias.
+    result = await db.execute(
+        select(ProductStockShard.shard, ProductStockShard.quantity)
+        .where(ProductStockShard.product_id == product_id, ProductStockShard.quantity > 0)
+        .order_by(ProductStockShard.shard)
+        .with_for_update()
+    )
+    shards = result.all()
+    if sum(available for _, available in shards) < quantity:
+        return False
+    remaining = quantity
+    for shard, available in shards:
+        if remaining == 0:
+            break
+        taken = min(available, remaining)
+        await db.execute(
+            update(ProductStockShard)
+            .where(ProductStockShard.product_id == product_id, ProductStockShard.shard == shard)
+            .values(quantity=ProductStockShard.quantity - taken)
+        )
+        remaining -= taken
+    return True
+
+
+async def set_product_image(db: AsyncSession, db_product: Product, image_url: str):
+    db_product.image_url = image_url
+    await db.commit()
+    catalog_cache.invalidate()
     await db.refresh(db_product)
+    await index_product(db, db_product)
     return db_product
 
 async def delete_product(db: AsyncSession, db_product: Product):
     await db.delete(db_product)
     await db.commit()
+    catalog_cache.invalidate()
+    barcode_index.discard(db_product.barcode)
+    catalog_snapshot.remove(db_product.id)
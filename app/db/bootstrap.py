@@ -0,0 +1,66 @@
+"""Criação rápida do schema em bancos novos.
+
+Em vez de reproduzir as migrations uma a uma, cria todas as tabelas de uma vez
+a partir dos models e marca o Alembic como head. Uso:
+
+    python -m app.db.bootstrap
+"""
+import asyncio
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+import app.db.models  # noqa: F401  (registra os models no metadata)
+from app.db.base import Base
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Extensões usadas pelo schema; só são instaladas se o servidor as oferecer.
+EXTENSIONS = ("pg_trgm",)
+
+
+def _bootstrap(connection) -> bool:
+    if inspect(connection).has_table("alembic_version"):
+        return False
+
+    for extension in EXTENSIONS:
+        available = connection.execute(
+            text("SELECT 1 FROM pg_available_extensions WHERE name = :name"),
+            {"name": extension},
+        ).scalar()
+        if available:
+            connection.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+
+    Base.metadata.create_all(connection)
+
+    script = ScriptDirectory.from_config(Config(str(ALEMBIC_INI)))
+    MigrationContext.configure(connection).stamp(script, "heads")
+    return True
+
+
+async def bootstrap_database(engine: AsyncEngine) -> bool:
+    """Cria o schema e marca o head do Alembic numa única transação.
+
+    Retorna False sem alterar nada se o banco já estiver sob controle do Alembic.
+    """
+    async with engine.begin() as conn:
+        return await conn.run_sync(_bootstrap)
+
+
+async def main():
+    from app.db.session import engine
+
+    created = await bootstrap_database(engine)
+    await engine.dispose()
+    if created:
+        print("Schema criado e Alembic marcado como head.")
+    else:
+        print("Banco já inicializado; use 'alembic upgrade head'.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
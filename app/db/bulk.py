@@ -0,0 +1,18 @@
+from typing import Iterable, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def copy_records(
+    db: AsyncSession, table: str, columns: Sequence[str], records: Iterable[tuple]
+) -> None:
+    """Carrega linhas em `table` com COPY binário do asyncpg.
+
+    Usa a mesma conexão (e transação) da sessão, então serve para preencher
+    tabelas temporárias de staging antes de um INSERT ... SELECT.
+    """
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table, records=records, columns=list(columns)
+    )
@@ -5,5 +5,10 @@ Base = declarative_base()
 from app.db.models.user import User
 from app.db.models.client import Client
 from app.db.models.products import Product
+from app.db.models.products import ProductExpiration
+from app.db.models.products import ProductStockShard
 from app.db.models.orders import Order
 from app.db.models.orders import OrderItem
+from app.db.models.recommendations import ProductPair
+from app.db.models.recommendations import ProductRecommendation
+from app.db.models.recommendations import RecommendationState
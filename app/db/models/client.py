@@ -1,7 +1,11 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, DDL, Index, event, text
 from app.db.base import Base
 from sqlalchemy.orm import relationship
 
+# Colunas com índice GIN trigram (pg_trgm) para a busca aproximada de clientes.
+TRIGRAM_COLUMNS = ("name", "email", "cpf", "phone")
+
+
 class Client(Base):
     __tablename__ = "clients"
     id = Column(Integer, primary_key=True, index=True)
@@ -10,4 +14,26 @@ class Client(Base):
     cpf = Column(String, unique=True, nullable=False)
     phone = Column(String, nullable=True)
     orders = relationship("Order", back_populates="client")
-    
\ No newline at end of file
+
+    # Paginação por cursor da listagem ordenada por nome.
+    __table_args__ = (Index("ix_clients_name_id", "name", "id"),)
+
+
+def _pg_trgm_installed(ddl, target, bind, **kw) -> bool:
+    if bind.dialect.name != "postgresql":
+        return False
+    result = bind.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+    return result.scalar() is not None
+
+
+# Os índices trigram dependem da extensão pg_trgm, então ficam fora do metadata
+# e só são criados no create_all quando a extensão está instalada no banco.
+for _column in TRIGRAM_COLUMNS:
+    event.listen(
+        Client.__table__,
+        "after_create",
+        DDL(
+            f"CREATE INDEX IF NOT EXISTS ix_clients_{_column}_trgm "
+            f"ON clients USING gin ({_column} gin_trgm_ops)"
+        ).execute_if(callable_=_pg_trgm_installed),
+    )
@@ -1,7 +1,19 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Date, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import CheckConstraint, literal_column, Column, Computed, Integer, String, Float, Boolean, Date, DateTime, Text, Index, ForeignKey
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.sql import func
 from app.db.base import Base
 
+# A ordenação por descrição usa só o início do texto: é o que cabe numa linha
+# de índice btree (descrições longas estourariam o limite de ~2,7 KB).
+DESCRIPTION_SORT_LENGTH = 200
+
+
+def description_sort_key(description):
+    # Constante literal (não parâmetro) para o planejador casar com o índice.
+    return func.left(description, literal_column(str(DESCRIPTION_SORT_LENGTH)))
+
+
 class Product(Base):
     __tablename__ = "products"
 
@@ -14,3 +26,64 @@ class Product(Base):
     expiration_date = Column(Date, nullable=True)
     available = Column(Boolean, default=True)
     image_url = Column(String, nullable=True)
+    # Venda relâmpago: com N > 0 o estoque fica dividido em N linhas de
+    # `product_stock_shards` e `stock` só volta a valer quando o modo é desligado.
+    stock_shards = Column(Integer, nullable=False, default=0, server_default="0")
+    # Mantido pelo próprio Postgres; a descrição pesa mais que a seção no ranking.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('portuguese', coalesce(description, '')), 'A') || "
+            "setweight(to_tsvector('portuguese', coalesce(section, '')), 'B')",
+            persisted=True,
+        ),
+    ))
+
+    # Índices compostos da listagem paginada por cursor: um por ordenação
+    # (id, preço, início da descrição), com e sem filtro de seção.
+    __table_args__ = (
+        Index("ix_products_section_id", "section", "id"),
+        Index("ix_products_section_price_id", "section", "price", "id"),
+        Index("ix_products_section_description_id", "section", description_sort_key(description), "id"),
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_description_id", description_sort_key(description), "id"),
+        # Só os produtos ainda disponíveis: é o que a varredura de validade percorre.
+        Index(
+            "ix_products_expiration_date_available",
+            "expiration_date",
+            "id",
+            postgresql_where=available,
+        ),
+        Index("ix_products_search_vector", search_vector, postgresql_using="gin"),
+    )
+
+
+class ProductExpiration(Base):
+    """Registro de cada produto marcado como indisponível pela varredura de validade."""
+
+    __tablename__ = "product_expirations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
+    expiration_date = Column(Date, nullable=False)
+    expired_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+    product = relationship("Product")
+
+
+class ProductStockShard(Base):
+    """Parte do estoque de um produto em venda relâmpago.
+
+    Pedidos concorrentes do mesmo produto travam partes diferentes em vez de
+    disputar a mesma linha de `products`.
+    """
+
+    __tablename__ = "product_stock_shards"
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    quantity = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("quantity >= 0", name="ck_product_stock_shards_quantity"),
+    )
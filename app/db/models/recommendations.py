@@ -0,0 +1,45 @@
+from sqlalchemy import CheckConstraint, Column, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class ProductPair(Base):
+    """Matriz esparsa de coocorrência: em quantos pedidos os dois produtos aparecem juntos.
+
+    Cada par é guardado nas duas direções, então os vizinhos de um produto
+    são lidos pela chave primária.
+    """
+
+    __tablename__ = "product_pairs"
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    related_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    orders = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_product_pairs_product_id_orders", "product_id", orders.desc(), "related_id"),
+    )
+
+
+class ProductRecommendation(Base):
+    """Os K produtos mais comprados junto com `product_id`, já na ordem de exibição."""
+
+    __tablename__ = "product_recommendations"
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    related_ids = Column(ARRAY(Integer), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class RecommendationState(Base):
+    """Linha única com o último pedido já contabilizado na matriz."""
+
+    __tablename__ = "recommendation_state"
+
+    id = Column(Integer, primary_key=True, default=1)
+    last_order_id = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        CheckConstraint("id = 1", name="ck_recommendation_state_single_row"),
+    )
@@ -8,30 +8,59 @@ sentry_sdk.init(
 )
 
 from fastapi import FastAPI
+from fastapi.exceptions import RequestValidationError
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.api.v1.routes import api_router
-from app.startup import create_initial_admin
+from app.core.compression import CompressionMiddleware
+from app.core.responses import http_exception_handler, request_validation_exception_handler
+from app.core.static_assets import build_router as build_static_router
+from app.startup import (
+    create_initial_admin,
+    refresh_catalog_indexes_periodically,
+    start_background_task,
+    sweep_expired_products_periodically,
+    update_recommendations_periodically,
+    warm_catalog_indexes,
+)
+from app.services import client_import, product_images
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 app = FastAPI(title="Lu Estilo API")
 
+app.add_exception_handler(StarletteHTTPException, http_exception_handler)
+app.add_exception_handler(RequestValidationError, request_validation_exception_handler)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], 
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count"],
 )
 
+app.add_middleware(CompressionMiddleware)
+
 app.add_middleware(SentryAsgiMiddleware)
 
 app.include_router(api_router, prefix="/api/v1")
 
-app.mount("/", StaticFiles(directory="static", html=True), name="static")
+# Página inicial e demais arquivos de `static/`, servidos da memória; caminhos
+# que não são arquivos conhecidos param no 404 do roteador.
+app.include_router(build_static_router())
 
 @app.on_event("startup")
 async def startup_event():
     await create_initial_admin()
+    await warm_catalog_indexes()
+    start_background_task(refresh_catalog_indexes_periodically())
+    start_background_task(sweep_expired_products_periodically())
+    start_background_task(update_recommendations_periodically())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    product_images.shutdown_pool()
+    client_import.shutdown_pool()
 
 @app.get("/debug-sentry")
 async def trigger_error():
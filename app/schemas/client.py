@@ -1,10 +1,16 @@
-from pydantic import BaseModel, EmailStr, Field, validator
+from datetime import datetime
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter, validator
+from typing import List, Literal, Optional
+
+from app.schemas.orders import OrderOut
+
+ClientSort = Literal["id", "-id", "name", "-name"]
 
 class ClientBase(BaseModel):
     name: str= Field(example="Maria da Silva")
     email: EmailStr = Field(example="maria@cliente.com")
     cpf: str = Field(min_length=11, max_length=11, pattern=r"^\d{11}$", example="12345678900")  # CPF com 11 dígitos numéricos
-    phone: str = Field(None, example="+5511999998888")  # Telefone com código do país
+    phone: Optional[str] = Field(None, example="+5511999998888")  # Telefone com código do país
 
 @validator("phone")
 def validate_phone(cls, v):
@@ -19,7 +25,35 @@ class ClientUpdate(ClientBase):
     pass
 
 class ClientOut(ClientBase):
+    # Na saída o email vem do banco, já validado na gravação; revalidá-lo
+    # (email_validator) em cada linha da listagem custava mais que a consulta.
+    email: str = Field(example="maria@cliente.com")
     id: int = Field(example=1)
 
     class Config:
         model_config = {"from_attributes": True}
+
+
+client_out_list_adapter = TypeAdapter(List[ClientOut])
+
+
+class ClientImportError(BaseModel):
+    line: int = Field(example=12, description="Linha do arquivo (o cabeçalho do CSV é a linha 1)")
+    email: Optional[str] = Field(None, example="maria@cliente.com")
+    cpf: Optional[str] = Field(None, example="12345678900")
+    errors: List[str] = Field(example=["cpf: CPF inválido"])
+
+
+class ClientImportReport(BaseModel):
+    total_rows: int = Field(example=1000)
+    inserted: int = Field(example=990)
+    rejected: int = Field(example=10)
+    errors: List[ClientImportError] = []
+
+
+class ClientSummary(BaseModel):
+    client: ClientOut
+    order_count: int = Field(example=12, description="Total de pedidos do cliente")
+    total_spent: float = Field(example=1549.7, description="Soma de todos os itens de todos os pedidos")
+    last_order_at: Optional[datetime] = Field(None, example="2025-05-26T10:00:00")
+    recent_orders: List[OrderOut] = Field(description="Pedidos mais recentes, do mais novo ao mais antigo")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional
 from datetime import datetime
 
@@ -31,4 +31,6 @@ class OrderOut(BaseModel):
     items: List[OrderItemOut]
 
     class Config:
-        model_config = {"from_attributes": True}
\ No newline at end of file
+        model_config = {"from_attributes": True}
+
+order_out_list_adapter = TypeAdapter(List[OrderOut])
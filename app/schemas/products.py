@@ -1,7 +1,10 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
+from typing import Dict, List, Literal, Optional
 from datetime import date
 
+# Ordenações da listagem; o prefixo "-" indica ordem decrescente.
+ProductSort = Literal["id", "-id", "price", "-price", "description", "-description"]
+
 class ProductBase(BaseModel):
     description: str = Field(example="Camiseta Polo")
     price: float = Field(example=59.90)
@@ -24,3 +27,141 @@ class ProductOut(ProductBase):
 
     class Config:
         model_config = {"from_attributes": True}
+
+
+# Adapters reaproveitados para serializar produtos direto para bytes JSON.
+product_out_adapter = TypeAdapter(ProductOut)
+product_out_list_adapter = TypeAdapter(List[ProductOut])
+
+
+class ProductFilters(BaseModel):
+    section: Optional[str] = Field(None, description="Filtrar pela seção", example="Roupas Femininas")
+    available: Optional[bool] = Field(None, description="Filtrar por disponibilidade")
+    min_price: Optional[float] = Field(None, description="Preço mínimo", example=50.0)
+    max_price: Optional[float] = Field(None, description="Preço máximo", example=150.0)
+    in_stock: Optional[bool] = Field(None, description="Apenas com (true) ou sem (false) estoque")
+
+
+class SectionFacet(BaseModel):
+    section: str = Field(example="Roupas Masculinas")
+    count: int = Field(example=12)
+
+
+class ProductSearchResult(BaseModel):
+    total: int = Field(example=12, description="Total de produtos encontrados (respeitando o filtro de seção)")
+    facets: List[SectionFacet] = Field(description="Quantidade de resultados por seção, sem o filtro de seção")
+    items: List[ProductOut]
+
+
+product_search_adapter = TypeAdapter(ProductSearchResult)
+
+
+class ProductBulkChange(BaseModel):
+    """Alteração aplicada a todos os produtos que atendem ao filtro."""
+    price: Optional[float] = Field(None, gt=0, description="Novo preço")
+    price_percent: Optional[float] = Field(
+        None, gt=-100, description="Reajuste percentual do preço (-10 = 10% de desconto)", example=-10
+    )
+    stock: Optional[int] = Field(None, ge=0, description="Novo estoque")
+    stock_delta: Optional[int] = Field(None, description="Soma ao estoque atual (nunca fica negativo)")
+    available: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def check_change(self):
+        if all(value is None for _, value in self):
+            raise ValueError("Informe ao menos uma alteração")
+        if self.price is not None and self.price_percent is not None:
+            raise ValueError("Use price ou price_percent, não os dois")
+        if self.stock is not None and self.stock_delta is not None:
+            raise ValueError("Use stock ou stock_delta, não os dois")
+        return self
+
+
+class ProductBulkValue(BaseModel):
+    id: int = Field(example=1)
+    price: Optional[float] = Field(None, gt=0, example=49.9)
+    stock: Optional[int] = Field(None, ge=0, example=30)
+    available: Optional[bool] = None
+
+
+class ProductBulkUpdate(BaseModel):
+    """Use `filters` + `change` ou uma lista `values` com o novo valor de cada produto."""
+    filters: Optional[ProductFilters] = None
+    change: Optional[ProductBulkChange] = None
+    values: Optional[List[ProductBulkValue]] = Field(None, max_length=10000)
+    dry_run: bool = Field(False, description="Apenas conta e lista os produtos afetados, sem alterar")
+
+    @model_validator(mode="after")
+    def check_mode(self):
+        if (self.change is None) == (self.values is None):
+            raise ValueError("Informe change (com filters) ou values")
+        if self.values is not None and self.filters is not None:
+            raise ValueError("filters não se aplica a values")
+        if self.values is not None and len({value.id for value in self.values}) != len(self.values):
+            # Com ids repetidos o resultado dependeria da ordem das linhas no UPDATE.
+            raise ValueError("values não pode repetir o mesmo id")
+        return self
+
+
+class ProductBulkUpdateResult(BaseModel):
+    dry_run: bool = Field(example=False)
+    matched: int = Field(example=2)
+    ids: List[int] = Field(example=[3, 7])
+
+
+class ProductFlashSale(BaseModel):
+    shards: int = Field(8, ge=2, le=64, description="Em quantas partes dividir o estoque")
+
+
+class ProductStockOut(BaseModel):
+    product_id: int = Field(example=1)
+    stock: int = Field(example=500, description="Estoque total (soma das partes em venda relâmpago)")
+    shards: List[int] = Field(example=[63, 62, 63, 62, 63, 62, 63, 62], description="Quantidade em cada parte")
+
+
+class RestockItem(BaseModel):
+    product_id: int = Field(example=1)
+    description: str = Field(example="Camiseta Polo")
+    section: str = Field(example="Roupas Masculinas")
+    stock: int = Field(example=12)
+    avg_daily_demand: float = Field(example=3.2, description="Média diária na janela analisada")
+    recent_daily_demand: float = Field(example=4.1, description="Média diária dos últimos 7 dias")
+    safety_stock: int = Field(example=6)
+    reorder_point: int = Field(example=29, description="Estoque que cobre o prazo de reposição mais a segurança")
+    days_of_cover: Optional[float] = Field(example=3.7, description="Dias até zerar o estoque (nulo sem demanda)")
+    suggested_order: int = Field(example=61, description="Quantidade sugerida para cobrir prazo + cobertura alvo")
+
+
+class RestockReport(BaseModel):
+    window_days: int = Field(example=28)
+    lead_time_days: int = Field(example=7)
+    coverage_days: int = Field(example=14)
+    last_order_id: int = Field(example=1520, description="Último pedido considerado")
+    items: List[RestockItem]
+
+
+restock_report_adapter = TypeAdapter(RestockReport)
+
+
+class ProductImportError(BaseModel):
+    line: int = Field(example=12, description="Linha do arquivo (o cabeçalho do CSV é a linha 1)")
+    barcode: Optional[str] = Field(None, example="7891234567890")
+    errors: List[str] = Field(example=["price: Input should be a valid number"])
+
+
+class ProductImportReport(BaseModel):
+    total_rows: int = Field(example=1000)
+    inserted: int = Field(example=950)
+    updated: int = Field(example=45)
+    rejected: int = Field(example=5)
+    errors: List[ProductImportError] = []
+
+
+class ProductImageOut(BaseModel):
+    image_url: str = Field(example="/api/v1/media/products/3f8a0c2e9b7d4e15a6c1f0b2d9e87a4c.jpg")
+    thumbnails: Dict[int, str] = Field(
+        example={
+            160: "/api/v1/media/products/3f8a0c2e9b7d4e15a6c1f0b2d9e87a4c_160.webp",
+            480: "/api/v1/media/products/3f8a0c2e9b7d4e15a6c1f0b2d9e87a4c_480.webp",
+        }
+    )
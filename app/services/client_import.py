@@ -0,0 +1,186 @@
+"""Importação em massa de clientes (CSV ou JSON Lines).
+
+O arquivo é lido em blocos numa thread e cada bloco é validado (dígitos do CPF,
+formato do email e do telefone) num pool de processos, vários blocos em
+paralelo. As linhas válidas vão para uma tabela temporária via COPY e um único
+INSERT ... SELECT carrega em `clients` as que não repetem email ou CPF, no
+arquivo ou no banco; as demais voltam no relatório. Uso pela linha de comando:
+
+    python -m app.services.client_import clientes.csv
+"""
+import asyncio
+import csv
+import json
+import multiprocessing
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.bulk import copy_records
+from app.schemas.client import ClientImportError, ClientImportReport
+from app.services.client_validation import validate_chunk
+from app.services.product_import import iter_rows
+
+CHUNK_SIZE = 5000
+
+STAGING_TABLE = "client_import_staging"
+
+# A primeira ocorrência de cada email/CPF no arquivo vence; o EXISTS usa os
+# índices únicos de `clients`. O SELECT final enxerga o banco de antes do
+# INSERT, então devolve só as linhas rejeitadas, com os motivos.
+LOAD_CLIENTS = text(
+    "WITH ranked AS ("
+    " SELECT line, name, email, cpf, phone,"
+    " row_number() OVER (PARTITION BY email ORDER BY line) > 1 AS repeated_email,"
+    " row_number() OVER (PARTITION BY cpf ORDER BY line) > 1 AS repeated_cpf,"
+    " EXISTS (SELECT 1 FROM clients WHERE clients.email = staging.email) AS existing_email,"
+    " EXISTS (SELECT 1 FROM clients WHERE clients.cpf = staging.cpf) AS existing_cpf"
+    f" FROM {STAGING_TABLE} AS staging"
+    "), inserted AS ("
+    " INSERT INTO clients (name, email, cpf, phone)"
+    " SELECT name, email, cpf, phone FROM ranked"
+    " WHERE NOT (repeated_email OR repeated_cpf OR existing_email OR existing_cpf)"
+    " ORDER BY line"
+    " ON CONFLICT DO NOTHING"
+    " RETURNING email"
+    ")"
+    " SELECT line, email, cpf, array_remove(ARRAY["
+    " CASE WHEN existing_email THEN 'Email já registrado' END,"
+    " CASE WHEN existing_cpf THEN 'CPF já registrado' END,"
+    " CASE WHEN repeated_email THEN 'Email repetido no arquivo' END,"
+    " CASE WHEN repeated_cpf THEN 'CPF repetido no arquivo' END,"
+    # Cadastro concorrente entre o EXISTS e o INSERT.
+    " CASE WHEN NOT (repeated_email OR repeated_cpf OR existing_email OR existing_cpf)"
+    " THEN 'Email ou CPF já registrado' END"
+    " ], NULL) AS errors"
+    " FROM ranked"
+    " WHERE repeated_email OR repeated_cpf OR existing_email OR existing_cpf"
+    " OR NOT EXISTS (SELECT 1 FROM inserted WHERE inserted.email = ranked.email)"
+    " ORDER BY line"
+)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.import_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def iter_chunks(file: BinaryIO, filename: str, chunk_size: int = CHUNK_SIZE) -> Iterator[List[Tuple[int, object]]]:
+    """Lê o arquivo aos poucos e devolve blocos de (linha, dados) ainda não validados."""
+    chunk: List[Tuple[int, object]] = []
+    rows = iter_rows(file, filename)
+    while True:
+        try:
+            chunk.append(next(rows))
+        except StopIteration:
+            break
+        except (json.JSONDecodeError, UnicodeDecodeError, csv.Error) as exc:
+            raise ValueError(f"Arquivo inválido: {exc}") from exc
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def import_clients(db: AsyncSession, file: BinaryIO, filename: str) -> ClientImportReport:
+    """Importa o arquivo numa única transação e devolve o relatório por linha.
+
+    Clientes já cadastrados (mesmo email ou CPF) não são alterados: a linha é
+    rejeitada, assim como repetições dentro do próprio arquivo.
+    """
+    await db.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+    await db.execute(
+        text(
+            f"CREATE TEMP TABLE {STAGING_TABLE} ("
+            " line integer NOT NULL, name varchar NOT NULL, email varchar NOT NULL,"
+            " cpf varchar NOT NULL, phone varchar"
+            ") ON COMMIT DROP"
+        )
+    )
+
+    report = ClientImportReport(total_rows=0, inserted=0, rejected=0)
+    loop = asyncio.get_running_loop()
+    pool = get_pool()
+    pending = deque()
+    staged = 0
+
+    async def load_next():
+        nonlocal staged
+        valid, invalid = await pending.popleft()
+        report.errors.extend(
+            ClientImportError(line=line, email=email, cpf=cpf, errors=errors)
+            for line, email, cpf, errors in invalid
+        )
+        if valid:
+            await copy_records(db, STAGING_TABLE, ("line", "name", "email", "cpf", "phone"), valid)
+            staged += len(valid)
+
+    chunks = iter_chunks(file, filename)
+    while True:
+        # A leitura roda numa thread e a validação no pool, alguns blocos à frente do COPY.
+        chunk = await run_in_threadpool(next, chunks, None)
+        if chunk is None:
+            break
+        report.total_rows += len(chunk)
+        pending.append(loop.run_in_executor(pool, validate_chunk, chunk))
+        if len(pending) > settings.import_workers:
+            await load_next()
+    while pending:
+        await load_next()
+
+    if staged:
+        result = await db.execute(LOAD_CLIENTS)
+        rejected = result.all()
+        report.inserted = staged - len(rejected)
+        report.errors.extend(
+            ClientImportError(line=line, email=email, cpf=cpf, errors=errors)
+            for line, email, cpf, errors in rejected
+        )
+        report.errors.sort(key=lambda error: error.line)
+    report.rejected = len(report.errors)
+
+    await db.commit()
+    return report
+
+
+async def main(path: str):
+    from app.db.session import async_session, engine
+
+    try:
+        async with async_session() as session:
+            with open(path, "rb") as file:
+                report = await import_clients(session, file, path)
+    finally:
+        shutdown_pool()
+        await engine.dispose()
+
+    print(f"{report.total_rows} linhas: {report.inserted} inseridas, {report.rejected} rejeitadas")
+    for error in report.errors:
+        print(f"  linha {error.line} ({error.email or '-'}): {'; '.join(error.errors)}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("Uso: python -m app.services.client_import <arquivo.csv|arquivo.jsonl>")
+    asyncio.run(main(sys.argv[1]))
@@ -0,0 +1,108 @@
+"""Validação de clientes da importação em massa, executada nos processos do pool.
+
+Assim como `image_processing`, este módulo não importa nada do app para que os
+processos filhos (iniciados com "spawn") subam rápido.
+"""
+import re
+from typing import List, Optional, Tuple
+
+import email_validator
+from email_validator import EmailNotValidError, validate_email
+
+# Telefone com + e o código do país; espaços, hífens e parênteses são ignorados.
+PHONE_PATTERN = re.compile(r"^\+\d{10,15}$")
+PHONE_SEPARATORS = re.compile(r"[\s\-().]")
+
+# Caminho rápido para o caso comum (endereço ASCII simples): o email_validator
+# é o gargalo da importação e fica só para o que esta expressão não cobre.
+SIMPLE_EMAIL = re.compile(
+    r"^[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+    r"@((?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+[A-Za-z]{2,63})$"
+)
+
+ValidRow = Tuple[int, str, str, str, Optional[str]]
+InvalidRow = Tuple[int, Optional[str], Optional[str], List[str]]
+
+
+def cpf_is_valid(cpf: str) -> bool:
+    """Confere os dois dígitos verificadores de um CPF com 11 dígitos."""
+    if len(cpf) != 11 or not cpf.isdigit() or cpf == cpf[0] * 11:
+        return False
+    digits = [int(digit) for digit in cpf]
+    for position in (9, 10):
+        total = sum(digit * weight for digit, weight in zip(digits, range(position + 1, 1, -1)))
+        if total * 10 % 11 % 10 != digits[position]:
+            return False
+    return True
+
+
+def normalize_email(email: str) -> str:
+    """Devolve o email normalizado (domínio em minúsculas) ou levanta EmailNotValidError."""
+    match = SIMPLE_EMAIL.match(email)
+    if match and len(email) <= 254 and email.index("@") <= 64:
+        domain = match.group(1).lower()
+        if domain.rsplit(".", 1)[-1] not in email_validator.SPECIAL_USE_DOMAIN_NAMES:
+            return email[: match.start(1)] + domain
+    return validate_email(email, check_deliverability=False).normalized
+
+
+def _text(value) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def validate_row(row) -> Tuple[Optional[tuple], List[str]]:
+    """Normaliza uma linha; devolve ((nome, email, cpf, telefone), []) ou (None, erros)."""
+    if not isinstance(row, dict):
+        return None, ["linha: esperado um objeto com os campos do cliente"]
+
+    errors = []
+    name = _text(row.get("name"))
+    if name is None:
+        errors.append("name: campo obrigatório")
+
+    email = _text(row.get("email"))
+    if email is None:
+        errors.append("email: campo obrigatório")
+    else:
+        try:
+            email = normalize_email(email)
+        except EmailNotValidError as exc:
+            errors.append(f"email: {exc}")
+
+    cpf = _text(row.get("cpf"))
+    if cpf is None:
+        errors.append("cpf: campo obrigatório")
+    else:
+        # Aceita CPF formatado e recupera zeros à esquerda perdidos em planilhas.
+        cpf = re.sub(r"[.\-\s]", "", cpf)
+        if cpf.isdigit():
+            cpf = cpf.zfill(11)
+        if not cpf_is_valid(cpf):
+            errors.append("cpf: CPF inválido")
+
+    phone = _text(row.get("phone"))
+    if phone is not None:
+        phone = PHONE_SEPARATORS.sub("", phone)
+        if not PHONE_PATTERN.match(phone):
+            errors.append("phone: O telefone deve começar com + e o código do país, ex: +5511999998888")
+
+    if errors:
+        return None, errors
+    return (name, email, cpf, phone), []
+
+
+def validate_chunk(rows: List[Tuple[int, object]]) -> Tuple[List[ValidRow], List[InvalidRow]]:
+    """Valida um bloco de (linha, dados) e separa as linhas válidas dos erros."""
+    valid: List[ValidRow] = []
+    invalid: List[InvalidRow] = []
+    for line, row in rows:
+        client, errors = validate_row(row)
+        if client is not None:
+            valid.append((line, *client))
+        else:
+            fields = row if isinstance(row, dict) else {}
+            invalid.append((line, _text(fields.get("email")), _text(fields.get("cpf")), errors))
+    return valid, invalid
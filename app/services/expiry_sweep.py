@@ -0,0 +1,72 @@
+"""Varredura de validade: marca como indisponíveis os produtos vencidos.
+
+Percorre o índice parcial `ix_products_expiration_date_available` em lotes de
+`expiry_sweep_batch_size` produtos, cada lote na sua própria transação curta,
+e grava em `product_expirations` o que foi alterado. Uso pela linha de comando:
+
+    python -m app.services.expiry_sweep
+"""
+import asyncio
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import catalog_cache
+from app.core.config import settings
+from app.crud.products import reindex_products
+
+# Trava só as linhas do lote; linhas em uso por outra transação (um pedido,
+# por exemplo) ficam para a próxima rodada em vez de bloquear a varredura.
+EXPIRE_BATCH = text(
+    "WITH batch AS ("
+    " SELECT id FROM products"
+    " WHERE available AND expiration_date < :today"
+    " ORDER BY expiration_date, id"
+    " LIMIT :batch_size"
+    " FOR UPDATE SKIP LOCKED"
+    "), expired AS ("
+    " UPDATE products SET available = false"
+    " FROM batch WHERE products.id = batch.id"
+    " RETURNING products.id, products.expiration_date"
+    "), logged AS ("
+    " INSERT INTO product_expirations (product_id, expiration_date)"
+    " SELECT id, expiration_date FROM expired"
+    ")"
+    " SELECT id FROM expired"
+)
+
+
+async def expire_products(
+    db: AsyncSession, today: Optional[date] = None, batch_size: Optional[int] = None
+) -> int:
+    """Desativa os produtos com validade anterior a `today` e devolve quantos foram alterados."""
+    today = today or date.today()
+    batch_size = batch_size or settings.expiry_sweep_batch_size
+    total = 0
+    while True:
+        result = await db.execute(EXPIRE_BATCH, {"today": today, "batch_size": batch_size})
+        product_ids = result.scalars().all()
+        await db.commit()
+        if not product_ids:
+            return total
+
+        total += len(product_ids)
+        catalog_cache.invalidate()
+        await reindex_products(db, product_ids)
+        if len(product_ids) < batch_size:
+            return total
+
+
+async def main():
+    from app.db.session import async_session, engine
+
+    async with async_session() as session:
+        total = await expire_products(session)
+    await engine.dispose()
+    print(f"{total} produtos vencidos marcados como indisponíveis")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
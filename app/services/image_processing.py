@@ -0,0 +1,41 @@
+"""Geração de miniaturas, executada nos processos do pool de imagens.
+
+Este módulo não importa nada do app para que os processos filhos (iniciados
+com "spawn") subam rápido e sem precisar das configurações do banco.
+"""
+import os
+from typing import Dict, Tuple
+
+THUMBNAIL_SIZES = (160, 480)
+
+
+def make_thumbnails(source: str, digest: str, directory: str, expected_format: str) -> Tuple[str, Dict[int, str]]:
+    """Valida a imagem em `source` e grava uma miniatura WebP por tamanho.
+
+    Retorna o formato detectado pelo Pillow (ex.: "PNG") e {tamanho: nome do
+    arquivo}. Levanta ValueError se o arquivo não for uma imagem que o Pillow
+    consiga abrir ou se o formato não for `expected_format` (o do Content-Type).
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(source) as image:
+            detected = image.format
+            image.verify()
+        if detected != expected_format:
+            raise ValueError(f"Conteúdo da imagem ({detected}) não corresponde ao Content-Type ({expected_format})")
+        with Image.open(source) as image:
+            image.load()
+            image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+            thumbnails = {}
+            for size in THUMBNAIL_SIZES:
+                thumbnail = image.copy()
+                thumbnail.thumbnail((size, size))
+                filename = f"{digest}_{size}.webp"
+                temporary = os.path.join(directory, f".{filename}.tmp")
+                thumbnail.save(temporary, format="WEBP", quality=80, method=4)
+                os.replace(temporary, os.path.join(directory, filename))
+                thumbnails[size] = filename
+            return detected, thumbnails
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError) as exc:
+        raise ValueError(f"Imagem inválida: {exc}") from exc
@@ -0,0 +1,116 @@
+"""Upload e armazenamento local das imagens de produtos.
+
+O corpo da requisição é gravado em disco à medida que chega (nunca inteiro em
+memória), o arquivo recebe o nome do seu hash SHA-256 e as miniaturas são
+geradas num pool de processos, fora do event loop. Como o nome muda sempre que
+o conteúdo muda, os arquivos podem ser servidos com cache imutável.
+"""
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.image_processing import make_thumbnails
+
+MEDIA_PREFIX = "/api/v1/media/products"
+
+# Content-Type aceito → formato do Pillow; o arquivo só é aceito se o Pillow
+# detectar esse mesmo formato no conteúdo.
+CONTENT_TYPES = {
+    "image/jpeg": "JPEG",
+    "image/png": "PNG",
+    "image/webp": "WEBP",
+}
+
+# A extensão (e com ela o tipo servido) vem do formato detectado.
+EXTENSIONS = {
+    "JPEG": "jpg",
+    "PNG": "png",
+    "WEBP": "webp",
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def products_dir() -> Path:
+    directory = Path(settings.media_root) / "products"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def media_url(filename: str) -> str:
+    return f"{MEDIA_PREFIX}/{filename}"
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.image_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def save_image(body: AsyncIterator[bytes], content_type: str) -> Dict[str, object]:
+    """Grava a imagem recebida em `body` e gera as miniaturas.
+
+    Retorna a URL da imagem original e as URLs das miniaturas por tamanho.
+    """
+    expected_format = CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+    if expected_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Tipo de imagem não suportado; use {', '.join(CONTENT_TYPES)}",
+        )
+
+    directory = products_dir()
+    temporary = directory / f".upload-{uuid.uuid4().hex}.tmp"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(temporary, "wb") as file:
+            async for chunk in body:
+                size += len(chunk)
+                if size > settings.max_image_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Imagem maior que {settings.max_image_bytes} bytes",
+                    )
+                digest.update(chunk)
+                await run_in_threadpool(file.write, chunk)
+        if size == 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Imagem vazia")
+
+        name = digest.hexdigest()[:32]
+        loop = asyncio.get_running_loop()
+        try:
+            image_format, thumbnails = await loop.run_in_executor(
+                get_pool(), make_thumbnails, str(temporary), name, str(directory), expected_format
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        filename = f"{name}.{EXTENSIONS[image_format]}"
+        os.replace(temporary, directory / filename)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+    return {
+        "image_url": media_url(filename),
+        "thumbnails": {size: media_url(thumbnail) for size, thumbnail in thumbnails.items()},
+    }
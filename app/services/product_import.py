@@ -0,0 +1,214 @@
+"""Importação em massa de produtos (CSV ou JSON Lines) com upsert por código de barras.
+
+O arquivo é lido e validado em blocos numa thread, cada bloco válido vai para
+uma tabela temporária via COPY e, no fim, um UPDATE dos produtos já
+cadastrados e um INSERT dos novos aplicam tudo em `products`. Uso pela linha de comando:
+
+    python -m app.services.product_import catalogo.csv
+"""
+import asyncio
+import csv
+import io
+import json
+import sys
+from typing import BinaryIO, Iterator, List, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import barcode_index, catalog_cache
+from app.core.catalog_snapshot import catalog_snapshot
+from app.db.bulk import copy_records
+from app.schemas.products import ProductCreate, ProductImportError, ProductImportReport
+
+CHUNK_SIZE = 2000
+
+COLUMNS = (
+    "description",
+    "price",
+    "barcode",
+    "section",
+    "stock",
+    "expiration_date",
+    "available",
+    "image_url",
+)
+
+STAGING_TABLE = "product_import_staging"
+
+product_adapter = TypeAdapter(ProductCreate)
+
+Chunk = Tuple[List[Tuple[int, ProductCreate]], List[ProductImportError]]
+
+
+def iter_rows(file: BinaryIO, filename: str) -> Iterator[Tuple[int, dict]]:
+    stream = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    if filename.lower().endswith((".jsonl", ".ndjson", ".json")):
+        for line_number, line in enumerate(stream, start=1):
+            if line.strip():
+                yield line_number, json.loads(line)
+        return
+
+    sample = stream.read(4096)
+    stream.seek(0)
+    try:
+        # Planilhas exportadas no Brasil costumam usar ";" como separador.
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.DictReader(stream, dialect=dialect)
+    for line_number, row in enumerate(reader, start=2):
+        yield line_number, {key: value for key, value in row.items() if key and value not in ("", None)}
+
+
+def iter_chunks(file: BinaryIO, filename: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Chunk]:
+    """Lê o arquivo aos poucos e devolve blocos de (linhas válidas, erros)."""
+    valid: List[Tuple[int, ProductCreate]] = []
+    errors: List[ProductImportError] = []
+    rows = iter_rows(file, filename)
+    while True:
+        try:
+            line_number, row = next(rows)
+        except StopIteration:
+            break
+        except (json.JSONDecodeError, UnicodeDecodeError, csv.Error) as exc:
+            raise ValueError(f"Arquivo inválido: {exc}") from exc
+
+        try:
+            valid.append((line_number, product_adapter.validate_python(row)))
+        except ValidationError as exc:
+            errors.append(
+                ProductImportError(
+                    line=line_number,
+                    barcode=row.get("barcode") if isinstance(row, dict) else None,
+                    errors=[f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()],
+                )
+            )
+        if len(valid) + len(errors) >= chunk_size:
+            yield valid, errors
+            valid, errors = [], []
+    if valid or errors:
+        yield valid, errors
+
+
+# Última linha de cada código de barras no arquivo: é ela que vale.
+LATEST_ROWS = f"SELECT DISTINCT ON (barcode) * FROM {STAGING_TABLE} ORDER BY barcode, line DESC"
+
+# Cada linha guarda em `provided` as colunas presentes nela. Nos produtos já
+# cadastrados só essas colunas mudam: os defaults de ProductCreate (estoque 0,
+# disponível, sem imagem...) valem apenas para os produtos novos.
+UPDATE_EXISTING = text(
+    "UPDATE products AS p SET "
+    + ", ".join(
+        f"{column} = CASE WHEN '{column}' = ANY(s.provided) THEN s.{column} ELSE p.{column} END"
+        for column in COLUMNS
+        if column != "barcode"
+    )
+    + f" FROM ({LATEST_ROWS}) AS s WHERE p.barcode = s.barcode"
+)
+
+INSERT_NEW = text(
+    f"WITH inserted AS ("
+    f" INSERT INTO products ({', '.join(COLUMNS)})"
+    f" SELECT {', '.join(COLUMNS)} FROM ({LATEST_ROWS}) AS s"
+    f" ON CONFLICT (barcode) DO NOTHING RETURNING id"
+    f") SELECT count(*) FROM inserted"
+)
+
+# Em venda relâmpago o estoque lido é a soma das partes: o estoque importado é
+# redistribuído entre elas (como em `split_stock`), mantendo o número de partes.
+RESHARD_IMPORTED_STOCK = text(
+    "WITH imported AS ("
+    f" SELECT barcode, greatest(stock, 0) AS stock FROM ({LATEST_ROWS}) AS s"
+    " WHERE 'stock' = ANY(provided)"
+    "), sharded AS ("
+    " SELECT p.id, p.stock_shards, imported.stock FROM products AS p"
+    " JOIN imported ON imported.barcode = p.barcode WHERE p.stock_shards > 0"
+    ")"
+    " INSERT INTO product_stock_shards (product_id, shard, quantity)"
+    " SELECT id, shard, stock / stock_shards + CASE WHEN shard < stock % stock_shards THEN 1 ELSE 0 END"
+    " FROM sharded, generate_series(0, stock_shards - 1) AS shard"
+    " ON CONFLICT (product_id, shard) DO UPDATE SET quantity = EXCLUDED.quantity"
+)
+
+
+async def import_products(db: AsyncSession, file: BinaryIO, filename: str) -> ProductImportReport:
+    """Importa o arquivo numa única transação e devolve o relatório por linha.
+
+    Produtos com código de barras já cadastrado são atualizados apenas nas
+    colunas presentes na linha (célula vazia no CSV conta como ausente); se o
+    mesmo código aparece mais de uma vez, vale a última linha.
+    """
+    await db.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+    await db.execute(
+        text(
+            f"CREATE TEMP TABLE {STAGING_TABLE} ("
+            " line integer NOT NULL,"
+            " description text, price double precision, barcode varchar, section varchar,"
+            " stock integer, expiration_date date, available boolean, image_url varchar,"
+            " provided text[] NOT NULL"
+            ") ON COMMIT DROP"
+        )
+    )
+
+    report = ProductImportReport(total_rows=0, inserted=0, updated=0, rejected=0)
+    chunks = iter_chunks(file, filename)
+    while True:
+        # Leitura e validação rodam fora do event loop.
+        chunk = await run_in_threadpool(next, chunks, None)
+        if chunk is None:
+            break
+        valid, errors = chunk
+        report.total_rows += len(valid) + len(errors)
+        report.errors.extend(errors)
+        if valid:
+            await copy_records(
+                db,
+                STAGING_TABLE,
+                ("line", *COLUMNS, "provided"),
+                [
+                    (line, *(getattr(product, column) for column in COLUMNS), sorted(product.model_fields_set))
+                    for line, product in valid
+                ],
+            )
+
+    report.rejected = len(report.errors)
+    if report.total_rows > report.rejected:
+        updated = await db.execute(UPDATE_EXISTING)
+        report.updated = updated.rowcount
+        report.inserted = (await db.execute(INSERT_NEW)).scalar_one()
+        await db.execute(RESHARD_IMPORTED_STOCK)
+
+    imported = await db.execute(text(f"SELECT DISTINCT barcode FROM {STAGING_TABLE}"))
+    barcodes = imported.scalars().all()
+
+    await db.commit()
+    catalog_cache.invalidate()
+    # Os itens importados voltam ao índice na próxima leitura ou recarga; o
+    # snapshot colunar volta a valer depois da próxima recarga completa.
+    for barcode in barcodes:
+        barcode_index.discard(barcode)
+    catalog_snapshot.invalidate()
+    return report
+
+
+async def main(path: str):
+    from app.db.session import async_session, engine
+
+    async with async_session() as session:
+        with open(path, "rb") as file:
+            report = await import_products(session, file, path)
+    await engine.dispose()
+
+    print(f"{report.total_rows} linhas: {report.inserted} inseridas, "
+          f"{report.updated} atualizadas, {report.rejected} rejeitadas")
+    for error in report.errors:
+        print(f"  linha {error.line} ({error.barcode or '-'}): {'; '.join(error.errors)}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("Uso: python -m app.services.product_import <arquivo.csv|arquivo.jsonl>")
+    asyncio.run(main(sys.argv[1]))
@@ -0,0 +1,132 @@
+"""Recomendações "comprados juntos" a partir da coocorrência em `order_items`.
+
+A matriz esparsa `product_pairs` conta, para cada par de produtos, em quantos
+pedidos eles aparecem juntos. `rebuild_recommendations` a recria a partir de
+todo o histórico; `update_recommendations` soma apenas os pedidos novos (após
+`recommendation_state.last_order_id`) e recalcula o top-K só dos produtos
+afetados. A leitura consulta uma única linha de `product_recommendations`.
+Uso pela linha de comando:
+
+    python -m app.services.recommendations [--rebuild]
+"""
+import asyncio
+import sys
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import catalog_cache
+from app.core.config import settings
+
+LOCK_STATE = text(
+    "INSERT INTO recommendation_state (id, last_order_id) VALUES (1, 0)"
+    " ON CONFLICT (id) DO UPDATE SET last_order_id = recommendation_state.last_order_id"
+    " RETURNING last_order_id"
+)
+
+# Pedidos muito recentes ainda podem ter transações de ids menores em
+# andamento; ficam para a próxima rodada para nenhum ser pulado.
+SETTLED_ORDER = text(
+    "SELECT coalesce(max(id), 0) FROM orders WHERE created_at <= now() - make_interval(secs => :settle)"
+)
+
+# Pares (nas duas direções) dos pedidos no intervalo, contando cada pedido uma vez.
+PAIRS_IN_RANGE = (
+    "WITH baskets AS ("
+    " SELECT DISTINCT order_id, product_id FROM order_items"
+    " WHERE order_id > :after AND order_id <= :until"
+    ")"
+    " SELECT a.product_id, b.product_id AS related_id, count(*) AS orders"
+    " FROM baskets AS a JOIN baskets AS b ON a.order_id = b.order_id AND a.product_id <> b.product_id"
+    " GROUP BY a.product_id, b.product_id"
+)
+
+ADD_PAIRS = text(
+    "WITH added AS ("
+    " INSERT INTO product_pairs (product_id, related_id, orders)"
+    f" {PAIRS_IN_RANGE}"
+    " ON CONFLICT (product_id, related_id) DO UPDATE SET orders = product_pairs.orders + EXCLUDED.orders"
+    " RETURNING product_id"
+    ") SELECT DISTINCT product_id FROM added"
+)
+
+REFRESH_TOP_K = text(
+    "INSERT INTO product_recommendations (product_id, related_ids)"
+    " SELECT product_id, array_agg(related_id ORDER BY position)"
+    " FROM ("
+    " SELECT product_id, related_id,"
+    " row_number() OVER (PARTITION BY product_id ORDER BY orders DESC, related_id) AS position"
+    " FROM product_pairs WHERE CAST(:product_ids AS integer[]) IS NULL OR product_id = ANY(:product_ids)"
+    ") AS ranked"
+    " WHERE position <= :top_k"
+    " GROUP BY product_id"
+    " ON CONFLICT (product_id) DO UPDATE SET related_ids = EXCLUDED.related_ids, updated_at = now()"
+)
+
+SAVE_STATE = text("UPDATE recommendation_state SET last_order_id = :last_order_id WHERE id = 1")
+
+
+async def _lock_state(db: AsyncSession) -> int:
+    # Trava a linha de estado: com vários workers, só um processa cada intervalo.
+    result = await db.execute(LOCK_STATE)
+    return result.scalar_one()
+
+
+async def _settled_order(db: AsyncSession) -> int:
+    result = await db.execute(SETTLED_ORDER, {"settle": settings.recommendations_settle_seconds})
+    return result.scalar_one()
+
+
+async def rebuild_recommendations(db: AsyncSession, top_k: Optional[int] = None) -> int:
+    """Recria a matriz e o top-K a partir de todo o histórico; devolve o último pedido contabilizado."""
+    await _lock_state(db)
+    until = await _settled_order(db)
+    await db.execute(text("DELETE FROM product_pairs"))
+    await db.execute(text("DELETE FROM product_recommendations"))
+    await db.execute(ADD_PAIRS, {"after": 0, "until": until})
+    await db.execute(REFRESH_TOP_K, {"product_ids": None, "top_k": top_k or settings.recommendations_top_k})
+    await db.execute(SAVE_STATE, {"last_order_id": until})
+    await db.commit()
+    catalog_cache.invalidate()
+    return until
+
+
+async def update_recommendations(db: AsyncSession, top_k: Optional[int] = None) -> int:
+    """Soma os pedidos novos à matriz e devolve quantos produtos tiveram o top-K recalculado."""
+    after = await _lock_state(db)
+    until = await _settled_order(db)
+    if until <= after:
+        await db.commit()
+        return 0
+
+    result = await db.execute(ADD_PAIRS, {"after": after, "until": until})
+    product_ids = result.scalars().all()
+    if product_ids:
+        await db.execute(
+            REFRESH_TOP_K, {"product_ids": product_ids, "top_k": top_k or settings.recommendations_top_k}
+        )
+    await db.execute(SAVE_STATE, {"last_order_id": until})
+    await db.commit()
+    if product_ids:
+        catalog_cache.invalidate()
+    return len(product_ids)
+
+
+async def main(rebuild: bool):
+    from app.db.session import async_session, engine
+
+    async with async_session() as session:
+        if rebuild:
+            last_order_id = await rebuild_recommendations(session)
+            print(f"Recomendações recriadas até o pedido {last_order_id}")
+        else:
+            total = await update_recommendations(session)
+            print(f"{total} produtos com recomendações atualizadas")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] not in ([], ["--rebuild"]):
+        sys.exit("Uso: python -m app.services.recommendations [--rebuild]")
+    asyncio.run(main(rebuild=sys.argv[1:] == ["--rebuild"]))
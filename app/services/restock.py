@@ -0,0 +1,132 @@
+"""Sugestão de reposição de estoque a partir do histórico de pedidos.
+
+Uma única consulta traz, por produto, o estoque atual e a demanda diária da
+janela analisada; médias móveis, estoque de segurança, ponto de pedido e dias
+de cobertura são calculados de uma vez para o catálogo inteiro com numpy.
+"""
+import math
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.products import PRODUCT_STOCK_SQL
+from app.schemas.products import RestockItem, RestockReport
+
+# Fator z do nível de serviço de 95% (distribuição normal).
+SERVICE_LEVEL_Z = 1.65
+RECENT_DAYS = 7
+
+# Dia 0 é o mais antigo da janela; os dias são fatias de 24h contadas a partir
+# de agora, então o resultado não depende do fuso horário da sessão.
+DEMAND_BY_PRODUCT = text(
+    "WITH daily AS ("
+    " SELECT oi.product_id,"
+    " :window_days - 1 - floor(extract(epoch FROM now() - o.created_at) / 86400)::int AS day,"
+    " sum(oi.quantity) AS quantity"
+    " FROM order_items AS oi JOIN orders AS o ON o.id = oi.order_id"
+    " WHERE o.created_at > now() - make_interval(days => :window_days)"
+    " GROUP BY 1, 2"
+    "), demand AS ("
+    " SELECT product_id, array_agg(day) AS days, array_agg(quantity) AS quantities"
+    " FROM daily GROUP BY product_id"
+    ")"
+    f" SELECT p.id, p.description, p.section, coalesce({PRODUCT_STOCK_SQL}, 0) AS stock,"
+    " demand.days, demand.quantities"
+    " FROM products AS p LEFT JOIN demand ON demand.product_id = p.id"
+    " ORDER BY p.id"
+)
+
+
+async def get_last_order_id(db: AsyncSession) -> int:
+    """Versão do histórico: o relatório só muda quando chegam pedidos (ou muda o estoque)."""
+    result = await db.execute(text("SELECT coalesce(max(id), 0) FROM orders"))
+    return result.scalar_one()
+
+
+def forecast(stock: np.ndarray, demand: np.ndarray, lead_time_days: int, coverage_days: int) -> dict:
+    """Calcula as métricas de reposição; `demand` tem uma linha por produto e uma coluna por dia."""
+    average = demand.mean(axis=1)
+    recent = demand[:, -RECENT_DAYS:].mean(axis=1)
+    # A média recente pesa mais quando a demanda está acelerando.
+    daily = np.maximum(average, recent)
+    safety = np.ceil(SERVICE_LEVEL_Z * demand.std(axis=1) * math.sqrt(lead_time_days))
+    reorder_point = np.ceil(daily * lead_time_days + safety)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_of_cover = np.where(daily > 0, stock / daily, np.nan)
+    suggested = np.maximum(np.ceil(daily * (lead_time_days + coverage_days) + safety - stock), 0)
+    return {
+        "average": average,
+        "recent": recent,
+        "safety": safety,
+        "reorder_point": reorder_point,
+        "days_of_cover": days_of_cover,
+        "suggested": suggested,
+    }
+
+
+async def restock_report(
+    db: AsyncSession,
+    last_order_id: int,
+    window_days: int = 28,
+    lead_time_days: int = 7,
+    coverage_days: int = 14,
+    only_needed: bool = False,
+) -> RestockReport:
+    """Relatório do catálogo inteiro, do produto mais urgente para o menos urgente."""
+    result = await db.execute(DEMAND_BY_PRODUCT, {"window_days": window_days})
+    rows = result.all()
+
+    demand = np.zeros((len(rows), window_days), dtype=np.float64)
+    stock = np.fromiter((row.stock for row in rows), dtype=np.float64, count=len(rows))
+    positions = [(index, row) for index, row in enumerate(rows) if row.days]
+    if positions:
+        product_rows = np.concatenate([np.full(len(row.days), index) for index, row in positions])
+        days = np.concatenate([row.days for _, row in positions])
+        quantities = np.concatenate([row.quantities for _, row in positions])
+        valid = (days >= 0) & (days < window_days)
+        np.add.at(demand, (product_rows[valid], days[valid]), quantities[valid])
+
+    metrics = forecast(stock, demand, lead_time_days, coverage_days)
+    needed = stock <= metrics["reorder_point"]
+    # Sem demanda na janela o produto não precisa de reposição.
+    needed &= metrics["reorder_point"] > 0
+    cover = np.where(np.isnan(metrics["days_of_cover"]), np.inf, metrics["days_of_cover"])
+    order = np.lexsort((-metrics["suggested"], cover))
+    if only_needed:
+        order = order[needed[order]]
+
+    # Conversão em bloco (tolist) em vez de item a item com tipos numpy.
+    cover_days = np.round(metrics["days_of_cover"][order], 1).tolist()
+    columns = zip(
+        order.tolist(),
+        stock[order].astype(int).tolist(),
+        np.round(metrics["average"][order], 3).tolist(),
+        np.round(metrics["recent"][order], 3).tolist(),
+        metrics["safety"][order].astype(int).tolist(),
+        metrics["reorder_point"][order].astype(int).tolist(),
+        cover_days,
+        metrics["suggested"][order].astype(int).tolist(),
+    )
+    items = [
+        RestockItem(
+            product_id=rows[i].id,
+            description=rows[i].description,
+            section=rows[i].section,
+            stock=item_stock,
+            avg_daily_demand=average,
+            recent_daily_demand=recent,
+            safety_stock=safety,
+            reorder_point=reorder_point,
+            days_of_cover=None if math.isnan(cover) else cover,
+            suggested_order=suggested,
+        )
+        for i, item_stock, average, recent, safety, reorder_point, cover, suggested in columns
+    ]
+    return RestockReport(
+        window_days=window_days,
+        lead_time_days=lead_time_days,
+        coverage_days=coverage_days,
+        last_order_id=last_order_id,
+        items=items,
+    )
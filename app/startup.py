@@ -1,10 +1,17 @@
 from app.db.session import async_session
 from app.db.models.user import User
+from app.core.config import settings
 from app.core.security import get_password_hash
+from app.crud.products import load_catalog_indexes
+from app.services.expiry_sweep import expire_products
+from app.services.recommendations import update_recommendations
 from sqlalchemy.future import select
 import asyncio
 import os
 
+# Referências às tarefas de fundo, para não serem coletadas pelo GC.
+background_tasks = set()
+
 async def create_initial_admin():
     async with async_session() as session:
         result = await session.execute(select(User).filter_by(is_admin=True))
@@ -23,3 +30,47 @@ async def create_initial_admin():
             session.add(new_admin)
             await session.commit()
             print("Admin criado automaticamente.")
+
+
+async def warm_catalog_indexes():
+    async with async_session() as session:
+        total = await load_catalog_indexes(session)
+    print(f"Índices do catálogo carregados com {total} produtos.")
+
+
+async def refresh_catalog_indexes_periodically():
+    while True:
+        await asyncio.sleep(settings.barcode_index_refresh)
+        try:
+            async with async_session() as session:
+                await load_catalog_indexes(session)
+        except Exception as exc:
+            print("Erro ao recarregar os índices do catálogo:", exc)
+
+
+async def sweep_expired_products_periodically():
+    while True:
+        try:
+            async with async_session() as session:
+                total = await expire_products(session)
+            if total:
+                print(f"{total} produtos vencidos marcados como indisponíveis.")
+        except Exception as exc:
+            print("Erro na varredura de produtos vencidos:", exc)
+        await asyncio.sleep(settings.expiry_sweep_interval)
+
+
+async def update_recommendations_periodically():
+    while True:
+        try:
+            async with async_session() as session:
+                await update_recommendations(session)
+        except Exception as exc:
+            print("Erro ao atualizar as recomendações:", exc)
+        await asyncio.sleep(settings.recommendations_refresh)
+
+
+def start_background_task(coro):
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
@@ -0,0 +1,121 @@
+"""Custo de serialização das listagens (List[ProductOut] e List[OrderOut]).
+
+Compara, para a mesma página de objetos, os caminhos que uma resposta pode seguir:
+
+- stdlib: jsonable_encoder + json.dumps (JSONResponse sem response_model);
+- orjson: dump_python(mode="json") do pydantic + orjson (OrjsonResponse como
+  classe da rota, que é o que o FastAPI faz com uma classe customizada);
+- pydantic: TypeAdapter.dump_json, o caminho do FastAPI para rotas com
+  `response_model` e a classe de resposta padrão.
+
+Também mede a rota inteira (validação + serialização) num app mínimo, sem
+banco, com a classe padrão e com OrjsonResponse. Uso:
+
+    python -m benchmarks.serialization [--items 500] [--repeat 200]
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from typing import Callable, List
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.core.responses import OrjsonResponse, dumps
+from app.schemas.orders import OrderOut
+from app.schemas.products import ProductOut
+
+
+def make_products(count: int) -> list:
+    # Objetos com atributos, como as linhas do ORM que as rotas devolvem.
+    return [
+        SimpleNamespace(
+            id=index,
+            description=f"Camiseta Polo {index}",
+            price=59.9 + index % 100,
+            barcode=f"789{index:010d}",
+            section="Roupas Masculinas",
+            stock=index % 50,
+            expiration_date=date(2027, 1, 1) if index % 3 else None,
+            available=True,
+            image_url=None,
+        )
+        for index in range(count)
+    ]
+
+
+def make_orders(count: int, items_per_order: int = 5) -> list:
+    created_at = datetime(2025, 5, 26, 10, 0, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            id=index,
+            client_id=index % 100,
+            status="Pendente",
+            created_at=created_at,
+            items=[
+                SimpleNamespace(id=index * items_per_order + item, product_id=item, quantity=2, price=49.9)
+                for item in range(items_per_order)
+            ],
+        )
+        for index in range(count)
+    ]
+
+
+def timed(function: Callable[[], object], repeat: int) -> float:
+    """Mediana em milissegundos de `repeat` execuções."""
+    function()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def serializers(adapter: TypeAdapter, models: list) -> dict:
+    return {
+        "stdlib": lambda: json.dumps(jsonable_encoder(models), ensure_ascii=False).encode(),
+        "orjson": lambda: dumps(adapter.dump_python(models, mode="json")),
+        "pydantic": lambda: adapter.dump_json(models),
+    }
+
+
+def route_timings(model, objects: list, repeat: int) -> dict:
+    timings = {}
+    for name, options in (("padrão", {}), ("OrjsonResponse", {"response_class": OrjsonResponse})):
+        app = FastAPI()
+        app.get("/", response_model=List[model], **options)(lambda: objects)
+        client = TestClient(app)
+        timings[name] = timed(lambda: client.get("/"), repeat)
+    return timings
+
+
+def main(items: int, repeat: int) -> None:
+    for label, model, objects in (
+        (f"List[ProductOut] ({items} produtos)", ProductOut, make_products(items)),
+        (f"List[OrderOut] ({items // 5} pedidos x 5 itens)", OrderOut, make_orders(items // 5)),
+    ):
+        adapter = TypeAdapter(List[model])
+        models = adapter.validate_python(objects, from_attributes=True)
+        outputs = {name: function() for name, function in serializers(adapter, models).items()}
+        # Os três caminhos precisam produzir o mesmo documento.
+        assert len({json.dumps(json.loads(body), sort_keys=True) for body in outputs.values()}) == 1
+
+        print(label)
+        for name, function in serializers(adapter, models).items():
+            print(f"  serialização {name:<16} {timed(function, repeat):8.3f} ms")
+        for name, elapsed in route_timings(model, objects, repeat).items():
+            print(f"  rota, classe {name:<16} {elapsed:8.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    arguments = parser.parse_args()
+    main(arguments.items, arguments.repeat)
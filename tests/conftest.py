@@ -0,0 +1,146 @@
+import os
+import tempfile
+
+import pytest
+
+# Variáveis obrigatórias do Settings; os testes nunca usam o .env do desenvolvedor.
+TEST_ENV = {
+    "SECRET_KEY": "chave-de-teste",
+    "ADMIN_EMAIL": "admin@teste.com",
+    "ADMIN_PASSWORD": "admin123",
+    "WHATSAPP_INSTANCE_ID": "instancia-teste",
+    "WHATSAPP_TOKEN": "token-teste",
+}
+
+
+def pytest_configure(config):
+    """Sobe um PostgreSQL descartável (pgserver) por processo de teste.
+
+    Roda antes da coleta, então o app já importa o Settings apontando para o
+    banco temporário. Com pytest-xdist cada worker tem seu próprio servidor.
+    """
+    if getattr(config.option, "numprocesses", None) and not hasattr(config, "workerinput"):
+        return  # processo controlador do xdist: não executa testes
+
+    import pgserver
+    from sqlalchemy import make_url
+
+    pgdata = tempfile.mkdtemp(prefix="luestilo-pg-")
+    server = pgserver.get_server(pgdata, cleanup_mode="delete")
+    url = make_url(server.get_uri())
+
+    os.environ.update(TEST_ENV)
+    os.environ["DATABASE_URL"] = url.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+    os.environ["DATABASE_URL_SYNC"] = url.set(drivername="postgresql+psycopg2").render_as_string(hide_password=False)
+    config._pgserver = server
+
+
+def pytest_unconfigure(config):
+    server = getattr(config, "_pgserver", None)
+    if server is not None:
+        server.cleanup()
+
+
+@pytest.fixture(scope="session")
+async def engine():
+    from app.db.bootstrap import bootstrap_database
+    from app.db.session import engine
+
+    await bootstrap_database(engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db_session(engine):
+    """Sessão dentro de uma transação externa que é desfeita ao fim do teste.
+
+    Os commits do código testado viram SAVEPOINTs, então nada chega ao banco.
+    """
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Os caches em memória não participam do rollback; começam vazios a cada teste."""
+    from app.core.cache import barcode_index, catalog_cache
+    from app.core.catalog_snapshot import catalog_snapshot
+
+    catalog_cache.invalidate()
+    barcode_index.clear()
+    catalog_snapshot.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def whatsapp_messages(monkeypatch):
+    """Substitui o envio pelo UltraMsg e guarda as mensagens para asserções."""
+    from app.api.v1.routes import orders as orders_routes
+
+    sent = []
+    monkeypatch.setattr(
+        orders_routes,
+        "send_whatsapp_message",
+        lambda to_number, message: sent.append({"to": to_number, "message": message}),
+    )
+    return sent
+
+
+@pytest.fixture
+async def client(db_session):
+    """Cliente HTTP in-process com get_db apontando para a sessão do teste."""
+    from httpx import ASGITransport, AsyncClient
+
+    from app.db.session import get_db
+    from app.main import app
+
+    async def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+    app.dependency_overrides.clear()
+
+
+async def _create_user(db_session, username: str, is_admin: bool):
+    from app.core.security import get_password_hash
+    from app.db.models.user import User
+
+    user = User(
+        username=username,
+        email=f"{username}@teste.com",
+        hashed_password=get_password_hash("senha123"),
+        is_admin=is_admin,
+    )
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+def _auth_headers(user) -> dict:
+    from app.core.security import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token(user.email, user.is_admin)}"}
+
+
+@pytest.fixture
+async def admin_headers(db_session):
+    return _auth_headers(await _create_user(db_session, "admin_teste", is_admin=True))
+
+
+@pytest.fixture
+async def user_headers(db_session):
+    return _auth_headers(await _create_user(db_session, "usuario_teste", is_admin=False))
@@ -1,29 +1,173 @@
 import pytest
 from app.schemas.client import ClientCreate
 from app.crud import clients as crud_clients
-from app.db.session import async_session
 import uuid
 
 @pytest.mark.asyncio
-async def test_create_client():
-    async with async_session() as session:
-        # Arrange
-        client_data = {
-            "name": "Cliente Teste",
-            "email": f"cliente{uuid.uuid4().hex[:8]}@email.com",
-            "cpf": str(uuid.uuid4().int)[:11]
-        }
-        client_create = ClientCreate(**client_data)
-
-        # Act
-        client = await crud_clients.create_client(session, client_create)
-
-        # Assert
-        assert client.id is not None
-        assert client.name == client_data["name"]
-        assert client.email == client_data["email"]
-        assert client.cpf == client_data["cpf"]
-
-        # Clean up
-        await crud_clients.delete_client(session, client)
-        await session.commit()
\ No newline at end of file
+async def test_create_client(db_session):
+    # Arrange
+    client_data = {
+        "name": "Cliente Teste",
+        "email": f"cliente{uuid.uuid4().hex[:8]}@email.com",
+        "cpf": str(uuid.uuid4().int)[:11]
+    }
+    client_create = ClientCreate(**client_data)
+
+    # Act
+    client = await crud_clients.create_client(db_session, client_create)
+
+    # Assert
+    assert client.id is not None
+    assert client.name == client_data["name"]
+    assert client.email == client_data["email"]
+    assert client.cpf == client_data["cpf"]
+
+
+@pytest.mark.asyncio
+async def test_create_client_duplicated_email(client, admin_headers):
+    payload = {"name": "Maria Silva", "email": "maria@email.com", "cpf": "12345678900"}
+    response = await client.post("/api/v1/clients/", json=payload, headers=admin_headers)
+    assert response.status_code == 201
+
+    payload["cpf"] = "98765432100"
+    response = await client.post("/api/v1/clients/", json=payload, headers=admin_headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email já registrado"
+
+
+@pytest.mark.asyncio
+async def test_update_client_duplicated_cpf(client, admin_headers):
+    first = {"name": "Ana Lima", "email": "ana@email.com", "cpf": "11122233344"}
+    second = {"name": "Bruno Reis", "email": "bruno@email.com", "cpf": "55566677788"}
+    await client.post("/api/v1/clients/", json=first, headers=admin_headers)
+    response = await client.post("/api/v1/clients/", json=second, headers=admin_headers)
+    second_id = response.json()["id"]
+
+    response = await client.put(
+        f"/api/v1/clients/{second_id}", json={**second, "cpf": first["cpf"]}, headers=admin_headers
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "CPF já registrado"
+
+    # A sessão segue utilizável depois da violação e a atualização válida passa.
+    response = await client.put(
+        f"/api/v1/clients/{second_id}", json={**second, "name": "Bruno R."}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["name"] == "Bruno R."
+
+    response = await client.put("/api/v1/clients/999999", json=second, headers=admin_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_import_clients(client, admin_headers):
+    existing = {"name": "Já Cadastrada", "email": "existente@email.com", "cpf": "29141777638"}
+    response = await client.post("/api/v1/clients/", json=existing, headers=admin_headers)
+    assert response.status_code == 201
+
+    csv_content = (
+        "name;email;cpf;phone\n"
+        "Ana Lima;ana@email.com;317.066.907-97;+55 (11) 99999-8888\n"
+        "Bruno Reis;bruno@email.com;12345678900;\n"
+        "Carla Dias;nao-e-email;43915000868;\n"
+        "Davi Melo;davi@email.com;6360837722;5511999998888\n"
+        "Elisa Nunes;elisa@email.com;6360837722;\n"
+        "Fábio Rocha;ana@email.com;83533740641;\n"
+        "Gabi Souza;existente@email.com;81241586810;\n"
+    )
+    response = await client.post(
+        "/api/v1/clients/import",
+        files={"file": ("clientes.csv", csv_content.encode(), "text/csv")},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["total_rows"], report["inserted"], report["rejected"]) == (7, 2, 5)
+    errors = {error["line"]: error["errors"] for error in report["errors"]}
+    assert errors[3] == ["cpf: CPF inválido"]
+    assert errors[4][0].startswith("email:")
+    assert errors[5][0].startswith("phone:")
+    assert errors[7] == ["Email repetido no arquivo"]
+    assert errors[8] == ["Email já registrado"]
+
+    response = await client.get("/api/v1/clients/?limit=50", headers=admin_headers)
+    imported = {c["email"]: c for c in response.json()}
+    assert imported["ana@email.com"]["cpf"] == "31706690797"
+    assert imported["ana@email.com"]["phone"] == "+5511999998888"
+    # CPF com o zero à esquerda perdido na planilha.
+    assert imported["elisa@email.com"]["cpf"] == "06360837722"
+
+
+@pytest.mark.asyncio
+async def test_list_clients_cursor_and_total(client, admin_headers, monkeypatch):
+    from app.core.config import settings
+
+    names = ["Paula", "Otávio", "Paula", "Nina", "Rafael"]
+    cpfs = ["29141777638", "31706690797", "43915000868", "06360837722", "83533740641"]
+    for index, (name, cpf) in enumerate(zip(names, cpfs)):
+        payload = {"name": name, "email": f"pagina{index}@email.com", "cpf": cpf}
+        response = await client.post("/api/v1/clients/", json=payload, headers=admin_headers)
+        assert response.status_code == 201
+
+    seen, cursor = [], None
+    while True:
+        params = {"sort": "-name", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/v1/clients/", params=params, headers=admin_headers)
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == "5"
+        seen += [(c["name"], c["id"]) for c in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == sorted(seen, key=lambda item: (item[0], item[1]), reverse=True)
+    assert len(seen) == 5
+
+    # Com fields, o cursor da ordenação por nome funciona mesmo sem o nome na resposta.
+    params = {"sort": "-name", "limit": 2, "fields": "cpf"}
+    response = await client.get("/api/v1/clients/", params=params, headers=admin_headers)
+    assert [list(c) for c in response.json()] == [["cpf"], ["cpf"]]
+    response = await client.get(
+        "/api/v1/clients/", params={**params, "cursor": response.headers["X-Next-Cursor"]}, headers=admin_headers
+    )
+    assert len(response.json()) == 2
+
+    response = await client.get("/api/v1/clients/", params={"nome": "paula"}, headers=admin_headers)
+    assert response.headers["X-Total-Count"] == "2"
+
+    # Acima do limite o total vem da estimativa do planejador, nunca abaixo do limite.
+    monkeypatch.setattr(settings, "clients_count_exact_limit", 2)
+    response = await client.get("/api/v1/clients/", headers=admin_headers)
+    assert int(response.headers["X-Total-Count"]) >= 3
+
+
+@pytest.mark.asyncio
+async def test_search_clients_tolerates_typos(client, db_session, admin_headers):
+    from sqlalchemy import text
+
+    names = ["Fernando Souza", "Roberto Lima", "Fernanda Souza"]
+    cpfs = ["29141777638", "31706690797", "43915000868"]
+    for index, (name, cpf) in enumerate(zip(names, cpfs)):
+        payload = {"name": name, "email": f"cliente{index}@exemplo.com", "cpf": cpf}
+        response = await client.post("/api/v1/clients/", json=payload, headers=admin_headers)
+        assert response.status_code == 201
+
+    # A busca aproximada ordena por similaridade, que não serve de cursor.
+    cursor = (await client.get("/api/v1/clients/", params={"limit": 1}, headers=admin_headers)).headers["X-Next-Cursor"]
+    response = await client.get("/api/v1/clients/", params={"q": "Fernanda", "cursor": cursor}, headers=admin_headers)
+    assert response.status_code == 400
+
+    installed = await db_session.scalar(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+    if not installed:
+        pytest.skip("pg_trgm não está disponível neste PostgreSQL")
+
+    # "Sousa" com s não casa no ILIKE; a similaridade trigram encontra os dois
+    # e ordena pelo mais parecido.
+    response = await client.get("/api/v1/clients/", params={"q": "Fernanda Sousa"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert [c["name"] for c in response.json()] == ["Fernanda Souza", "Fernando Souza"]
+
+    response = await client.get("/api/v1/clients/", params={"q": "Fernanda Sousa", "limit": 1}, headers=admin_headers)
+    assert "X-Next-Cursor" not in response.headers
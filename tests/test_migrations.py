@@ -0,0 +1,60 @@
+import uuid
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, make_url, text
+
+from app.core.config import settings
+from app.db.bootstrap import ALEMBIC_INI
+
+BASELINE = "b18e40bd980a"
+
+
+def _alembic_config(connection) -> Config:
+    # Sem o arquivo .ini: o env.py não reconfigura o logging dos testes.
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    config.attributes["connection"] = connection
+    return config
+
+
+def _order_indexes(connection) -> set:
+    names = {index["name"] for index in inspect(connection).get_indexes("orders")}
+    # Encerra a transação aberta pela consulta: com ela pendente, o Alembic não
+    # controla a própria transação e o autocommit_block não pode ser usado.
+    connection.commit()
+    return names
+
+
+def test_upgrade_head_from_baseline():
+    url = make_url(settings.DATABASE_URL_SYNC)
+    database = f"migrations_{uuid.uuid4().hex[:8]}"
+    server = create_engine(url, isolation_level="AUTOCOMMIT")
+    with server.connect() as connection:
+        connection.execute(text(f"CREATE DATABASE {database}"))
+    engine = create_engine(url.set(database=database))
+    try:
+        with engine.connect() as connection:
+            config = _alembic_config(connection)
+            head = ScriptDirectory.from_config(config).get_current_head()
+
+            command.upgrade(config, BASELINE)
+            assert "ix_orders_status" not in _order_indexes(connection)
+
+            # As migrations seguintes criam índices com CONCURRENTLY, fora de
+            # transação (autocommit_block), e precisam chegar ao schema dos models.
+            command.upgrade(config, "head")
+            assert connection.scalar(text("SELECT version_num FROM alembic_version")) == head
+            assert {"ix_orders_client_id", "ix_orders_created_at", "ix_orders_status"} <= _order_indexes(connection)
+            command.check(config)
+
+            command.downgrade(config, BASELINE)
+            assert "ix_orders_status" not in _order_indexes(connection)
+            command.upgrade(config, "head")
+            assert "ix_orders_status" in _order_indexes(connection)
+    finally:
+        engine.dispose()
+        with server.connect() as connection:
+            connection.execute(text(f"DROP DATABASE IF EXISTS {database}"))
+        server.dispose()
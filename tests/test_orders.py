@@ -1,47 +1,269 @@
 import pytest
+from app.schemas.client import ClientCreate
 from app.schemas.orders import OrderCreate
+from app.crud import clients as crud_clients
 from app.crud import orders as crud_orders
 from app.crud import products as crud_products
-from app.db.session import async_session
 from app.schemas.products import ProductCreate
 import uuid
 
+
+async def _create_product(db_session, stock=50):
+    product_create = ProductCreate(
+        description="Produto para teste de pedido",
+        price=20.0,
+        barcode=str(uuid.uuid4()),
+        section="Pedidos",
+        stock=stock,
+    )
+    return await crud_products.create_product(db_session, product_create)
+
+
+async def _create_client(db_session, **extra):
+    client_create = ClientCreate(
+        name="Cliente Pedido",
+        email=f"cliente{uuid.uuid4().hex[:8]}@email.com",
+        cpf=str(uuid.uuid4().int)[:11],
+        **extra,
+    )
+    return await crud_clients.create_client(db_session, client_create)
+
+
 @pytest.mark.asyncio
-async def test_create_order():
-    async with async_session() as session:
-        # Arrange: cria um produto para usar no pedido
-        product_data = {
-            "name": "Produto Pedido",
-            "description": "Produto para teste de pedido",
-            "price": 20.0,
-            "barcode": str(uuid.uuid4()),
-            "section": "Pedidos",
-            "stock": 50,
-            "expiration_date": None,
-            "available": True,
-            "image_url": None,
-        }
-        product_create = ProductCreate(**product_data)
-        product = await crud_products.create_product(session, product_create)
-
-        order_data = {
-            "client_id": 1,  # ajuste conforme necessário
-            "status": "Pendente",  # ajuste conforme necessário
-            "items": [
-                {"product_id": product.id, "quantity": 2}
-            ]
+async def test_create_order(db_session):
+    # Arrange: cria um produto e um cliente para usar no pedido
+    product = await _create_product(db_session)
+    client = await _create_client(db_session)
+
+    order_data = {
+        "status": "Pendente",
+        "items": [
+            {"product_id": product.id, "quantity": 2}
+        ]
+    }
+    order_create = OrderCreate(**order_data)
+
+    # Act: cria o pedido
+    order = await crud_orders.create_order(db_session, order_create, client_id=client.id)
+
+    # Assert
+    assert order.id is not None
+    assert order.client_id == client.id
+    assert order.items[0].product_id == product.id
+    assert order.items[0].quantity == 2
+    assert product.stock == 48
+
+
+@pytest.mark.asyncio
+async def test_create_order_notifies_client_by_whatsapp(client, db_session, admin_headers, whatsapp_messages):
+    product = await _create_product(db_session)
+    customer = await _create_client(db_session, phone="+5511999998888")
+
+    response = await client.post(
+        "/api/v1/orders/",
+        json={"client_id": customer.id, "items": [{"product_id": product.id, "quantity": 1}]},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 201
+    assert whatsapp_messages == [
+        {
+            "to": "+5511999998888",
+            "message": f"Olá {customer.name}, seu pedido {response.json()['id']} foi recebido com sucesso!",
         }
-        order_create = OrderCreate(**order_data)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_order_insufficient_stock(client, db_session, admin_headers):
+    product = await _create_product(db_session, stock=1)
+    customer = await _create_client(db_session)
+
+    response = await client.post(
+        "/api/v1/orders/",
+        json={"client_id": customer.id, "items": [{"product_id": product.id, "quantity": 5}]},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_flash_sale_orders_reserve_from_stock_shards(client, db_session, admin_headers):
+    product = await _create_product(db_session, stock=10)
+    customer = await _create_client(db_session)
+
+    response = await client.put(
+        f"/api/v1/products/{product.id}/flash-sale", json={"shards": 4}, headers=admin_headers
+    )
+    assert response.json() == {"product_id": product.id, "stock": 10, "shards": [3, 3, 2, 2]}
+
+    async def order(quantity):
+        return await client.post(
+            "/api/v1/orders/",
+            json={"client_id": customer.id, "items": [{"product_id": product.id, "quantity": quantity}]},
+            headers=admin_headers,
+        )
+
+    assert (await order(3)).status_code == 201
+    assert (await client.get(f"/api/v1/products/{product.id}", headers=admin_headers)).json()["stock"] == 7
+    listing = await client.get("/api/v1/products/", params={"section": "Pedidos"}, headers=admin_headers)
+    assert {item["id"]: item["stock"] for item in listing.json()}[product.id] == 7
+    # Maior que qualquer parte sozinha, mas cabe na soma.
+    assert (await order(6)).status_code == 201
+    assert (await order(2)).status_code == 400
+    assert sum(await crud_products.get_stock_shards(db_session, product.id)) == 1
+
+    response = await client.delete(f"/api/v1/products/{product.id}/flash-sale", headers=admin_headers)
+    assert response.json() == {"product_id": product.id, "stock": 1, "shards": []}
+    assert (await order(1)).status_code == 201
+    assert (await client.get(f"/api/v1/products/{product.id}", headers=admin_headers)).json()["stock"] == 0
+
+
+@pytest.mark.asyncio
+async def test_recommendations_from_order_cooccurrence(client, db_session, user_headers, monkeypatch):
+    from app.core.config import settings
+    from app.services.recommendations import rebuild_recommendations, update_recommendations
+
+    monkeypatch.setattr(settings, "recommendations_settle_seconds", 0)
+    monkeypatch.setattr(settings, "recommendations_top_k", 2)
+    a, b, c, d = [await _create_product(db_session) for _ in range(4)]
+    customer = await _create_client(db_session)
+
+    async def order(*products):
+        items = [{"product_id": product.id, "quantity": 1} for product in products]
+        await crud_orders.create_order(db_session, OrderCreate(items=items), client_id=customer.id)
+
+    async def recommended(product):
+        response = await client.get(f"/api/v1/products/{product.id}/recommendations", headers=user_headers)
+        return [item["id"] for item in response.json()]
+
+    await order(a, b)
+    await order(a, b, c)
+    await order(a, d, a)
+    assert await recommended(a) == []
+
+    await rebuild_recommendations(db_session)
+    assert await recommended(a) == [b.id, c.id]
+    assert await recommended(d) == [a.id]
+
+    await order(a, d)
+    await order(a, d)
+    assert await update_recommendations(db_session) == 2
+    assert await recommended(a) == [d.id, b.id]
+    assert await update_recommendations(db_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_restock_report_forecasts_from_order_history(client, db_session, admin_headers):
+    hot = await _create_product(db_session, stock=20)
+    slow = await _create_product(db_session, stock=100)
+    idle = await _create_product(db_session, stock=0)
+    customer = await _create_client(db_session)
+    for quantity in (6, 8):
+        await crud_orders.create_order(
+            db_session,
+            OrderCreate(items=[{"product_id": hot.id, "quantity": quantity}, {"product_id": slow.id, "quantity": 1}]),
+            client_id=customer.id,
+        )
+
+    response = await client.get("/api/v1/products/restock-report", headers=admin_headers)
+    assert response.status_code == 200
+    report = response.json()
+    items = {item["product_id"]: item for item in report["items"]}
+    assert [item["product_id"] for item in report["items"]][:1] == [hot.id]
+    assert items[hot.id] == {
+        "product_id": hot.id,
+        "description": hot.description,
+        "section": hot.section,
+        "stock": 6,
+        "avg_daily_demand": 0.5,
+        "recent_daily_demand": 2.0,
+        "safety_stock": 12,
+        "reorder_point": 26,
+        "days_of_cover": 3.0,
+        "suggested_order": 48,
+    }
+    assert items[idle.id]["days_of_cover"] is None
+    assert items[idle.id]["suggested_order"] == 0
+
+    needed = await client.get(
+        "/api/v1/products/restock-report", params={"only_needed": True}, headers=admin_headers
+    )
+    assert [item["product_id"] for item in needed.json()["items"]] == [hot.id]
+
+    cached = await client.get(
+        "/api/v1/products/restock-report", headers={**admin_headers, "If-None-Match": response.headers["ETag"]}
+    )
+    assert cached.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_client_summary(client, db_session, admin_headers):
+    product = await _create_product(db_session)
+    customer = await _create_client(db_session)
+    orders = []
+    for quantity in (1, 2, 3):
+        order_create = OrderCreate(items=[{"product_id": product.id, "quantity": quantity}])
+        orders.append(await crud_orders.create_order(db_session, order_create, client_id=customer.id))
+
+    response = await client.get(
+        f"/api/v1/clients/{customer.id}/summary", params={"recent": 2}, headers=admin_headers
+    )
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["client"]["email"] == customer.email
+    assert summary["order_count"] == 3
+    assert summary["total_spent"] == pytest.approx(6 * 20.0)
+    assert summary["last_order_at"] is not None
+    assert [order["id"] for order in summary["recent_orders"]] == [orders[2].id, orders[1].id]
+    assert summary["recent_orders"][0]["items"][0]["quantity"] == 3
+
+    empty = await _create_client(db_session)
+    response = await client.get(f"/api/v1/clients/{empty.id}/summary", headers=admin_headers)
+    assert response.json()["order_count"] == 0
+    assert response.json()["recent_orders"] == []
+
+    response = await client.get("/api/v1/clients/999999/summary", headers=admin_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_orders_with_items(client, db_session, admin_headers):
+    first, second = await _create_product(db_session), await _create_product(db_session)
+    customer = await _create_client(db_session)
+    order = await crud_orders.create_order(
+        db_session,
+        OrderCreate(items=[{"product_id": first.id, "quantity": 1}, {"product_id": second.id, "quantity": 4}]),
+        client_id=customer.id,
+    )
+
+    response = await client.get("/api/v1/orders/", params={"order_id": order.id}, headers=admin_headers)
+
+    assert response.status_code == 200
+    [listed] = response.json()
+    assert listed["id"] == order.id
+    assert listed["client_id"] == customer.id
+    assert listed["status"] == "Pendente"
+    assert listed["created_at"]
+    assert [(item["product_id"], item["quantity"], item["price"]) for item in listed["items"]] == [
+        (first.id, 1, 20.0),
+        (second.id, 4, 20.0),
+    ]
 
-        # Act: cria o pedido
-        order = await crud_orders.create_order(session, order_create, user_id=1)
+    response = await client.get(
+        "/api/v1/orders/", params={"order_id": order.id, "fields": "id,status"}, headers=admin_headers
+    )
+    assert response.json() == [{"id": order.id, "status": "Pendente"}]
 
-        # Assert
-        assert order.id is not None
-        assert order.items[0].product_id == product.id
-        assert order.items[0].quantity == 2
+    response = await client.get(
+        "/api/v1/orders/", params={"order_id": order.id, "fields": "items"}, headers=admin_headers
+    )
+    assert [item["quantity"] for item in response.json()[0]["items"]] == [1, 4]
 
-        # Clean up
-        await crud_orders.delete_order(session, order.id)
-        await crud_products.delete_product(session, product)
-        await session.commit()
\ No newline at end of file
+    # Sem filtros (caminho do admin), só com os itens: uma linha por pedido.
+    response = await client.get("/api/v1/orders/", params={"fields": "items"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert [list(listed) for listed in response.json()] == [["items"]]
+    assert len(response.json()[0]["items"]) == 2
@@ -1,39 +1,743 @@
 import pytest
-from app.schemas.products import ProductCreate
+from sqlalchemy import update
+from app.db.models import ProductStockShard
+from app.schemas.products import ProductCreate, ProductUpdate
+from app.core.cache import barcode_index, catalog_cache
+from app.core.compression import choose_encoding
 from app.crud import products as crud_products
-from app.db.session import async_session
+import base64
+import io
+import json
 import uuid
 
 @pytest.mark.asyncio
-async def test_create_product():
-    async with async_session() as session:
-        # Limpeza antes do teste
-        await session.execute("DELETE FROM products")
-        await session.commit()
-
-        # Arrange
-        product_data = {
-            "description": "Descrição do produto teste",
-            "price": 10.5,
-            "barcode": str(uuid.uuid4()),
-            "section": "Testes",
-            "stock": 100,
-            "expiration_date": None,
-            "available": True,
-            "image_url": None,
-        }
-        product_create = ProductCreate(**product_data)
+async def test_create_product(db_session):
+    # Arrange
+    product_data = {
+        "description": "Descrição do produto teste",
+        "price": 10.5,
+        "barcode": str(uuid.uuid4()),
+        "section": "Testes",
+        "stock": 100,
+        "expiration_date": None,
+        "available": True,
+        "image_url": None,
+    }
+    product_create = ProductCreate(**product_data)
+
+    # Act
+    product = await crud_products.create_product(db_session, product_create)
+
+    # Assert
+    assert product.id is not None
+    assert product.description == product_data["description"]
+    assert product.price == product_data["price"]
+    assert product.section == product_data["section"]
+    assert product.stock == product_data["stock"]
+
+
+@pytest.mark.asyncio
+async def test_list_products_requires_authentication(client):
+    response = await client.get("/api/v1/products/")
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_catalog_is_cached_with_etag(client, db_session, user_headers):
+    product = await crud_products.create_product(
+        db_session,
+        ProductCreate(description="Camiseta", price=49.9, barcode=str(uuid.uuid4()), section="Roupas", stock=10),
+    )
+
+    first = await client.get("/api/v1/products/", headers=user_headers)
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.json()[0]["id"] == product.id
+    assert "max-age" in first.headers["cache-control"]
+
+    not_modified = await client.get("/api/v1/products/", headers={**user_headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    await crud_products.update_product(db_session, product, ProductUpdate(**{**first.json()[0], "price": 39.9}))
+
+    changed = await client.get("/api/v1/products/", headers={**user_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()[0]["price"] == 39.9
+
+
+@pytest.mark.asyncio
+async def test_large_responses_are_compressed(client, db_session, user_headers, admin_headers):
+    import brotli
+    import gzip
+
+    for index in range(30):
+        await crud_products.create_product(
+            db_session,
+            ProductCreate(description=f"Bermuda {index}", price=79.9, barcode=str(uuid.uuid4()), section="Compressão"),
+        )
+    params = {"section": "Compressão"}
+
+    identity = await client.get("/api/v1/products/", params=params, headers={**user_headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert len(identity.content) > 1024
+
+    # Resposta em cache: a versão brotli é gerada uma vez e guardada na entrada.
+    headers = {**user_headers, "Accept-Encoding": "gzip;q=0.5, br"}
+    async with client.stream("GET", "/api/v1/products/", params=params, headers=headers) as response:
+        raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    assert response.headers["content-encoding"] == "br"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"] == f"{identity.headers['etag'][:-1]}-br\""
+    assert brotli.decompress(raw) == identity.content
+    [entry] = [entry for entry in catalog_cache._entries.values() if entry.body == identity.content]
+    assert entry.encoded["br"] == raw
+
+    not_modified = await client.get(
+        "/api/v1/products/", params=params, headers={**headers, "If-None-Match": response.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
+    # O ETag da versão sem compressão não vale para a versão brotli.
+    other_representation = await client.get(
+        "/api/v1/products/", params=params, headers={**headers, "If-None-Match": identity.headers["etag"]}
+    )
+    assert other_representation.status_code == 200
+
+    # Vence o maior q; a preferência do servidor (br) só desempata.
+    assert choose_encoding("br;q=0.1, gzip") == "gzip"
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("*;q=0.5, br;q=0") == "gzip"
+    assert choose_encoding("br;q=0, gzip;q=0") is None
+
+    # Resposta dinâmica: comprimida pelo middleware.
+    headers = {**admin_headers, "Accept-Encoding": "gzip"}
+    async with client.stream("GET", "/api/v1/clients/", params={"limit": 1}, headers=headers) as small:
+        assert "content-encoding" not in small.headers
+    params = {"q": "bermuda", "limit": 30}
+    async with client.stream(
+        "GET", "/api/v1/products/search", params=params, headers={**user_headers, "Accept-Encoding": "gzip"}
+    ) as search:
+        raw = b"".join([chunk async for chunk in search.aiter_raw()])
+    assert search.headers["content-encoding"] == "gzip"
+    assert len(json.loads(gzip.decompress(raw))["items"]) == 30
+    async with client.stream("GET", "/openapi.json", headers=headers) as openapi:
+        raw = b"".join([chunk async for chunk in openapi.aiter_raw()])
+    assert openapi.headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(raw))["info"]["title"] == "Lu Estilo API"
+
+
+@pytest.mark.asyncio
+async def test_list_products_cursor_pagination_with_filters(client, db_session, user_headers):
+    for index, price in enumerate([30.0, 10.0, 20.0, 20.0, 50.0]):
+        await crud_products.create_product(
+            db_session,
+            ProductCreate(
+                description=f"Vestido {index}",
+                price=price,
+                barcode=str(uuid.uuid4()),
+                section="Roupas Femininas",
+                stock=index,
+            ),
+        )
+    await crud_products.create_product(
+        db_session,
+        ProductCreate(description="Camisa", price=15.0, barcode=str(uuid.uuid4()), section="Roupas Masculinas"),
+    )
+
+    params = {"section": "Roupas Femininas", "in_stock": "true", "sort": "-price", "limit": 2}
+    first = await client.get("/api/v1/products/", params=params, headers=user_headers)
+    second = await client.get(
+        "/api/v1/products/",
+        params={**params, "cursor": first.headers["x-next-cursor"]},
+        headers=user_headers,
+    )
+
+    # O vestido de 30.0 tem estoque zero e fica de fora.
+    assert [p["price"] for p in first.json()] == [50.0, 20.0]
+    assert [p["price"] for p in second.json()] == [20.0, 10.0]
+    assert "x-next-cursor" in second.headers
+
+    last = await client.get(
+        "/api/v1/products/",
+        params={**params, "cursor": second.headers["x-next-cursor"]},
+        headers=user_headers,
+    )
+    assert last.json() == []
+    assert "x-next-cursor" not in last.headers
+
+
+@pytest.mark.asyncio
+async def test_list_products_with_sparse_fields(client, db_session, user_headers):
+    for price in (35.0, 15.0, 25.0):
+        await crud_products.create_product(
+            db_session,
+            ProductCreate(description="Meia", price=price, barcode=str(uuid.uuid4()), section="Meias", stock=3),
+        )
+
+    params = {"section": "Meias", "sort": "price", "limit": 2, "fields": "price, id"}
+    first = await client.get("/api/v1/products/", params=params, headers=user_headers)
+    assert first.status_code == 200
+    # Só as chaves pedidas, na ordem do ProductOut, e o cursor continua valendo.
+    assert [list(p) for p in first.json()] == [["price", "id"], ["price", "id"]]
+    assert [p["price"] for p in first.json()] == [15.0, 25.0]
+
+    second = await client.get(
+        "/api/v1/products/",
+        params={**params, "fields": "stock", "cursor": first.headers["x-next-cursor"]},
+        headers=user_headers,
+    )
+    assert second.json() == [{"stock": 3}]
+
+    full = await client.get("/api/v1/products/", params={"section": "Meias"}, headers=user_headers)
+    assert "description" in full.json()[0]
+
+    for fields in ("id,senha", ",", ""):
+        response = await client.get("/api/v1/products/", params={"fields": fields}, headers=user_headers)
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_products_rejects_cursor_from_other_sort(client, db_session, user_headers):
+    for price in (10.0, 20.0):
+        await crud_products.create_product(
+            db_session,
+            ProductCreate(description="Saia", price=price, barcode=str(uuid.uuid4()), section="Roupas"),
+        )
+    first = await client.get("/api/v1/products/", params={"limit": 1}, headers=user_headers)
+
+    response = await client.get(
+        "/api/v1/products/",
+        params={"limit": 1, "sort": "price", "cursor": first.headers["x-next-cursor"]},
+        headers=user_headers,
+    )
+
+    assert response.status_code == 400
+
+    # Cursor editado à mão com um valor que não é do tipo da ordenação.
+    for value in ([1, 2], {"a": 1}, True, "caro"):
+        raw = json.dumps(["price", value, 1]).encode()
+        cursor = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+        response = await client.get(
+            "/api/v1/products/", params={"sort": "price", "cursor": cursor}, headers=user_headers
+        )
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_products_sorted_by_long_descriptions(client, db_session, user_headers):
+    # Descrições maiores que o prefixo indexado e iguais nele: desempate pelo id.
+    prefix = "Vestido longo " * 20
+    created = []
+    for suffix in ("c", "a", "b"):
+        product = await crud_products.create_product(
+            db_session,
+            ProductCreate(description=prefix + suffix * 3000, price=99.9, barcode=str(uuid.uuid4()), section="Longos"),
+        )
+        created.append(product.id)
+
+    seen, cursor = [], None
+    while True:
+        params = {"section": "Longos", "sort": "description", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/v1/products/", params=params, headers=user_headers)
+        assert response.status_code == 200
+        seen += [product["id"] for product in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert seen == sorted(created)
+
+
+@pytest.mark.asyncio
+async def test_import_products_upserts_by_barcode(client, db_session, admin_headers):
+    existing = await crud_products.create_product(
+        db_session,
+        ProductCreate(description="Blusa", price=59.9, barcode="7890000000001", section="Roupas", stock=7),
+    )
+    csv_content = (
+        "description;price;barcode;section\n"
+        "Blusa manga longa;69,90;7890000000001;Roupas\n"
+        "Blusa manga longa;64.90;7890000000001;Roupas\n"
+        "Calça;129.90;7890000000002;Roupas\n"
+        "Sem preço;;7890000000003;Roupas\n"
+    )
+
+    response = await client.post(
+        "/api/v1/products/import",
+        files={"file": ("catalogo.csv", csv_content.encode(), "text/csv")},
+        headers=admin_headers,
+    )
+
+    report = response.json()
+    assert response.status_code == 200
+    assert report["total_rows"] == 4
+    assert (report["inserted"], report["updated"], report["rejected"]) == (1, 1, 2)
+    assert [error["line"] for error in report["errors"]] == [2, 5]
+
+    await db_session.refresh(existing)
+    assert existing.description == "Blusa manga longa"
+    assert existing.price == 64.9
+    assert existing.stock == 7  # coluna ausente do arquivo não é alterada
+
+
+@pytest.mark.asyncio
+async def test_import_products_updates_only_columns_present_in_each_row(client, db_session, admin_headers):
+    blusa = await crud_products.create_product(
+        db_session,
+        ProductCreate(
+            description="Blusa", price=59.9, barcode="7890000000021", section="Roupas",
+            stock=7, available=False, image_url="https://cdn.exemplo.com/blusa.jpg",
+        ),
+    )
+    iogurte = await crud_products.create_product(
+        db_session,
+        ProductCreate(
+            description="Iogurte", price=4.5, barcode="7890000000022", section="Mercado",
+            stock=3, expiration_date="2027-01-01",
+        ),
+    )
+    required = {"price": 9.9, "section": "Mercado"}
+    lines = [
+        {**required, "description": "Blusa", "barcode": "7890000000021", "section": "Roupas", "available": True},
+        {**required, "description": "Iogurte", "barcode": "7890000000022", "stock": 9},
+        {**required, "description": "Queijo", "barcode": "7890000000023"},
+    ]
+    content = "\n".join(json.dumps(line) for line in lines).encode()
+    response = await client.post(
+        "/api/v1/products/import",
+        files={"file": ("catalogo.jsonl", content, "application/x-ndjson")},
+        headers=admin_headers,
+    )
+    assert (response.json()["inserted"], response.json()["updated"]) == (1, 2)
+
+    await db_session.refresh(blusa)
+    await db_session.refresh(iogurte)
+    # Outras linhas do arquivo trazem `stock`, mas a da blusa não.
+    assert (blusa.stock, blusa.available, blusa.image_url) == (7, True, "https://cdn.exemplo.com/blusa.jpg")
+    assert (iogurte.stock, str(iogurte.expiration_date)) == (9, "2027-01-01")
+    queijo = await crud_products.get_product_by_barcode(db_session, "7890000000023")
+    assert (queijo.stock, queijo.available) == (0, True)
+
+    # Célula vazia no CSV também não altera o valor cadastrado.
+    csv_content = (
+        "description;price;barcode;section;stock\n"
+        "Blusa;59.9;7890000000021;Roupas;\n"
+        "Iogurte;4.5;7890000000022;Mercado;4\n"
+    )
+    response = await client.post(
+        "/api/v1/products/import",
+        files={"file": ("catalogo.csv", csv_content.encode(), "text/csv")},
+        headers=admin_headers,
+    )
+    assert response.json()["updated"] == 2
+    await db_session.refresh(blusa)
+    await db_session.refresh(iogurte)
+    assert (blusa.stock, iogurte.stock) == (7, 4)
+
+
+@pytest.mark.asyncio
+async def test_import_stock_of_flash_sale_product_goes_to_shards(client, db_session, user_headers, admin_headers):
+    product = await crud_products.create_product(
+        db_session,
+        ProductCreate(description="Tênis", price=199.9, barcode="7890000000009", section="Relâmpago", stock=4),
+    )
+    await client.put(f"/api/v1/products/{product.id}/flash-sale", json={"shards": 2}, headers=admin_headers)
+
+    async def import_stock(stock):
+        csv_content = f"description;price;barcode;section;stock\nTênis;199.9;7890000000009;Relâmpago;{stock}\n"
+        response = await client.post(
+            "/api/v1/products/import",
+            files={"file": ("catalogo.csv", csv_content.encode(), "text/csv")},
+            headers=admin_headers,
+        )
+        assert response.json()["updated"] == 1
+
+    async def listed(in_stock):
+        params = {"section": "Relâmpago", "in_stock": in_stock}
+        response = await client.get("/api/v1/products/", params=params, headers=user_headers)
+        return [(item["id"], item["stock"]) for item in response.json()]
+
+    await import_stock(5)
+    assert await crud_products.get_stock_shards(db_session, product.id) == [3, 2]
+    assert await listed("true") == [(product.id, 5)]
+
+    # Partes esgotadas com `products.stock` ainda em 5: o filtro usa a mesma
+    # soma que a listagem mostra.
+    await db_session.execute(
+        update(ProductStockShard).where(ProductStockShard.product_id == product.id).values(quantity=0)
+    )
+    await db_session.commit()
+    catalog_cache.invalidate()
+    assert await listed("true") == []
+    assert await listed("false") == [(product.id, 0)]
+
+    await import_stock(0)
+    assert await crud_products.get_stock_shards(db_session, product.id) == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_import_products_from_json_lines(client, admin_headers):
+    lines = [
+        {"description": "Boné", "price": 39.9, "barcode": "7890000000010", "section": "Acessórios", "stock": 3},
+        {"description": "Cinto", "price": 49.9, "barcode": "7890000000011", "section": "Acessórios"},
+    ]
+    content = "\n".join(json.dumps(line) for line in lines).encode()
 
-        # Act
-        product = await crud_products.create_product(session, product_create)
+    response = await client.post(
+        "/api/v1/products/import",
+        files={"file": ("catalogo.jsonl", content, "application/x-ndjson")},
+        headers=admin_headers,
+    )
+
+    assert response.json()["inserted"] == 2
+    products = await client.get("/api/v1/products/", params={"section": "Acessórios"}, headers=admin_headers)
+    assert [p["stock"] for p in products.json()] == [3, 0]
+
+
+@pytest.mark.asyncio
+async def test_read_product_by_barcode_follows_writes(client, db_session, user_headers):
+    product = await crud_products.create_product(
+        db_session,
+        ProductCreate(description="Tênis", price=199.9, barcode="7891111111111", section="Calçados", stock=4),
+    )
+
+    response = await client.get("/api/v1/products/by-barcode/7891111111111", headers=user_headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == product.id
+
+    await crud_products.update_product(
+        db_session, product, ProductUpdate(**{**response.json(), "barcode": "7892222222222", "price": 179.9})
+    )
+    old = await client.get("/api/v1/products/by-barcode/7891111111111", headers=user_headers)
+    new = await client.get("/api/v1/products/by-barcode/7892222222222", headers=user_headers)
+    assert old.status_code == 404
+    assert new.json()["price"] == 179.9
+
+    await crud_products.delete_product(db_session, product)
+    deleted = await client.get("/api/v1/products/by-barcode/7892222222222", headers=user_headers)
+    assert deleted.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_read_product_by_barcode_falls_back_to_database(client, db_session, user_headers):
+    await crud_products.create_product(
+        db_session,
+        ProductCreate(description="Meia", price=9.9, barcode="7893333333333", section="Acessórios"),
+    )
+    barcode_index.clear()
+
+    response = await client.get("/api/v1/products/by-barcode/7893333333333", headers=user_headers)
+
+    assert response.status_code == 200
+    assert response.json()["description"] == "Meia"
+    assert barcode_index.get("7893333333333") is not None
+
+
+@pytest.mark.asyncio
+async def test_barcode_fallback_does_not_refill_after_concurrent_discard(client, db_session, user_headers, monkeypatch):
+    await crud_products.create_product(
+        db_session,
+        ProductCreate(description="Boné", price=39.9, barcode="7894444444444", section="Acessórios"),
+    )
+    barcode_index.clear()
+    read_from_database = crud_products.get_product_by_barcode
+
+    async def read_then_concurrent_delete(db, barcode):
+        product = await read_from_database(db, barcode)
+        # Exclusão em outra requisição entre a leitura e o preenchimento.
+        barcode_index.discard(barcode)
+        return product
+
+    monkeypatch.setattr(crud_products, "get_product_by_barcode", read_then_concurrent_delete)
+    response = await client.get("/api/v1/products/by-barcode/7894444444444", headers=user_headers)
+
+    assert response.status_code == 200
+    assert barcode_index.get("7894444444444") is None
+
+
+@pytest.mark.asyncio
+async def test_upload_product_image_generates_thumbnails(client, db_session, admin_headers, tmp_path, monkeypatch):
+    from PIL import Image
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "media_root", str(tmp_path))
+    product = await crud_products.create_product(
+        db_session,
+        ProductCreate(description="Bolsa", price=89.9, barcode="7894444444444", section="Acessórios"),
+    )
+    image = io.BytesIO()
+    Image.new("RGB", (800, 600), "red").save(image, format="PNG")
+
+    response = await client.put(
+        f"/api/v1/products/{product.id}/image",
+        content=image.getvalue(),
+        headers={**admin_headers, "Content-Type": "image/png"},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["image_url"].endswith(".png")
+    assert set(body["thumbnails"]) == {"160", "480"}
+    assert (await crud_products.get_product(db_session, product.id)).image_url == body["image_url"]
+
+    thumbnail = await client.get(body["thumbnails"]["480"])
+    assert thumbnail.status_code == 200
+    assert thumbnail.headers["content-type"] == "image/webp"
+    assert "immutable" in thumbnail.headers["cache-control"]
+    assert Image.open(io.BytesIO(thumbnail.content)).size == (480, 360)
+
+    original = await client.get(body["image_url"])
+    assert original.headers["content-type"] == "image/png"
+
+    # PNG declarado como JPEG: o formato detectado pelo Pillow não confere.
+    response = await client.put(
+        f"/api/v1/products/{product.id}/image",
+        content=image.getvalue(),
+        headers={**admin_headers, "Content-Type": "image/jpeg"},
+    )
+    assert response.status_code == 400
+    assert not list(tmp_path.glob("products/*.jpg"))
+
+
+@pytest.mark.asyncio
+async def test_upload_product_image_rejects_unsupported_type(client, db_session, admin_headers, tmp_path, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "media_root", str(tmp_path))
+    product = await crud_products.create_product(
+        db_session,
+        ProductCreate(description="Cinto", price=49.9, barcode="7895555555555", section="Acessórios"),
+    )
+
+    response = await client.put(
+        f"/api/v1/products/{product.id}/image",
+        content=b"GIF89a",
+        headers={**admin_headers, "Content-Type": "image/gif"},
+    )
+    assert response.status_code == 415
+    assert (await client.get("/api/v1/media/products/../../etc/passwd")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_expire_products_in_batches(db_session):
+    from datetime import date
+    from sqlalchemy import select
+    from app.db.models.products import ProductExpiration
+    from app.services.expiry_sweep import expire_products
+
+    products = {}
+    for barcode, expiration_date, available in [
+        ("7896000000001", date(2026, 1, 10), True),
+        ("7896000000002", date(2026, 1, 20), True),
+        ("7896000000003", date(2026, 1, 5), False),
+        ("7896000000004", date(2026, 2, 1), True),
+        ("7896000000005", None, True),
+    ]:
+        products[barcode] = await crud_products.create_product(
+            db_session,
+            ProductCreate(
+                description="Iogurte", price=4.5, barcode=barcode, section="Alimentos",
+                expiration_date=expiration_date, available=available,
+            ),
+        )
+
+    assert await expire_products(db_session, today=date(2026, 2, 1), batch_size=1) == 2
+    assert await expire_products(db_session, today=date(2026, 2, 1), batch_size=1) == 0
+
+    for product in products.values():
+        await db_session.refresh(product)
+    assert [products[b].available for b in sorted(products)] == [False, False, False, True, True]
+
+    logged = await db_session.execute(select(ProductExpiration.product_id).order_by(ProductExpiration.id))
+    assert logged.scalars().all() == [products["7896000000001"].id, products["7896000000002"].id]
+
+
+@pytest.mark.asyncio
+async def test_search_products_ranks_prefixes_and_facets(client, db_session, user_headers):
+    for barcode, description, section in [
+        ("7897000000001", "Camiseta Polo algodão", "Roupas Masculinas"),
+        ("7897000000002", "Camiseta básica", "Roupas Femininas"),
+        ("7897000000003", "Polo listrada", "Roupas Masculinas"),
+        ("7897000000004", "Tênis de corrida", "Calçados"),
+    ]:
+        await crud_products.create_product(
+            db_session, ProductCreate(description=description, price=50, barcode=barcode, section=section)
+        )
+
+    response = await client.get("/api/v1/products/search", params={"q": "camiseta po"}, headers=user_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 1
+    assert [item["barcode"] for item in body["items"]] == ["7897000000001"]
+
+    response = await client.get("/api/v1/products/search", params={"q": "camisetas"}, headers=user_headers)
+    body = response.json()
+    assert body["total"] == 2
+    assert body["facets"] == [
+        {"section": "Roupas Femininas", "count": 1},
+        {"section": "Roupas Masculinas", "count": 1},
+    ]
+
+    response = await client.get(
+        "/api/v1/products/search",
+        params={"q": "roupas", "section": "Roupas Masculinas", "limit": 1, "offset": 5},
+        headers=user_headers,
+    )
+    body = response.json()
+    assert body["items"] == []
+    assert body["total"] == 2
+    assert {facet["section"]: facet["count"] for facet in body["facets"]} == {
+        "Roupas Masculinas": 2,
+        "Roupas Femininas": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_products_by_filter_and_by_values(client, db_session, admin_headers):
+    products = [
+        await crud_products.create_product(
+            db_session,
+            ProductCreate(description=f"Vestido {i}", price=100 + i, barcode=f"789800000000{i}", section=section, stock=5),
+        )
+        for i, section in enumerate(["Roupas Femininas", "Roupas Femininas", "Calçados"])
+    ]
+    ids = [product.id for product in products]
+
+    preview = await client.post(
+        "/api/v1/products/bulk-update",
+        json={"filters": {"section": "Roupas Femininas"}, "change": {"price_percent": -10}, "dry_run": True},
+        headers=admin_headers,
+    )
+    assert preview.json() == {"dry_run": True, "matched": 2, "ids": ids[:2]}
+    assert (await client.get(f"/api/v1/products/{ids[0]}", headers=admin_headers)).json()["price"] == 100
+
+    response = await client.post(
+        "/api/v1/products/bulk-update",
+        json={"filters": {"section": "Roupas Femininas"}, "change": {"price_percent": -10, "stock_delta": -7}},
+        headers=admin_headers,
+    )
+    assert response.json() == {"dry_run": False, "matched": 2, "ids": ids[:2]}
+    first = (await client.get(f"/api/v1/products/{ids[1]}", headers=admin_headers)).json()
+    assert (first["price"], first["stock"]) == (90.9, 0)
+
+    response = await client.post(
+        "/api/v1/products/bulk-update",
+        json={"values": [{"id": ids[2], "stock": 42}, {"id": ids[0], "available": False}, {"id": 999999, "stock": 1}]},
+        headers=admin_headers,
+    )
+    assert response.json()["ids"] == [ids[0], ids[2]]
+    calcados = (await client.get(f"/api/v1/products/{ids[2]}", headers=admin_headers)).json()
+    vestido = (await client.get(f"/api/v1/products/{ids[0]}", headers=admin_headers)).json()
+    assert (calcados["stock"], calcados["price"]) == (42, 102)
+    assert (vestido["available"], vestido["price"]) == (False, 90)
+
+    invalid = await client.post(
+        "/api/v1/products/bulk-update", json={"change": {"price": 10, "price_percent": 5}}, headers=admin_headers
+    )
+    assert invalid.status_code == 422
+
+    repeated = await client.post(
+        "/api/v1/products/bulk-update",
+        json={"values": [{"id": ids[0], "stock": 1}, {"id": ids[0], "stock": 2}]},
+        headers=admin_headers,
+    )
+    assert repeated.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_catalog_snapshot_matches_database_listing(client, db_session, user_headers, monkeypatch):
+    from app.core.catalog_snapshot import catalog_snapshot
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "catalog_snapshot", True)
+    for i in range(14):
+        await crud_products.create_product(
+            db_session,
+            ProductCreate(
+                description=f"Peça {i}",
+                price=[19.9, 49.9, 49.9, 89.0][i % 4],
+                barcode=f"78990000000{i:02d}",
+                section=["Roupas", "Calçados", "Acessórios"][i % 3],
+                stock=i % 5,
+                available=i % 6 != 0,
+            ),
+        )
+    await crud_products.load_catalog_indexes(db_session)
+
+    async def pages(params):
+        bodies, cursor = [], None
+        while True:
+            response = await client.get(
+                "/api/v1/products/", params={**params, **({"cursor": cursor} if cursor else {})}, headers=user_headers
+            )
+            bodies.append(response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return bodies
+
+    cases = [
+        {"limit": 4},
+        {"limit": 3, "sort": "-price", "in_stock": True},
+        {"limit": 2, "sort": "price", "section": "Roupas", "available": True},
+        {"limit": 5, "sort": "-id", "min_price": 40, "max_price": 90},
+        {"limit": 3, "skip": 2, "sort": "price"},
+        {"limit": 3, "section": "Inexistente"},
+    ]
+    get_products = crud_products.get_products
+
+    async def database_not_expected(*args, **kwargs):
+        raise AssertionError("listagem deveria vir do snapshot")
+
+    monkeypatch.setattr(crud_products, "get_products", database_not_expected)
+    from_snapshot = [await pages(params) for params in cases]
+    monkeypatch.setattr(crud_products, "get_products", get_products)
+    catalog_snapshot.invalidate()
+    catalog_cache.invalidate()
+    from_database = [await pages(params) for params in cases]
+    assert from_snapshot == from_database
+    assert sum(len(page) for page in from_snapshot[0]) == 14
+
+    # Escritas atualizam o snapshot item a item.
+    await crud_products.load_catalog_indexes(db_session)
+    product = await crud_products.get_product_by_barcode(db_session, "7899000000003")
+    await crud_products.update_product(
+        db_session, product, ProductUpdate(**{**json.loads(crud_products.serialize_product(product)), "price": 1.0})
+    )
+    await crud_products.delete_product(db_session, await crud_products.get_product_by_barcode(db_session, "7899000000004"))
+    response = await client.get("/api/v1/products/", params={"sort": "price", "limit": 100}, headers=user_headers)
+    assert catalog_snapshot.ready
+    assert response.json()[0]["barcode"] == "7899000000003"
+    assert "7899000000004" not in {item["barcode"] for item in response.json()}
+
+
+@pytest.mark.asyncio
+async def test_orjson_response_types_and_error_bodies(client, user_headers):
+    from datetime import date, datetime, timezone
+    from decimal import Decimal
+
+    from app.core.responses import OrjsonResponse
+
+    body = OrjsonResponse(
+        {
+            "price": Decimal("59.90"),
+            "quantity": Decimal("3"),
+            "expires": date(2025, 12, 31),
+            "created_at": datetime(2025, 5, 26, 10, 0, tzinfo=timezone.utc),
+            "thumbnails": {160: "a.webp"},
+        }
+    ).body
+    assert json.loads(body) == {
+        "price": 59.9,
+        "quantity": 3,
+        "expires": "2025-12-31",
+        "created_at": "2025-05-26T10:00:00+00:00",
+        "thumbnails": {"160": "a.webp"},
+    }
 
-        # Assert
-        assert product.id is not None
-        assert product.description == product_data["description"]
-        assert product.price == product_data["price"]
-        assert product.section == product_data["section"]
-        assert product.stock == product_data["stock"]
+    response = await client.get("/api/v1/products/999999", headers=user_headers)
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Produto não encontrado"}
 
-        # Clean up
-        await crud_products.delete_product(session, product)
-        await session.commit()
\ No newline at end of file
+    response = await client.get("/api/v1/products/abc", headers=user_headers)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["path", "product_id"]
@@ -0,0 +1,33 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_static_assets_served_from_memory(client):
+    page = Path("static/index.html").read_bytes()
+
+    response = await client.get("/", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.content == page
+    assert response.headers["content-type"] == "text/html; charset=utf-8"
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.headers["vary"].count("Accept-Encoding") == 1
+    etag = response.headers["etag"]
+    assert not etag.startswith("W/")
+    assert (await client.get("/index.html", headers={"Accept-Encoding": "identity"})).headers["etag"] == etag
+
+    # Versão pré-comprimida, com ETag forte próprio.
+    async with client.stream("GET", "/", headers={"Accept-Encoding": "gzip"}) as compressed:
+        raw = b"".join([chunk async for chunk in compressed.aiter_raw()])
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw) == page
+    assert compressed.headers["etag"] not in (etag, f"W/{etag}")
+
+    revalidated = await client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"]})
+    assert revalidated.status_code == 304
+
+    # Caminhos que não são arquivos conhecidos param no roteador.
+    for path in ("/wp-login.php", "/.env", "/api/v2/products", "/static/../app/main.py"):
+        assert (await client.get(path)).status_code == 404